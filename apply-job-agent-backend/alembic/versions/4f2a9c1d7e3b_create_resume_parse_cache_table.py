@@ -0,0 +1,39 @@
+"""create resume parse cache table
+
+Revision ID: 4f2a9c1d7e3b
+Revises: 096cd2632935
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c1d7e3b'
+down_revision: Union[str, None] = '096cd2632935'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('resume_parse_cache',
+    sa.Column('key_type', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(length=64), nullable=False),
+    sa.Column('resume_data', sa.JSON(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('key_type', 'content_hash')
+    )
+    op.create_index(op.f('ix_resume_parse_cache_prompt_version'), 'resume_parse_cache', ['prompt_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resume_parse_cache_prompt_version'), table_name='resume_parse_cache')
+    op.drop_table('resume_parse_cache')
@@ -0,0 +1,28 @@
+"""add resume job search input
+
+Revision ID: a4d2f7e91c36
+Revises: f1c6b83a0d57
+Create Date: 2026-10-18 16:47:12.530841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2f7e91c36'
+down_revision: Union[str, None] = 'f1c6b83a0d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('job_search_input', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resumes', 'job_search_input')
@@ -0,0 +1,30 @@
+"""add resume markdown columns
+
+Revision ID: c3e81f0b6d52
+Revises: a7d3e5b21c94
+Create Date: 2026-10-18 11:26:05.904317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81f0b6d52'
+down_revision: Union[str, None] = 'a7d3e5b21c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('resume_markdown', sa.Text(), nullable=True))
+    op.add_column('resume_parse_cache', sa.Column('resume_markdown', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resume_parse_cache', 'resume_markdown')
+    op.drop_column('resumes', 'resume_markdown')
@@ -0,0 +1,43 @@
+"""create job search cache table
+
+Revision ID: e5a9d7c2b418
+Revises: c3e81f0b6d52
+Create Date: 2026-10-18 13:21:09.337105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9d7c2b418'
+down_revision: Union[str, None] = 'c3e81f0b6d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_search_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('job_title', sa.String(), nullable=False),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('sites', sa.String(), nullable=False),
+    sa.Column('hours_old', sa.Integer(), nullable=False),
+    sa.Column('jobs', sa.JSON(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('refreshing_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index(op.f('ix_job_search_cache_fetched_at'), 'job_search_cache', ['fetched_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_search_cache_fetched_at'), table_name='job_search_cache')
+    op.drop_table('job_search_cache')
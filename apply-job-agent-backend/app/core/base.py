@@ -8,3 +8,5 @@ class Base(DeclarativeBase):
 # Import models here so they are registered with Base:
 from app.features.auth.models import *
 from app.features.resume.models import *
+from app.features.tasks.models import *
+from app.features.jobs.models import *
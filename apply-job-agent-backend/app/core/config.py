@@ -70,6 +70,156 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Prompt files are hot-reloaded at this interval when ENVIRONMENT is "local"
+    PROMPT_RELOAD_INTERVAL_SECONDS: float = 2.0
+
+    # LLM response cache: in-memory LRU in front of a SQLite file shared by all
+    # workers on the host. TTLs are per chain, in seconds (None = no expiry)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "app/output/cache/llm_cache.sqlite3"
+    LLM_CACHE_MEMORY_ENTRIES: int = 256
+    LLM_CACHE_MAX_ROWS: int = 50_000
+    LLM_CACHE_DEFAULT_TTL_SECONDS: int | None = 7 * 24 * 60 * 60
+    LLM_CACHE_TTL_SECONDS: dict[str, int | None] = {
+        "resume_parser": 30 * 24 * 60 * 60,
+        "job_search_input": 7 * 24 * 60 * 60,
+        "resume_section_parser": 30 * 24 * 60 * 60,
+        "resume_generate": 24 * 60 * 60,
+    }
+
+    # OpenAI admission control, per model and per process. Calls queue until a
+    # request and their estimated tokens fit the per-minute budgets and an
+    # in-flight slot is free; LLM_RATE_LIMITS overrides rpm/tpm per model
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 30_000
+    LLM_RATE_LIMITS: dict[str, dict[str, int]] = {}
+    LLM_MAX_IN_FLIGHT: int = 8
+    LLM_MAX_QUEUE_WAIT_SECONDS: float = 60.0
+    LLM_ESTIMATED_COMPLETION_TOKENS: int = 1_500
+    LLM_MAX_RETRIES: int = 5
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 1.0
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 30.0
+
+    # Model routing: each chain declares a tier and a latency budget in seconds.
+    # Quality-tier calls predicted to exceed their budget go to the fast tier; while
+    # they do, one call per LLM_ROUTING_PROBE_SECONDS still goes to the quality tier
+    # to refresh its latency estimate
+    LLM_MODEL_TIERS: dict[str, str] = {"fast": "gpt-4o-mini", "quality": "gpt-4o"}
+    LLM_DEFAULT_TIER: str = "quality"
+    LLM_CHAIN_POLICIES: dict[str, dict[str, Any]] = {
+        "resume_parser": {"tier": "quality", "latency_budget_seconds": 45},
+        "resume_section_parser": {"tier": "quality", "latency_budget_seconds": 20},
+        "job_search_input": {"tier": "fast", "latency_budget_seconds": 10},
+        "resume_generate": {"tier": "quality", "latency_budget_seconds": 90},
+    }
+    LLM_ROUTING_PROBE_SECONDS: float = 60.0
+
+    # Per-chain LLM metrics; each chain run is also appended to this JSONL file if set.
+    # Prices are USD per million tokens, matched by model name prefix
+    LLM_METRICS_JSONL_PATH: str | None = None
+    LLM_PRICING_PER_MILLION_TOKENS: dict[str, dict[str, float]] = {
+        "gpt-4o": {"input": 2.50, "output": 10.00},
+        "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    }
+
+    # Resume upload limits
+    RESUME_UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    RESUME_UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+    # "single" parses a resume with one LLM call; "sections" splits it into sections
+    # parsed concurrently, which is faster for long resumes
+    RESUME_PARSE_MODE: Literal["single", "sections"] = "single"
+
+    # Re-parse only the changed sections of re-uploaded resumes, unless more
+    # than this fraction of the new resume changed
+    RESUME_INCREMENTAL_PARSE: bool = True
+    RESUME_INCREMENTAL_MAX_CHANGED_RATIO: float = 0.6
+
+    # Bulk resume import
+    BULK_UPLOAD_CONCURRENCY: int = 4
+    BULK_UPLOAD_BATCH_SIZE: int = 50
+    BULK_UPLOAD_MAX_FILES: int = 500
+
+    # PDF extraction; documents are split into chunks of at least
+    # PDF_EXTRACT_MIN_PAGES_PER_CHUNK pages, converted in parallel
+    PDF_EXTRACT_POOL_SIZE: int = min(4, os.cpu_count() or 1)
+    PDF_EXTRACT_MIN_PAGES_PER_CHUNK: int = 4
+
+    # LaTeX compilation; each compile runs in its own temporary directory under
+    # LATEX_WORK_DIR, at most LATEX_COMPILE_CONCURRENCY at once per process
+    LATEX_COMPILER: str = "pdflatex"
+    LATEX_WORK_DIR: str = "app/output/latex"
+    LATEX_COMPILE_CONCURRENCY: int = min(4, os.cpu_count() or 1)
+    LATEX_COMPILE_TIMEOUT_SECONDS: float = 60
+
+    # Job search; scrape results are cached in Postgres for all workers. Entries are
+    # fresh for JOB_CACHE_TTL_SECONDS, then served stale for up to
+    # JOB_CACHE_STALE_SECONDS more while one worker refreshes them in the background
+    JOB_SEARCH_SITES: list[str] = ["indeed", "linkedin"]
+    JOB_SEARCH_HOURS_OLD: int = 72
+    JOB_SEARCH_RESULTS_WANTED: int = 7
+    # Fetching every LinkedIn job page for its description makes searches much slower;
+    # descriptions are fetched on demand through /jobs/description instead
+    JOB_SEARCH_FETCH_DESCRIPTIONS: bool = False
+    JOB_CACHE_ENABLED: bool = True
+    JOB_CACHE_TTL_SECONDS: int = 15 * 60
+    JOB_CACHE_STALE_SECONDS: int = 6 * 60 * 60
+    JOB_CACHE_REFRESH_LEASE_SECONDS: int = 5 * 60
+
+    # Each site is scraped concurrently; a search returns the sites that finished
+    # within their timeout (JOB_SCRAPE_SITE_TIMEOUTS, else JOB_SCRAPE_TIMEOUT_SECONDS)
+    JOB_SCRAPE_MAX_WORKERS: int = 8
+    JOB_SCRAPE_TIMEOUT_SECONDS: float = 30
+    JOB_SCRAPE_SITE_TIMEOUTS: dict[str, float] = {"indeed": 20, "linkedin": 45}
+
+    # Local job store; searches with at least JOB_STORE_MIN_RESULTS matching jobs
+    # are answered from it. The task worker's ingester re-scrapes the
+    # JOB_INGEST_TOP_SEARCHES most searched, recently active searches every
+    # JOB_INGEST_INTERVAL_SECONDS
+    JOB_STORE_ENABLED: bool = True
+    JOB_STORE_MIN_RESULTS: int = 5
+    JOB_STORE_RETENTION_DAYS: int = 14
+    JOB_INGEST_ENABLED: bool = True
+    JOB_INGEST_INTERVAL_SECONDS: int = 60 * 60
+    JOB_INGEST_POLL_SECONDS: float = 60
+    JOB_INGEST_TOP_SEARCHES: int = 50
+    JOB_INGEST_MIN_HITS: int = 2
+    JOB_INGEST_ACTIVE_DAYS: int = 7
+
+    # Postings whose 64-bit SimHash fingerprints differ in at most
+    # JOB_DEDUP_MAX_DISTANCE bits are collapsed into one job
+    JOB_DEDUP_ENABLED: bool = True
+    JOB_DEDUP_MAX_DISTANCE: int = 7
+
+    # On-demand job descriptions
+    JOB_DESCRIPTION_FETCH_TIMEOUT_SECONDS: float = 10
+    JOB_DESCRIPTION_FETCH_CONCURRENCY: int = 4
+    JOB_DESCRIPTION_BULK_MAX: int = 25
+    JOB_DESCRIPTION_CACHE_SIZE: int = 1000
+    JOB_DESCRIPTION_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Cursor-paginated job search; result sets are filled in the background with up to
+    # JOB_RESULT_SET_RESULTS_WANTED jobs per site and held in process, at most
+    # JOB_RESULT_SET_MAX_SETS of JOB_RESULT_SET_MAX_JOBS jobs each, for
+    # JOB_RESULT_SET_TTL_SECONDS after their last read
+    JOB_PAGE_SIZE: int = 10
+    JOB_PAGE_SIZE_MAX: int = 50
+    JOB_RESULT_SET_RESULTS_WANTED: int = 50
+    JOB_RESULT_SET_MAX_JOBS: int = 200
+    JOB_RESULT_SET_MAX_SETS: int = 100
+    JOB_RESULT_SET_TTL_SECONDS: int = 15 * 60
+    JOB_RESULT_SET_FILL_WORKERS: int = 2
+    JOB_RESULT_SET_FILL_TIMEOUT_SECONDS: float = 120
+
+    # Background task queue
+    TASK_WORKER_PROCESSES: int = 2
+    TASK_POLL_INTERVAL_SECONDS: float = 1.0
+    TASK_LEASE_SECONDS: int = 600
+    # Running tasks renew their lease this often, so only dead workers' tasks expire
+    TASK_HEARTBEAT_SECONDS: int = 60
+    TASK_MAX_ATTEMPTS: int = 3
+    TASK_MAX_WAIT_SECONDS: int = 30
+
     # SMTP_TLS: bool = True
     # SMTP_SSL: bool = False
     # SMTP_PORT: int = 587
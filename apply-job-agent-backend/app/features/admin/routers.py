@@ -0,0 +1,76 @@
+from fastapi import APIRouter
+from app.core.dependencies import AuthenticatedUser
+from app.shared.llm.cache import LLMResponseCache
+from app.shared.llm.client_manager import get_client_stats
+from app.shared.llm.instrumentation import chain_metrics
+from app.shared.llm.router import get_routing_stats
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get(
+    "/llm-cache",
+    summary="Get LLM response cache statistics",
+    description="Per-chain hit rate and saved tokens of the LLM response cache in this process."
+)
+async def get_llm_cache_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the LLM response cache counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Memory hits, store hits, misses, hit rate and saved tokens per chain.
+    """
+    return LLMResponseCache.get_stats()
+
+@router.get(
+    "/llm-clients",
+    summary="Get LLM client admission statistics",
+    description="Per-model queue depth, wait times, retries and remaining rate-limit budget in this process."
+)
+async def get_llm_client_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the LLM client manager counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Queue depth, in-flight calls, wait times, retries and budgets per model.
+    """
+    return get_client_stats()
+
+@router.get(
+    "/llm-metrics",
+    summary="Get per-chain LLM metrics",
+    description="Per-chain calls, failures, parse failures, retries, tokens, cost and latency histograms in this process."
+)
+async def get_llm_metrics(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the per-chain LLM instrumentation metrics.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Counters, token totals, cost and latency / time-to-first-token histograms per chain.
+    """
+    return chain_metrics.get_stats()
+
+@router.get(
+    "/llm-routing",
+    summary="Get LLM model routing statistics",
+    description="Per-chain tier, latency budget, calls per tier, fallbacks and latency estimates in this process."
+)
+async def get_llm_routing_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the per-chain model routing counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Routing policy, calls per tier, fallbacks and latency estimates per chain.
+    """
+    return get_routing_stats()
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.features.jobs.models import JobSearchCacheEntry
+from app.features.jobs.schemas import JobSearchInput
+
+
+class JobSearchCache:
+    """
+    Shared cache of job scrape results stored in Postgres.
+
+    An entry is fresh for JOB_CACHE_TTL_SECONDS after it was scraped and
+    may then be served stale for another JOB_CACHE_STALE_SECONDS while one
+    background refresh, coordinated through a lease on the row, replaces it.
+    Older entries are treated as misses.
+    """
+
+    _lock = threading.Lock()
+    _stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_failures": 0}
+
+    @staticmethod
+    def normalize(text: str | None) -> str:
+        """Lowercases and collapses whitespace and punctuation so equivalent searches share a key."""
+        return re.sub(r"[\s,]+", " ", (text or "").lower()).strip()
+
+    @classmethod
+    def key(cls, search: JobSearchInput, sites: list[str], hours_old: int) -> str:
+        """
+        Returns the cache key of a search.
+
+        Args:
+            search (JobSearchInput): The job search input
+            sites (list[str]): The job boards searched
+            hours_old (int): Maximum job posting age
+
+        Returns:
+            str: The sha256 hex digest of the normalised search
+        """
+        normalized = json.dumps([
+            cls.normalize(search.job_title),
+            cls.normalize(search.location),
+            cls.normalize(search.country),
+            sorted(sites),
+            hours_old,
+        ])
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get(cls, db: Session, cache_key: str) -> tuple[list[dict], bool] | None:
+        """
+        Looks up cached scrape results.
+
+        Args:
+            db (Session): Database session
+            cache_key (str): The search's cache key
+
+        Returns:
+            tuple[list[dict], bool] | None: The cached jobs and whether they are still fresh,
+                or None on a miss
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            entry = db.query(JobSearchCacheEntry).filter(
+                JobSearchCacheEntry.cache_key == cache_key,
+                JobSearchCacheEntry.fetched_at > now - timedelta(
+                    seconds=settings.JOB_CACHE_TTL_SECONDS + settings.JOB_CACHE_STALE_SECONDS
+                ),
+            ).first()
+
+            if entry is None:
+                cls._record("misses")
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_hit_at = now
+            fresh = entry.fetched_at > now - timedelta(seconds=settings.JOB_CACHE_TTL_SECONDS)
+            jobs = entry.jobs
+            db.commit()
+
+            cls._record("fresh_hits" if fresh else "stale_hits")
+            return jobs, fresh
+
+        except Exception as e:
+            # A broken cache must never fail a search
+            db.rollback()
+            print(f"Warning: job search cache lookup failed: {str(e)}")
+            return None
+
+    @classmethod
+    def put(cls, db: Session, cache_key: str, search: JobSearchInput, sites: list[str], hours_old: int, jobs: list[dict]):
+        """
+        Stores scrape results, replacing any existing entry and releasing its refresh lease.
+
+        Args:
+            db (Session): Database session
+            cache_key (str): The search's cache key
+            search (JobSearchInput): The job search input
+            sites (list[str]): The job boards searched
+            hours_old (int): Maximum job posting age
+            jobs (list[dict]): The scraped jobs
+        """
+        try:
+            existing = db.get(JobSearchCacheEntry, cache_key)
+            db.merge(
+                JobSearchCacheEntry(
+                    cache_key=cache_key,
+                    job_title=search.job_title,
+                    location=search.location,
+                    country=search.country,
+                    sites=",".join(sorted(sites)),
+                    hours_old=hours_old,
+                    jobs=jobs,
+                    fetched_at=datetime.now(timezone.utc),
+                    refreshing_until=None,
+                    hit_count=existing.hit_count if existing is not None else 0,
+                )
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to store job search cache entry: {str(e)}")
+
+    @classmethod
+    def claim_refresh(cls, db: Session, cache_key: str) -> bool:
+        """
+        Takes the refresh lease of a stale entry, so only one worker refreshes it.
+
+        Args:
+            db (Session): Database session
+            cache_key (str): The search's cache key
+
+        Returns:
+            bool: True if this caller should run the refresh
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            claimed = db.execute(
+                update(JobSearchCacheEntry)
+                .where(
+                    JobSearchCacheEntry.cache_key == cache_key,
+                    or_(
+                        JobSearchCacheEntry.refreshing_until.is_(None),
+                        JobSearchCacheEntry.refreshing_until < now,
+                    ),
+                )
+                .values(refreshing_until=now + timedelta(seconds=settings.JOB_CACHE_REFRESH_LEASE_SECONDS))
+            )
+            db.commit()
+            return claimed.rowcount == 1
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to claim job search cache refresh: {str(e)}")
+            return False
+
+    @classmethod
+    def popular(cls, db: Session, limit: int, min_hits: int, active_days: int) -> list[JobSearchCacheEntry]:
+        """
+        Returns the most searched entries, most hits first.
+
+        Args:
+            db (Session): Database session
+            limit (int): Maximum number of entries
+            min_hits (int): Minimum number of cache hits
+            active_days (int): Only entries hit within this many days
+
+        Returns:
+            list[JobSearchCacheEntry]: The popular searches
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=active_days)
+        return (
+            db.query(JobSearchCacheEntry)
+            .filter(JobSearchCacheEntry.hit_count >= min_hits, JobSearchCacheEntry.last_hit_at > cutoff)
+            .order_by(JobSearchCacheEntry.hit_count.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @classmethod
+    def record_refresh(cls, succeeded: bool):
+        """Counts a finished background refresh."""
+        cls._record("refreshes" if succeeded else "refresh_failures")
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns the in-process hit/miss counters.
+
+        Returns:
+            dict: Counters, hit rate and the configured TTLs
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+        lookups = stats["fresh_hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        stats["ttl_seconds"] = settings.JOB_CACHE_TTL_SECONDS
+        stats["stale_seconds"] = settings.JOB_CACHE_STALE_SECONDS
+        return stats
+
+    @classmethod
+    def _record(cls, counter: str):
+        with cls._lock:
+            cls._stats[counter] += 1
@@ -0,0 +1,215 @@
+"""
+Near-duplicate detection of job postings with SimHash.
+
+Each job with a description gets a 64-bit SimHash of its title, company
+and location words and the word bigrams of its normalised description,
+with title, company and location words weighted higher. Two such jobs are
+duplicates when their fingerprints differ in at most JOB_DEDUP_MAX_DISTANCE
+bits and they are in the same city. Fingerprints are split into
+JOB_DEDUP_MAX_DISTANCE + 1 bands, and any two fingerprints within that
+distance agree on at least one band. Each job is therefore compared only
+with earlier jobs that share one of its bands, so a pass over n jobs is
+linear in n.
+
+Listings without a description (LinkedIn's, unless descriptions are
+fetched during the search) would be fingerprinted on a few title and
+company words only, which merges the same role in different cities and
+never matches a copy with a description. When either job lacks a
+description, the two are compared on their normalised title, company and
+city instead, and are duplicates only if those are equal.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+from app.core.config import settings
+
+FINGERPRINT_BITS = 64
+# Words of the description that are fingerprinted; the tail is mostly boilerplate
+DESCRIPTION_WORDS = 300
+TITLE_WEIGHT = 2
+COMPANY_WEIGHT = 2
+LOCATION_WEIGHT = 2
+# Legal-form words that differ between boards' spellings of the same company
+COMPANY_SUFFIXES = frozenset({"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc", "com"})
+
+_BIT_POSITIONS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Odd multiplier that mixes two word hashes into a bigram hash
+_BIGRAM_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class JobDeduplicator:
+    """
+    Collapses near-duplicate jobs as they are added.
+
+    The first job of a group is kept. Later duplicates add their site and
+    URL to its "sources" and fill in its description if it has none.
+    """
+
+    def __init__(self, max_distance: int | None = None):
+        """
+        Args:
+            max_distance (int | None): Maximum differing fingerprint bits of duplicates;
+                defaults to JOB_DEDUP_MAX_DISTANCE
+        """
+        self.max_distance = settings.JOB_DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        bands = self.max_distance + 1
+        width = FINGERPRINT_BITS // bands
+        self._bands = [(index * width, width if index < bands - 1 else FINGERPRINT_BITS - index * width) for index in range(bands)]
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in self._bands]
+        self._fingerprints: list[int | None] = []
+        self._cities: list[str] = []
+        self._listings: dict[tuple[str, str, str], list[int]] = {}
+        self._word_hashes: dict[str, int] = {}
+        self.jobs: list[dict] = []
+
+    def add(self, job: dict) -> dict | None:
+        """
+        Adds a job unless it duplicates one added before.
+
+        Args:
+            job (dict): A job with "title", "company", "location", "description", "site" and "url"
+
+        Returns:
+            dict | None: The kept job the new one was merged into, or None if it is new
+        """
+        listing = listing_key(job)
+        fingerprint = self.fingerprint(job) if job.get("description") else None
+
+        # Jobs without a description only match on their listing
+        for index in self._listings.get(listing, ()) if listing is not None else ():
+            if fingerprint is None or self._fingerprints[index] is None:
+                return self._merge(index, job)
+
+        if fingerprint is not None:
+            city = listing[2] if listing is not None else ""
+            candidates = {
+                index
+                for buckets, key in zip(self._buckets, self._band_keys(fingerprint))
+                for index in buckets.get(key, ())
+            }
+            for index in sorted(candidates):
+                if city and self._cities[index] and city != self._cities[index]:
+                    continue
+                if (self._fingerprints[index] ^ fingerprint).bit_count() <= self.max_distance:
+                    return self._merge(index, job)
+
+        index = len(self.jobs)
+        self.jobs.append({**job, "sources": [_source(job)]})
+        self._fingerprints.append(None)
+        self._cities.append(listing[2] if listing is not None else "")
+        if listing is not None:
+            self._listings.setdefault(listing, []).append(index)
+        if fingerprint is not None:
+            self._index(index, fingerprint)
+        return None
+
+    def _merge(self, index: int, job: dict) -> dict:
+        """Adds a duplicate's source, and its description if the kept job has none."""
+        kept = self.jobs[index]
+        kept["sources"].append(_source(job))
+        if not kept.get("description") and job.get("description"):
+            kept["description"] = job["description"]
+            fingerprint = self.fingerprint(kept)
+            if fingerprint is not None:
+                self._index(index, fingerprint)
+        return kept
+
+    def _index(self, index: int, fingerprint: int):
+        """Records a kept job's fingerprint in its bands."""
+        self._fingerprints[index] = fingerprint
+        for buckets, key in zip(self._buckets, self._band_keys(fingerprint)):
+            buckets.setdefault(key, []).append(index)
+
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        return [(fingerprint >> start) & ((1 << width) - 1) for start, width in self._bands]
+
+    def fingerprint(self, job: dict) -> int | None:
+        """
+        Returns the 64-bit SimHash of a job.
+
+        Args:
+            job (dict): A job with "title", "company", "location" and "description"
+
+        Returns:
+            int | None: The fingerprint, or None for a job without any words
+        """
+        title = _WORD_PATTERN.findall((job.get("title") or "").lower())
+        company = _WORD_PATTERN.findall((job.get("company") or "").lower())
+        location = _WORD_PATTERN.findall((job.get("location") or "").lower())
+        description = _WORD_PATTERN.findall((job.get("description") or "").lower())[:DESCRIPTION_WORDS]
+
+        self._hash_words(
+            {f"t:{word}" for word in title} | {f"c:{word}" for word in company}
+            | {f"l:{word}" for word in location} | set(description)
+        )
+        word_hashes = self._word_hashes
+        features = np.array(
+            [word_hashes[f"t:{word}"] for word in title]
+            + [word_hashes[f"c:{word}"] for word in company]
+            + [word_hashes[f"l:{word}"] for word in location],
+            dtype=np.uint64,
+        )
+        weights = np.array(
+            [TITLE_WEIGHT] * len(title) + [COMPANY_WEIGHT] * len(company) + [LOCATION_WEIGHT] * len(location),
+            dtype=np.int64,
+        )
+        if len(description) > 1:
+            words = np.array([word_hashes[word] for word in description], dtype=np.uint64)
+            bigrams = words[:-1] * _BIGRAM_MIX ^ words[1:]
+            features = np.concatenate([features, bigrams])
+            weights = np.concatenate([weights, np.ones(len(bigrams), dtype=np.int64)])
+        if not len(features):
+            return None
+
+        # Weighted vote of every feature on every bit, most significant bit first
+        bits = np.unpackbits(features.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+        votes = weights @ bits
+        return int(np.packbits(2 * votes > weights.sum()).view(">u8")[0])
+
+    def _hash_words(self, words: set[str]):
+        """Adds stable 64-bit hashes of new words to the pass's memo."""
+        for word in words.difference(self._word_hashes):
+            self._word_hashes[word] = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def listing_key(job: dict) -> tuple[str, str, str] | None:
+    """
+    Returns a job's normalised title, company (without legal-form words) and city.
+
+    Args:
+        job (dict): A job with "title", "company" and "location"
+
+    Returns:
+        tuple[str, str, str] | None: The key, or None for a job without a title
+    """
+    title = " ".join(_WORD_PATTERN.findall((job.get("title") or "").lower()))
+    if not title:
+        return None
+    company = " ".join(
+        word for word in _WORD_PATTERN.findall((job.get("company") or "").lower()) if word not in COMPANY_SUFFIXES
+    )
+    city = " ".join(_WORD_PATTERN.findall((job.get("location") or "").split(",")[0].lower()))
+    return title, company, city
+
+
+def _source(job: dict) -> dict:
+    return {"site": job.get("site", ""), "url": job.get("url", "")}
+
+
+def deduplicate_jobs(jobs: list[dict]) -> list[dict]:
+    """
+    Collapses near-duplicate jobs, keeping the first job of each group.
+
+    Args:
+        jobs (list[dict]): The jobs, in order of preference
+
+    Returns:
+        list[dict]: The distinct jobs, each with the "sources" (site and URL) it was found at
+    """
+    deduplicator = JobDeduplicator()
+    for job in jobs:
+        deduplicator.add(job)
+    return deduplicator.jobs
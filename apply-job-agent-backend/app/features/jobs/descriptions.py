@@ -0,0 +1,227 @@
+"""
+On-demand fetching of full job descriptions.
+
+Searches skip the per-job description requests, so job listings come back
+fast. A description is fetched from the job board's page only when it is
+asked for. It is cached in process and written to the job store, which
+also already holds the descriptions some boards return with their search
+results. Only URLs on the supported job boards are fetched.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from fastapi import HTTPException
+from markdownify import markdownify
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.features.jobs.models import Job
+from app.features.jobs.store import JobStore
+
+# Job board -> (domain, element holding the description on a job page)
+JOB_PAGES = {
+    "linkedin": ("linkedin.com", {"name": "div", "class_": lambda classes: classes and "show-more-less-html__markup" in classes}),
+    "indeed": ("indeed.com", {"name": "div", "id": "jobDescriptionText"}),
+}
+
+_HEADERS = {
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "accept-language": "en-US,en;q=0.9",
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+}
+
+_fetch_pool = ThreadPoolExecutor(max_workers=settings.JOB_DESCRIPTION_FETCH_CONCURRENCY, thread_name_prefix="job-description")
+
+
+def job_site(url: str) -> str | None:
+    """
+    Returns the job board a job URL belongs to.
+
+    Args:
+        url (str): The job URL
+
+    Returns:
+        str | None: The site name, or None if the URL is not an https/http page of a supported board
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return None
+    for site, (domain, _) in JOB_PAGES.items():
+        if parsed.hostname == domain or parsed.hostname.endswith(f".{domain}"):
+            return site
+    return None
+
+
+def fetch_description(url: str, site: str) -> str | None:
+    """
+    Downloads a job page and extracts its description as markdown.
+
+    Args:
+        url (str): The job URL
+        site (str): The job board, from `job_site`
+
+    Returns:
+        str | None: The description, or None if the page has none (e.g. it requires a login)
+
+    Raises:
+        requests.RequestException: If the page cannot be downloaded
+    """
+    response = requests.get(url, headers=_HEADERS, timeout=settings.JOB_DESCRIPTION_FETCH_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    if "signup" in response.url or "login" in response.url:
+        return None
+
+    _, selector = JOB_PAGES[site]
+    element = BeautifulSoup(response.text, "html.parser").find(**selector)
+    if element is None:
+        return None
+    return markdownify(str(element)).strip() or None
+
+
+class JobDescriptionService:
+    """
+    Returns full job descriptions, from the in-process cache, the job store or the job page.
+    """
+
+    _lock = threading.Lock()
+    _cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+    _stats = {"cache_hits": 0, "store_hits": 0, "fetches": 0, "fetch_failures": 0}
+
+    @classmethod
+    def get_description(cls, db: Session, url: str) -> dict:
+        """
+        Returns the description of one job.
+
+        Args:
+            db (Session): Database session
+            url (str): The job URL
+
+        Returns:
+            dict: The URL, site, description and where it came from ("cache", "store" or "fetched")
+
+        Raises:
+            HTTPException: If the URL is not on a supported job board (400) or cannot be fetched (502)
+        """
+        result = cls.get_descriptions(db, [url])[0]
+        if result.get("error"):
+            raise HTTPException(status_code=result["status_code"], detail=result["error"])
+        return result
+
+    @classmethod
+    def get_descriptions(cls, db: Session, urls: list[str]) -> list[dict]:
+        """
+        Returns the descriptions of several jobs, fetching the missing ones concurrently.
+
+        Args:
+            db (Session): Database session
+            urls (list[str]): The job URLs
+
+        Returns:
+            list[dict]: One result per URL, in order; failed URLs have an "error" and
+                "status_code" instead of a description
+        """
+        results: dict[str, dict] = {}
+        stored_lookups: dict[str, str] = {}
+        for url in dict.fromkeys(urls):
+            site = job_site(url)
+            if site is None:
+                results[url] = {"url": url, "site": None, "status_code": 400, "error": "Not a job URL of a supported job board"}
+                continue
+            cached = cls._cache_get(url)
+            if cached is not None:
+                results[url] = {"url": url, "site": site, "description": cached, "source": "cache"}
+                cls._record("cache_hits")
+                continue
+            stored_lookups[JobStore.job_key({"site": site, "url": url})] = url
+
+        # Descriptions already in the job store
+        if stored_lookups:
+            rows = (
+                db.query(Job.job_key, Job.description)
+                .filter(Job.job_key.in_(stored_lookups), Job.description.isnot(None), Job.description != "")
+                .all()
+            )
+            for job_key, description in rows:
+                url = stored_lookups.pop(job_key)
+                results[url] = {"url": url, "site": job_site(url), "description": description, "source": "store"}
+                cls._cache_put(url, description)
+                cls._record("store_hits")
+
+        # The rest are fetched from the job pages
+        futures = {
+            url: _fetch_pool.submit(fetch_description, url, job_site(url))
+            for url in stored_lookups.values()
+        }
+        fetched = {}
+        for url, future in futures.items():
+            try:
+                description = future.result()
+            except Exception as e:
+                cls._record("fetch_failures")
+                print(f"Warning: failed to fetch job description from {url}: {str(e)}")
+                results[url] = {"url": url, "site": job_site(url), "status_code": 502, "error": f"Failed to fetch the job description: {str(e)}"}
+                continue
+            cls._record("fetches")
+            results[url] = {"url": url, "site": job_site(url), "description": description or "", "source": "fetched"}
+            if description:
+                fetched[url] = description
+                cls._cache_put(url, description)
+
+        if fetched:
+            cls._store(db, fetched)
+        return [results[url] for url in urls]
+
+    @classmethod
+    def _store(cls, db: Session, descriptions: dict[str, str]):
+        """Adds fetched descriptions to the jobs already in the job store."""
+        try:
+            for url, description in descriptions.items():
+                db.query(Job).filter(Job.job_key == JobStore.job_key({"site": job_site(url), "url": url})).update(
+                    {Job.description: description}, synchronize_session=False
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to store fetched job descriptions: {str(e)}")
+
+    @classmethod
+    def _cache_get(cls, url: str) -> str | None:
+        with cls._lock:
+            entry = cls._cache.get(url)
+            if entry is None:
+                return None
+            description, expires_at = entry
+            if expires_at < time.monotonic():
+                del cls._cache[url]
+                return None
+            cls._cache.move_to_end(url)
+            return description
+
+    @classmethod
+    def _cache_put(cls, url: str, description: str):
+        with cls._lock:
+            cls._cache[url] = (description, time.monotonic() + settings.JOB_DESCRIPTION_CACHE_TTL_SECONDS)
+            cls._cache.move_to_end(url)
+            while len(cls._cache) > settings.JOB_DESCRIPTION_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns the in-process counters.
+
+        Returns:
+            dict: Cache and store hits, fetches, fetch failures and the cache size
+        """
+        with cls._lock:
+            return {**cls._stats, "cached": len(cls._cache)}
+
+    @classmethod
+    def _record(cls, counter: str):
+        with cls._lock:
+            cls._stats[counter] += 1
@@ -0,0 +1,71 @@
+"""
+Background ingestion of popular job searches into the job store.
+
+Popular searches are the job search cache entries with the most hits that
+were searched recently. Each ingestion cycle re-scrapes the ones last
+scraped more than JOB_INGEST_INTERVAL_SECONDS ago and upserts the jobs
+into the `jobs` table, so `/jobs/get-jobs` can answer them from the store.
+Searches are claimed with the cache entry's refresh lease, so several
+ingesters (and request-path refreshes) never scrape the same search at once.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.features.jobs.cache import JobSearchCache
+from app.features.jobs.schemas import JobSearchInput
+from app.features.jobs.services import JobService
+from app.features.jobs.store import JobStore
+
+
+def run_ingestion_cycle(db: Session, should_stop=lambda: False) -> dict:
+    """
+    Scrapes the popular searches that are due and stores their jobs.
+
+    Args:
+        db (Session): Database session
+        should_stop (Callable[[], bool]): Checked between searches to end the cycle early
+
+    Returns:
+        dict: Searches scraped, failed and skipped, and jobs stored and pruned
+    """
+    summary = {"scraped": 0, "failed": 0, "skipped": 0, "jobs": 0, "pruned": 0}
+    due_before = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_INGEST_INTERVAL_SECONDS)
+    entries = JobSearchCache.popular(
+        db,
+        limit=settings.JOB_INGEST_TOP_SEARCHES,
+        min_hits=settings.JOB_INGEST_MIN_HITS,
+        active_days=settings.JOB_INGEST_ACTIVE_DAYS,
+    )
+
+    for entry in entries:
+        if should_stop():
+            break
+        if entry.fetched_at > due_before or not JobSearchCache.claim_refresh(db, entry.cache_key):
+            summary["skipped"] += 1
+            continue
+
+        search = JobSearchInput(
+            job_title=entry.job_title,
+            location=entry.location or "",
+            country=entry.country or "",
+            city=(entry.location or "").split(",")[0].strip(),
+            google_search_text="",
+        )
+        sites = entry.sites.split(",")
+        try:
+            result = JobService.scrape_live_jobs(search, sites, entry.hours_old)
+        except Exception as e:
+            # The lease expires, so the search is retried in a later cycle
+            summary["failed"] += 1
+            print(f"Warning: ingestion of job search {entry.cache_key[:12]} failed: {getattr(e, 'detail', str(e))}")
+            continue
+
+        summary["jobs"] += JobStore.upsert(db, result["jobs"], search.country)
+        if not result["partial"]:
+            JobSearchCache.put(db, entry.cache_key, search, sites, entry.hours_old, result["jobs"])
+        summary["scraped"] += 1
+
+    summary["pruned"] = JobStore.prune(db)
+    return summary
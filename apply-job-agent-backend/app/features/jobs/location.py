@@ -0,0 +1,250 @@
+"""
+Resolves free-text resume locations to a jobspy country and city without the LLM.
+
+The alias index is built once at import from jobspy's `Country` enum (names
+and country codes) plus common regions and cities. Locations are split into
+parts ("Austin, TX, USA"); each recognised part narrows down the possible
+countries, and the location resolves only if exactly one country remains.
+"""
+import difflib
+import re
+import unicodedata
+
+from jobspy.model import Country
+
+# Countries jobspy uses internally rather than for searches
+_INTERNAL_COUNTRIES = {"US_CANADA", "WORLDWIDE"}
+
+_EXTRA_COUNTRY_ALIASES = {
+    "USA": ["united states of america", "america", "u s a", "u s"],
+    "UK": ["great britain", "britain", "england", "scotland", "wales", "northern ireland", "gb"],
+    "SOUTHKOREA": ["korea", "republic of korea"],
+    "UNITEDARABEMIRATES": ["uae", "emirates"],
+    "NETHERLANDS": ["holland", "the netherlands"],
+    "GERMANY": ["deutschland"],
+    "CZECHREPUBLIC": ["czech"],
+    "VIETNAM": ["viet nam"],
+}
+
+_REGIONS = {
+    "USA": {
+        "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+        "colorado": "co", "connecticut": "ct", "delaware": "de", "florida": "fl", "georgia": "ga",
+        "hawaii": "hi", "idaho": "id", "illinois": "il", "indiana": "in", "iowa": "ia",
+        "kansas": "ks", "kentucky": "ky", "louisiana": "la", "maine": "me", "maryland": "md",
+        "massachusetts": "ma", "michigan": "mi", "minnesota": "mn", "mississippi": "ms",
+        "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv", "new hampshire": "nh",
+        "new jersey": "nj", "new mexico": "nm", "new york": "ny", "north carolina": "nc",
+        "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or", "pennsylvania": "pa",
+        "rhode island": "ri", "south carolina": "sc", "south dakota": "sd", "tennessee": "tn",
+        "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa",
+        "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy", "district of columbia": "dc",
+    },
+    "CANADA": {
+        "ontario": "on", "quebec": "qc", "british columbia": "bc", "alberta": "ab", "manitoba": "mb",
+        "saskatchewan": "sk", "nova scotia": "ns", "new brunswick": "nb",
+        "newfoundland and labrador": "nl", "prince edward island": "pe",
+    },
+    "AUSTRALIA": {
+        "new south wales": "nsw", "victoria": "vic", "queensland": "qld", "western australia": None,
+        "south australia": None, "tasmania": "tas",
+    },
+    "INDIA": {
+        "karnataka": None, "maharashtra": None, "tamil nadu": None, "telangana": None,
+        "west bengal": None, "uttar pradesh": None, "gujarat": None, "kerala": None, "haryana": None,
+    },
+}
+
+_CITIES = {
+    "USA": [
+        "new york city", "nyc", "los angeles", "san francisco", "seattle", "chicago", "boston",
+        "austin", "dallas", "houston", "atlanta", "denver", "miami", "san diego", "san jose",
+        "philadelphia", "phoenix", "portland", "washington dc", "mountain view", "palo alto",
+        "sunnyvale", "redmond", "pittsburgh", "minneapolis", "detroit", "nashville", "raleigh", "new york",
+    ],
+    "CANADA": ["toronto", "vancouver", "montreal", "ottawa", "calgary", "edmonton", "waterloo"],
+    "UK": ["london", "manchester", "birmingham", "edinburgh", "glasgow", "bristol", "leeds", "cambridge", "oxford"],
+    "IRELAND": ["dublin", "cork"],
+    "GERMANY": ["berlin", "munich", "hamburg", "frankfurt", "cologne", "stuttgart"],
+    "FRANCE": ["paris", "lyon", "marseille", "toulouse"],
+    "NETHERLANDS": ["amsterdam", "rotterdam", "the hague", "utrecht", "eindhoven"],
+    "SPAIN": ["madrid", "barcelona", "valencia"],
+    "ITALY": ["rome", "milan", "turin"],
+    "SWITZERLAND": ["zurich", "geneva", "basel"],
+    "SWEDEN": ["stockholm", "gothenburg"],
+    "POLAND": ["warsaw", "krakow", "wroclaw"],
+    "INDIA": [
+        "bangalore", "bengaluru", "mumbai", "new delhi", "delhi", "hyderabad", "chennai", "pune",
+        "kolkata", "gurgaon", "gurugram", "noida", "ahmedabad",
+    ],
+    "PAKISTAN": ["karachi", "lahore", "islamabad"],
+    "SINGAPORE": ["singapore"],
+    "HONGKONG": ["hong kong"],
+    "JAPAN": ["tokyo", "osaka"],
+    "CHINA": ["beijing", "shanghai", "shenzhen"],
+    "AUSTRALIA": ["sydney", "melbourne", "brisbane", "perth", "adelaide", "canberra"],
+    "NEWZEALAND": ["auckland", "wellington"],
+    "UNITEDARABEMIRATES": ["dubai", "abu dhabi"],
+    "SAUDIARABIA": ["riyadh", "jeddah"],
+    "BRAZIL": ["sao paulo", "rio de janeiro"],
+    "MEXICO": ["mexico city", "guadalajara", "monterrey"],
+    "NIGERIA": ["lagos", "abuja"],
+    "SOUTHAFRICA": ["johannesburg", "cape town"],
+    "PHILIPPINES": ["manila"],
+    "MALAYSIA": ["kuala lumpur"],
+}
+
+# Parts that say nothing about the country
+_IGNORED_PARTS = {"remote", "hybrid", "onsite", "on site", "anywhere", "worldwide"}
+
+# Minimum similarity for fuzzy matches of names (not codes)
+_FUZZY_CUTOFF = 0.85
+
+
+def _normalize(text: str) -> str:
+    """Lowercases, strips accents, drops punctuation and postal codes, and collapses whitespace."""
+    text = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^a-z\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _build_index() -> tuple[dict[str, set[str]], dict[str, set[str]], dict[str, str]]:
+    """
+    Builds the alias indexes.
+
+    Returns:
+        tuple: (names -> countries, codes -> countries, cities -> country); countries are
+            jobspy Country member names
+    """
+    names: dict[str, set[str]] = {}
+    codes: dict[str, set[str]] = {}
+    cities: dict[str, str] = {}
+
+    for country in Country:
+        if country.name in _INTERNAL_COUNTRIES:
+            continue
+        aliases = country.value[0].split(",") + [country.name.lower()]
+        aliases += _EXTRA_COUNTRY_ALIASES.get(country.name, [])
+        for alias in aliases:
+            names.setdefault(_normalize(alias), set()).add(country.name)
+        _, code = country.indeed_domain_value
+        codes.setdefault(code.lower(), set()).add(country.name)
+
+    for country, regions in _REGIONS.items():
+        for region, code in regions.items():
+            names.setdefault(region, set()).add(country)
+            if code:
+                codes.setdefault(code, set()).add(country)
+
+    for country, city_names in _CITIES.items():
+        for city in city_names:
+            cities[city] = country
+            names.setdefault(city, set()).add(country)
+
+    return names, codes, cities
+
+
+_NAMES, _CODES, _CITY_NAMES = _build_index()
+
+
+def _match(part: str) -> str | None:
+    """
+    Returns the index key a location part refers to.
+
+    Args:
+        part (str): A normalised location part
+
+    Returns:
+        str | None: A key of the name or code index, or None if the part is not recognised
+    """
+    if part in _NAMES or part in _CODES:
+        return part
+    if len(part) >= 4:
+        matches = difflib.get_close_matches(part, _NAMES.keys(), n=1, cutoff=_FUZZY_CUTOFF)
+        if matches:
+            return matches[0]
+    return None
+
+
+def _split_location(location: str) -> list[tuple[str, str]]:
+    """Splits a location into (raw, normalised) parts, separating trailing codes ("San Francisco CA")."""
+    parts = []
+    for raw in re.split(r"[,|/;()•]| - ", location):
+        raw = raw.strip()
+        part = _normalize(raw)
+        if not part or part in _IGNORED_PARTS:
+            continue
+        words = part.rsplit(" ", 1)
+        if _match(part) is None and len(words) == 2 and words[1] in _CODES:
+            parts.append((raw, words[0]))
+            parts.append((raw, words[1]))
+        else:
+            parts.append((raw, part))
+    return parts
+
+
+def country_search_name(country: str) -> str:
+    """
+    Returns the name of a jobspy Country member that `Country.from_string` accepts.
+
+    Args:
+        country (str): A Country member name, e.g. "SOUTHAFRICA"
+
+    Returns:
+        str: The country's primary search name, e.g. "south africa"
+    """
+    return Country[country].value[0].split(",")[0]
+
+
+def supported_country(country: str | None) -> str:
+    """
+    Returns the country if jobspy accepts it, otherwise "worldwide".
+
+    `scrape_jobs` raises for countries `Country.from_string` does not know,
+    failing every site of the search.
+
+    Args:
+        country (str | None): A country name, e.g. from the LLM
+
+    Returns:
+        str: The country, or "worldwide"
+    """
+    try:
+        Country.from_string(country or "")
+    except ValueError:
+        return "worldwide"
+    return country
+
+
+def resolve_location(location: str | None) -> tuple[str, str | None] | None:
+    """
+    Resolves a free-text location to a jobspy country and a city.
+
+    Args:
+        location (str | None): The location, e.g. "Austin, TX" or "Bengaluru, India"
+
+    Returns:
+        tuple[str, str | None] | None: The country's search name and the city (if one was
+            given), or None if the location is missing, unknown or ambiguous
+    """
+    if not location:
+        return None
+
+    candidates: set[str] | None = None
+    known_city = unknown_part = None
+    for raw, part in _split_location(location):
+        key = _match(part)
+        if key is None:
+            # Probably a city missing from the index; skip street addresses
+            if unknown_part is None and not re.search(r"\d", raw):
+                unknown_part = raw
+            continue
+        countries = _NAMES.get(key) or _CODES[key]
+        candidates = countries if candidates is None else candidates & countries
+        if known_city is None and key in _CITY_NAMES:
+            # Use the indexed spelling for fuzzy matches and "City ST" parts
+            known_city = raw if _normalize(raw) == key else key.title()
+
+    if not candidates or len(candidates) != 1:
+        return None
+    return country_search_name(next(iter(candidates))), known_city or unknown_part
@@ -0,0 +1,62 @@
+import threading
+
+from app.shared.llm.instrumentation import LATENCY_BUCKETS, Histogram
+
+
+class SiteMetrics:
+    """Aggregated scrape metrics of one job board."""
+
+    def __init__(self):
+        self.scrapes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.jobs = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+    def summary(self) -> dict:
+        return {
+            "scrapes": self.scrapes,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "jobs": self.jobs,
+            "latency_seconds": self.latency.summary(),
+        }
+
+
+class SiteScrapeMetrics:
+    """
+    In-process scrape latency, error and timeout counters per job board.
+
+    Latency and errors are recorded by the scrape itself when it finishes,
+    so a scrape that outlives its timeout still reports its real duration;
+    timeouts are recorded by the caller that stopped waiting for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, SiteMetrics] = {}
+
+    def record_scrape(self, site: str, seconds: float, jobs: int = 0, error: bool = False):
+        with self._lock:
+            metrics = self._metrics.setdefault(site, SiteMetrics())
+            metrics.scrapes += 1
+            metrics.errors += error
+            metrics.jobs += jobs
+            metrics.latency.observe(seconds)
+
+    def record_timeout(self, site: str):
+        with self._lock:
+            self._metrics.setdefault(site, SiteMetrics()).timeouts += 1
+
+    def get_stats(self) -> dict:
+        """
+        Returns the metrics of every job board.
+
+        Returns:
+            dict: Metrics keyed by site name
+        """
+        with self._lock:
+            return {site: metrics.summary() for site, metrics in self._metrics.items()}
+
+
+site_scrape_metrics = SiteScrapeMetrics()
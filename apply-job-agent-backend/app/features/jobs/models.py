@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Computed, Index, Integer, JSON, DateTime, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from app.core.base import Base
+import uuid
+
+
+class JobSearchCacheEntry(Base):
+    """
+    Model for caching job scrape results shared by all workers.
+
+    Entries are keyed by the sha256 of the normalised search (job title,
+    location, country, sites and hours_old) and served fresh for
+    JOB_CACHE_TTL_SECONDS, then stale while a single background refresh runs.
+    """
+
+    __tablename__ = "job_search_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 hex digest of the normalised search
+    job_title = Column(String, nullable=False)
+    location = Column(String, nullable=True)
+    country = Column(String, nullable=True)
+    sites = Column(String, nullable=False)  # Sorted, comma-separated
+    hours_old = Column(Integer, nullable=False)
+    jobs = Column(JSON, nullable=False)  # List of scraped jobs as returned by /jobs/get-jobs
+    fetched_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    refreshing_until = Column(DateTime(timezone=True), nullable=True)  # Lease of the running background refresh
+    hit_count = Column(Integer, nullable=False, default=0)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class Job(Base):
+    """
+    Model for the local job store.
+
+    Jobs are upserted by the background ingestion of popular searches and
+    by live scrapes, and `/jobs/get-jobs` answers from this table with
+    full-text search before scraping. `search_vector` is generated by
+    Postgres from the title (weight A) and company (weight B).
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    job_key = Column(String(64), nullable=False, unique=True)  # sha256 hex digest of the site and job URL
+    site = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    company = Column(String, nullable=True)
+    location = Column(String, nullable=True)
+    country = Column(String, nullable=True, index=True)  # Normalised country of the search that found the job
+    description = Column(Text, nullable=True)
+    url = Column(String, nullable=True)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(company, '')), 'B')",
+            persisted=True,
+        ),
+    )
+    first_seen_at = Column(DateTime(timezone=True), nullable=False)
+    last_seen_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Last scrape that returned the job
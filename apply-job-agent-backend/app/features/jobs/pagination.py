@@ -0,0 +1,194 @@
+"""
+Cursor pagination over server-side job result sets.
+
+A paginated search answers its first page from the usual fast search and
+keeps the jobs in a result set, which a background fill then extends with
+a larger window of jobs from the job store and from re-scraping every site
+for JOB_RESULT_SET_RESULTS_WANTED jobs. Later pages are read from the
+result set by cursor. Result sets live in this process: at most
+JOB_RESULT_SET_MAX_SETS of them, each holding at most
+JOB_RESULT_SET_MAX_JOBS jobs, are kept, the least recently read are
+evicted first, and a result set expires JOB_RESULT_SET_TTL_SECONDS after
+its last read.
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.features.jobs.dedup import JobDeduplicator
+
+
+class JobResultSet:
+    """
+    The growing, de-duplicated jobs of one paginated search.
+
+    Jobs are only ever appended, so an offset into the result set stays
+    valid while the background fill adds to it.
+    """
+
+    def __init__(self, user_id: int, sites: dict):
+        """
+        Args:
+            user_id (int): The user the result set belongs to
+            sites (dict): The status of each site in the first page's search
+        """
+        self.id = secrets.token_urlsafe(16)
+        self.user_id = user_id
+        self.sites = sites
+        self.jobs: list[dict] = []
+        self.filling = True
+        self.closed = False
+        self._urls: set[str] = set()
+        self._deduplicator = JobDeduplicator() if settings.JOB_DEDUP_ENABLED else None
+        self._lock = threading.Lock()
+
+    @property
+    def full(self) -> bool:
+        return len(self.jobs) >= settings.JOB_RESULT_SET_MAX_JOBS
+
+    def add(self, jobs: list[dict]) -> int:
+        """
+        Appends the jobs not already in the result set, up to JOB_RESULT_SET_MAX_JOBS.
+
+        Args:
+            jobs (list[dict]): Jobs in the order they should be paged
+
+        Returns:
+            int: Number of jobs appended
+        """
+        added = 0
+        with self._lock:
+            for job in jobs:
+                if self.full:
+                    break
+                # The fill finds the first page's jobs again
+                if job.get("url") and job["url"] in self._urls:
+                    continue
+                self._urls.add(job.get("url"))
+                if self._deduplicator is not None:
+                    if self._deduplicator.add(job) is not None:
+                        continue
+                    job = self._deduplicator.jobs[-1]
+                self.jobs.append(job)
+                added += 1
+        return added
+
+    def finish(self):
+        """Marks the background fill as done; the result set no longer grows."""
+        with self._lock:
+            self.filling = False
+            # The fill's fingerprints are only needed while jobs are added
+            self._deduplicator = None
+
+    def page(self, offset: int, page_size: int) -> dict:
+        """
+        Returns the jobs from an offset.
+
+        Args:
+            offset (int): Index of the page's first job
+            page_size (int): Maximum number of jobs
+
+        Returns:
+            dict: The jobs, the cursor of the next page (None after the last page),
+                the number of jobs found so far and whether more are being fetched
+        """
+        with self._lock:
+            jobs = self.jobs[offset:offset + page_size]
+            end = offset + len(jobs)
+            more = end < len(self.jobs) or self.filling
+            return {
+                "jobs": jobs,
+                "next_cursor": f"{self.id}.{end}" if more else None,
+                "total_found": len(self.jobs),
+                "filling": self.filling,
+                "sites": self.sites,
+            }
+
+
+class JobResultSets:
+    """
+    In-process registry of paginated result sets, bounded in count and time.
+    """
+
+    _lock = threading.Lock()
+    _result_sets: OrderedDict[str, tuple[JobResultSet, float]] = OrderedDict()
+    _stats = {"created": 0, "pages": 0, "expired": 0, "evicted": 0}
+
+    @classmethod
+    def add(cls, result_set: JobResultSet):
+        """Registers a result set, evicting the least recently read ones over JOB_RESULT_SET_MAX_SETS."""
+        with cls._lock:
+            cls._expire()
+            cls._result_sets[result_set.id] = (result_set, time.monotonic() + settings.JOB_RESULT_SET_TTL_SECONDS)
+            cls._stats["created"] += 1
+            while len(cls._result_sets) > settings.JOB_RESULT_SET_MAX_SETS:
+                _, (evicted, _) = cls._result_sets.popitem(last=False)
+                evicted.closed = True
+                cls._stats["evicted"] += 1
+
+    @classmethod
+    def get_page(cls, user_id: int, cursor: str, page_size: int) -> dict:
+        """
+        Returns the page a cursor points to.
+
+        Args:
+            user_id (int): The user reading the page
+            cursor (str): A "next_cursor" of an earlier page
+            page_size (int): Maximum number of jobs
+
+        Returns:
+            dict: The page, as returned by `JobResultSet.page`
+
+        Raises:
+            HTTPException: If the cursor is malformed (400), or its result set expired,
+                was evicted or belongs to another user (410)
+        """
+        result_set_id, _, offset = cursor.rpartition(".")
+        if not result_set_id or not offset.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        with cls._lock:
+            cls._expire()
+            entry = cls._result_sets.get(result_set_id)
+            if entry is None or entry[0].user_id != user_id:
+                raise HTTPException(status_code=410, detail="The search results have expired; start a new search")
+            result_set = entry[0]
+            cls._result_sets[result_set_id] = (result_set, time.monotonic() + settings.JOB_RESULT_SET_TTL_SECONDS)
+            cls._result_sets.move_to_end(result_set_id)
+            cls._stats["pages"] += 1
+        return result_set.page(int(offset), page_size)
+
+    @classmethod
+    def _expire(cls):
+        """Drops expired result sets; the oldest reads come first. Callers hold the lock."""
+        now = time.monotonic()
+        while cls._result_sets:
+            result_set_id, (result_set, expires_at) = next(iter(cls._result_sets.items()))
+            if expires_at >= now:
+                break
+            del cls._result_sets[result_set_id]
+            result_set.closed = True
+            cls._stats["expired"] += 1
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns the in-process counters.
+
+        Returns:
+            dict: Result sets created, expired and evicted, pages read, and the
+                result sets and jobs currently held
+        """
+        with cls._lock:
+            cls._expire()
+            held = [result_set for result_set, _ in cls._result_sets.values()]
+            return {
+                **cls._stats,
+                "result_sets": len(held),
+                "filling": sum(result_set.filling for result_set in held),
+                "jobs": sum(len(result_set.jobs) for result_set in held),
+            }
@@ -0,0 +1,139 @@
+"""
+Local relevance ranking of jobs against a resume.
+
+Jobs are scored with BM25 against keywords taken from the stored resume
+(technical skills, work experience titles and project technologies). Only
+the resume's terms are indexed, so one batch of jobs becomes a sparse
+jobs x terms count matrix, and every score and keyword match comes from a
+few vectorised operations on it. Title terms count TITLE_WEIGHT times as
+much as description terms. IDF is computed over the batch being ranked.
+"""
+import string
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3
+
+# Punctuation that separates terms; ".", "+" and "#" are kept so "c++", "c#",
+# "node.js" and ".net" stay single terms
+_SEPARATORS = str.maketrans({character: " " for character in string.punctuation if character not in ".+#"})
+
+
+def tokenize(text: str | None) -> list[str]:
+    """
+    Lowercases and splits text into terms.
+
+    Terms may end with a sentence's full stop ("python."); see `_term_lookup`.
+    """
+    return (text or "").lower().translate(_SEPARATORS).split()
+
+
+def _term_lookup(vocabulary: dict[str, int]) -> dict[str, int]:
+    """Maps each vocabulary term, with and without a trailing full stop, to its column."""
+    lookup = dict(vocabulary)
+    lookup.update({f"{term}.": column for term, column in vocabulary.items()})
+    return lookup
+
+
+def resume_keywords(resume_information) -> list[str]:
+    """
+    Returns the keywords of a resume that jobs are ranked against.
+
+    Args:
+        resume_information (dict | ResumeParseResponse): The stored resume data
+
+    Returns:
+        list[str]: Lowercased, de-duplicated technical skills, work experience titles
+            and project technologies
+    """
+    if not isinstance(resume_information, dict):
+        resume_information = resume_information.dict()
+
+    keywords = list((resume_information.get("skills") or {}).get("technical_skills") or [])
+    keywords += [experience.get("job_title") for experience in resume_information.get("work_experience") or []]
+    for project in resume_information.get("projects") or []:
+        keywords += project.get("technologies_used") or []
+
+    normalized = (" ".join(term.rstrip(".") for term in tokenize(keyword)) for keyword in keywords)
+    return list(dict.fromkeys(keyword for keyword in normalized if keyword))
+
+
+def rank_jobs(jobs: list[dict], resume_information) -> list[dict]:
+    """
+    Scores jobs against a resume and sorts them by score, best first.
+
+    Args:
+        jobs (list[dict]): Jobs with "title" and "description"
+        resume_information (dict | ResumeParseResponse): The stored resume data
+
+    Returns:
+        list[dict]: The jobs, each with a "score" and its "matched_keywords";
+            jobs with equal scores keep their order
+    """
+    if not jobs:
+        return []
+    keywords = resume_keywords(resume_information)
+    if not keywords:
+        return [{**job, "score": 0.0, "matched_keywords": []} for job in jobs]
+
+    # Vocabulary of the resume's terms; keyword x term incidence
+    keyword_terms = [keyword.split() for keyword in keywords]
+    vocabulary = {term: index for index, term in enumerate(dict.fromkeys(t for terms in keyword_terms for t in terms))}
+    keyword_matrix = sparse.csr_matrix(
+        (
+            np.ones(sum(len(set(terms)) for terms in keyword_terms)),
+            (
+                np.repeat(np.arange(len(keywords)), [len(set(terms)) for terms in keyword_terms]),
+                [vocabulary[term] for terms in keyword_terms for term in dict.fromkeys(terms)],
+            ),
+        ),
+        shape=(len(keywords), len(vocabulary)),
+    )
+    keyword_lengths = np.asarray(keyword_matrix.sum(axis=1)).ravel()
+
+    # Weighted job x term counts; job lengths include terms outside the vocabulary.
+    # Only the terms each job shares with the resume are visited
+    lookup = _term_lookup(vocabulary)
+    rows, columns, weights = [], [], []
+    lengths = np.empty(len(jobs))
+    for row, job in enumerate(jobs):
+        title, description = tokenize(job.get("title")), tokenize(job.get("description"))
+        lengths[row] = TITLE_WEIGHT * len(title) + len(description)
+        for terms, weight in ((title, TITLE_WEIGHT), (description, 1)):
+            term_counts = Counter(terms)
+            for term in term_counts.keys() & lookup.keys():
+                rows.append(row)
+                columns.append(lookup[term])
+                weights.append(weight * term_counts[term])
+    counts = sparse.csr_matrix((weights, (rows, columns)), shape=(len(jobs), len(vocabulary)), dtype=np.float64)
+    counts.sum_duplicates()
+
+    # BM25 term saturation and length normalisation, applied to the non-zero entries only
+    document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+    idf = np.log1p((len(jobs) - document_frequency + 0.5) / (document_frequency + 0.5))
+    average_length = max(lengths.mean(), 1.0)
+    entry_rows = np.repeat(np.arange(len(jobs)), np.diff(counts.indptr))
+    norms = K1 * (1 - B + B * lengths[entry_rows] / average_length)
+    saturated = counts.copy()
+    saturated.data = counts.data * (K1 + 1) / (counts.data + norms)
+    scores = saturated @ idf
+
+    # A keyword matches when all of its terms occur in the job
+    presence = counts.copy()
+    presence.data = np.ones_like(presence.data)
+    matched = (presence @ keyword_matrix.T).toarray() >= keyword_lengths
+
+    order = np.argsort(-scores, kind="stable")
+    return [
+        {
+            **jobs[index],
+            "score": round(float(scores[index]), 4),
+            "matched_keywords": [keywords[keyword] for keyword in np.flatnonzero(matched[index])],
+        }
+        for index in order
+    ]
@@ -1,7 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.features.jobs.schemas import *
+from app.features.jobs.cache import JobSearchCache
+from app.features.jobs.descriptions import JobDescriptionService
+from app.features.jobs.metrics import site_scrape_metrics
+from app.features.jobs.pagination import JobResultSets
+from app.features.jobs.store import JobStore
 from app.features.jobs.services import JobService
 from app.core.dependencies import AuthenticatedUser, get_db
+from app.core.session import SessionLocal
+from app.core.config import settings
 from app.features.resume.services import ResumeService
 from sqlalchemy.orm import Session
 
@@ -10,27 +20,254 @@ router = APIRouter(prefix="/jobs", tags=["Jobs"])
 @router.post("/get-jobs")
 async def get_jobs(
     current_user: AuthenticatedUser,
+    include_descriptions: bool = Query(True, description="Return the descriptions the search has; false returns listing summaries"),
     db: Session = Depends(get_db)
 ):
     try:
-        # Get the resume information from the authenticated user
-        resume_information = ResumeService.get_resume_data_from_db(current_user, db)
+        # Get the latest resume of the authenticated user
+        resume = ResumeService.get_latest_resume(current_user, db)
         
         # Check if resume information is available
-        if not resume_information:
+        if not resume or not resume.resume_data:
             raise HTTPException(status_code=404, detail="Resume information not found")
+        resume_information = resume.resume_data
         
-        # Call the service to get job search input with the new parameters
-        job_search_input = JobService.get_job_search_input(
-           resume_information,
-        )
+        # Get the job search input stored with the resume, deriving it on first use
+        job_search_input = await JobService.aget_saved_job_search_input(resume, db)
         
-        # Get jobs using the job search input
-        jobs = JobService.get_jobs(job_search_input)
+        # Get jobs using the job search input; scraping blocks, so it runs in a worker thread
+        jobs = await run_in_threadpool(
+            JobService.get_jobs, job_search_input, db, resume_information, include_descriptions
+        )
         
         # Return the response
         return jobs
     
+    except HTTPException:
+        raise
     except Exception as e:
         # Handle exceptions and return an error response
-        raise HTTPException(status_code=500, detail=f"Failed to get jobs: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get jobs: {str(e)}")
+
+@router.post(
+    "/get-jobs/stream",
+    summary="Get jobs as they are scraped",
+    description="Newline-delimited JSON events: a site event as each job board finishes, fails or times out, "
+                "a job event per job (or a duplicate event adding a source to a job already sent), "
+                "then done with the per-site summary, or error if every site failed."
+)
+async def get_jobs_stream(
+    current_user: AuthenticatedUser,
+    include_descriptions: bool = Query(True, description="Send the descriptions the search has; false sends listing summaries"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the jobs for the user's resume as NDJSON.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+        include_descriptions (bool): Whether to send full descriptions.
+        db (Session): The database session.
+    Returns:
+        StreamingResponse: An application/x-ndjson stream of {"event", "data"} objects.
+    """
+    resume = ResumeService.get_latest_resume(current_user, db)
+    if not resume or not resume.resume_data:
+        raise HTTPException(status_code=404, detail="Resume information not found")
+    resume_information = resume.resume_data
+
+    job_search_input = await JobService.aget_saved_job_search_input(resume, db)
+
+    async def events():
+        # The request's session is closed before the response body is streamed
+        stream_db = SessionLocal()
+        try:
+            async for event, data in JobService.astream_jobs(job_search_input, stream_db, resume_information, include_descriptions):
+                yield json.dumps({"event": event, "data": data}) + "\n"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post(
+    "/get-jobs/pages",
+    summary="Get jobs a page at a time",
+    description="Without a cursor, runs the search and returns its first page; the result set keeps growing "
+                "in the background with a larger window of stored and scraped jobs. Pass a page's next_cursor "
+                "to read the next page; next_cursor is null after the last page, and expired cursors return 410."
+)
+async def get_jobs_page(
+    current_user: AuthenticatedUser,
+    cursor: str | None = Query(None, description="The next_cursor of the previous page"),
+    page_size: int = Query(settings.JOB_PAGE_SIZE, ge=1, le=settings.JOB_PAGE_SIZE_MAX, description="Jobs per page"),
+    include_descriptions: bool = Query(False, description="Return full descriptions instead of listing summaries"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get one page of the jobs for the user's resume.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+        cursor (str | None): The cursor of the page to read; None starts a new search.
+        page_size (int): The maximum number of jobs in the page.
+        include_descriptions (bool): Whether to return full descriptions.
+        db (Session): The database session.
+    Returns:
+        dict: The jobs, the next page's cursor, the jobs found so far and whether more are being fetched.
+    """
+    if cursor is not None:
+        page = JobResultSets.get_page(current_user.id, cursor, page_size)
+    else:
+        resume = ResumeService.get_latest_resume(current_user, db)
+        if not resume or not resume.resume_data:
+            raise HTTPException(status_code=404, detail="Resume information not found")
+
+        job_search_input = await JobService.aget_saved_job_search_input(resume, db)
+        # The first page may be scraped live, which blocks, so it runs in a worker thread
+        page = await run_in_threadpool(
+            JobService.start_paged_search, job_search_input, db, current_user.id, page_size, resume.resume_data
+        )
+
+    if not include_descriptions:
+        page = {**page, "jobs": JobService.summarize(page["jobs"])}
+    return page
+
+@router.get(
+    "/description",
+    response_model=JobDescriptionResponse,
+    summary="Get a job's full description",
+    description="Returns the description of a LinkedIn or Indeed job URL, fetching and caching it on first request."
+)
+def get_job_description(
+    current_user: AuthenticatedUser,
+    url: str = Query(..., description="The job URL, as returned by /jobs/get-jobs"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the full description of one job.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+        url (str): The job URL.
+        db (Session): The database session.
+    Returns:
+        JobDescriptionResponse: The description and where it came from.
+    """
+    return JobDescriptionService.get_description(db, url)
+
+@router.post(
+    "/descriptions",
+    response_model=JobDescriptionsResponse,
+    summary="Get the full descriptions of several jobs",
+    description="Returns the descriptions of up to JOB_DESCRIPTION_BULK_MAX job URLs, fetching missing ones concurrently."
+)
+def get_job_descriptions(
+    request: JobDescriptionsRequest,
+    current_user: AuthenticatedUser,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the full descriptions of several jobs.
+    Args:
+        request (JobDescriptionsRequest): The job URLs.
+        current_user (AuthenticatedUser): The authenticated user.
+        db (Session): The database session.
+    Returns:
+        JobDescriptionsResponse: One result per URL; failed URLs carry an error.
+    """
+    if len(request.urls) > settings.JOB_DESCRIPTION_BULK_MAX:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.JOB_DESCRIPTION_BULK_MAX} job URLs can be requested at once"
+        )
+    return {"descriptions": JobDescriptionService.get_descriptions(db, request.urls)}
+
+@router.get(
+    "/search-cache/stats",
+    summary="Get job search cache statistics",
+    description="Fresh/stale hit, miss and background refresh counters for the shared job search cache in this process."
+)
+async def get_search_cache_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the job search cache counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Fresh hits, stale hits, misses, refreshes, hit rate and TTLs.
+    """
+    return JobSearchCache.get_stats()
+
+
+@router.get(
+    "/site-metrics",
+    summary="Get job board scrape metrics",
+    description="Scrape latency, error and timeout counts per job board in this process."
+)
+async def get_site_metrics(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the per-site scrape metrics.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Scrapes, errors, timeouts, jobs and latency percentiles per site.
+    """
+    return site_scrape_metrics.get_stats()
+
+
+@router.get(
+    "/store/stats",
+    summary="Get job store statistics",
+    description="Hit/miss counters of searches answered from the local job store, and jobs upserted, in this process."
+)
+async def get_store_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the job store counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Hits, misses, hit rate and jobs upserted.
+    """
+    return JobStore.get_stats()
+
+
+@router.get(
+    "/descriptions/stats",
+    summary="Get job description statistics",
+    description="Cache hits, store hits and page fetches of on-demand job descriptions in this process."
+)
+async def get_description_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the job description counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Cache and store hits, fetches, fetch failures and cached descriptions.
+    """
+    return JobDescriptionService.get_stats()
+
+
+@router.get(
+    "/result-sets/stats",
+    summary="Get paginated result set statistics",
+    description="Result sets created, expired and evicted, pages read, and the result sets and jobs held in this process."
+)
+async def get_result_set_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the paginated result set counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Result set counters and current holdings.
+    """
+    return JobResultSets.get_stats()
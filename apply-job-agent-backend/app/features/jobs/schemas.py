@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class GetJobsRequest(BaseModel):
@@ -8,4 +9,17 @@ class JobSearchInput(BaseModel):
     location: str = Field(description="Personal location or address.")
     google_search_text: str = Field(description="The text to be used for Google search.")
     country: str = Field(description="The country of the user.")
-    city: str = Field(description="The city of the user.")
\ No newline at end of file
+    city: str = Field(description="The city of the user.")
+
+class JobDescriptionsRequest(BaseModel):
+    urls: List[str] = Field(min_length=1, description="URLs of the jobs whose descriptions to return.")
+
+class JobDescriptionResponse(BaseModel):
+    url: str = Field(description="The job URL.")
+    site: Optional[str] = Field(None, description="The job board the URL belongs to.")
+    description: Optional[str] = Field(None, description="The full description as markdown; empty if the page has none.")
+    source: Optional[str] = Field(None, description="Where the description came from: cache, store or fetched.")
+    error: Optional[str] = Field(None, description="Why the description could not be returned.")
+
+class JobDescriptionsResponse(BaseModel):
+    descriptions: List[JobDescriptionResponse] = Field(description="One result per requested URL, in order.")
\ No newline at end of file
@@ -3,78 +3,682 @@ from langchain_core.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from app.features.jobs.schemas import JobSearchInput
 from jobspy import scrape_jobs
-from jobspy.model import Country
-from app.shared.llm.llm_model import gpt_model
+from app.features.jobs.location import resolve_location, supported_country
+from app.shared.llm.client_manager import LLMCapacityError, capacity_http_exception
+from app.shared.llm.llm_model import get_chain_model
+from app.shared.llm.prompt_registry import prompt_registry
 import pandas as pd
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.session import SessionLocal
+from app.features.jobs.cache import JobSearchCache
+from app.features.jobs.metrics import site_scrape_metrics
+from app.features.jobs.pagination import JobResultSet, JobResultSets
+from app.features.jobs.dedup import JobDeduplicator, deduplicate_jobs
+from app.features.jobs.ranking import rank_jobs
+from app.features.jobs.store import JobStore
+from app.features.resume.models import Resume
+from pydantic import ValidationError
+
+JOB_SEARCH_INPUT_CHAIN = "job_search_input"
+
+# Fields of a job in API responses, and the jobspy DataFrame column each comes from
+JOB_COLUMNS = {
+    "title": "title",
+    "site": "site",
+    "company": "company",
+    "location": "location",
+    "description": "description",
+    "url": "job_url",
+}
+
+# Background refreshes of stale job search cache entries
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-cache-refresh")
+
+# One task per site per search; sized so timed-out scrapes still running do not starve new searches
+_scrape_pool = ThreadPoolExecutor(max_workers=settings.JOB_SCRAPE_MAX_WORKERS, thread_name_prefix="job-scrape")
+
+# Background fills of paginated result sets; each also runs one scrape per site in the scrape pool
+_fill_pool = ThreadPoolExecutor(max_workers=settings.JOB_RESULT_SET_FILL_WORKERS, thread_name_prefix="job-result-set")
+
+
+def build_job_search_input_chain(prompts, model=None):
+    """Builds the chain that derives a JobSearchInput from resume data, routed by default."""
+    # Output parser for the LLM
+    parser = PydanticOutputParser(pydantic_object=JobSearchInput)
+
+    # Create a prompt template
+    prompt_template = PromptTemplate(
+        template=prompts.text("job_search_input"),
+        input_variables=["resume_information"],
+        partial_variables={
+            "format_instructions": parser.get_format_instructions(),
+        }
+    )
+
+    return prompt_template | (model or get_chain_model(JOB_SEARCH_INPUT_CHAIN)) | parser
+
+
+prompt_registry.register_chain(
+    JOB_SEARCH_INPUT_CHAIN, build_job_search_input_chain, prompts=["job_search_input"]
+)
+
+
+def jobs_from_frame(jobs: pd.DataFrame) -> list[dict]:
+    """
+    Converts a jobspy DataFrame to JSON-serialisable jobs.
+
+    Missing columns and values become empty strings; the whole frame is
+    converted with column operations rather than row by row.
+
+    Args:
+        jobs (pd.DataFrame): The scraped jobs
+
+    Returns:
+        list[dict]: The jobs, with the fields of JOB_COLUMNS
+    """
+    if jobs is None or jobs.empty:
+        return []
+    frame = jobs.reindex(columns=list(JOB_COLUMNS.values()))
+    frame.columns = list(JOB_COLUMNS)
+    return frame.astype(object).where(frame.notna(), "").astype(str).to_dict("records")
+
 
 class JobService:
+    @staticmethod
+    def resolve_search_location(resume_information, job_search_input: JobSearchInput) -> JobSearchInput:
+        """
+        Sets the country and city of a job search from the resume's location.
+
+        The resume location is resolved locally against jobspy's countries. Only
+        when it is missing or ambiguous is the LLM's answer used, normalised to
+        a country name jobspy accepts where possible; a country jobspy does not
+        support becomes "worldwide".
+
+        Args:
+            resume_information (dict | ResumeParseResponse): The stored resume data
+            job_search_input (JobSearchInput): The LLM's search input
+
+        Returns:
+            JobSearchInput: The search input with a resolved country and city
+        """
+        if not isinstance(resume_information, dict):
+            resume_information = resume_information.dict()
+        personal_information = resume_information.get("personal_information") or {}
+
+        resolved = resolve_location(personal_information.get("location"))
+        if resolved is None:
+            resolved = resolve_location(f"{job_search_input.city}, {job_search_input.country}")
+        if resolved is None:
+            resolved = resolve_location(job_search_input.country)
+        if resolved is not None:
+            country, city = resolved
+            job_search_input.country = country
+            job_search_input.city = city or job_search_input.city
+        job_search_input.country = supported_country(job_search_input.country)
+        return job_search_input
+
     @staticmethod
     def get_job_search_input(resume_information):
         try:
-            with open("app/shared/prompts/job_search_input.md", "r") as file:
-                prompt = file.read()
-                
-            # Output parser for the LLM
-            parser = PydanticOutputParser(pydantic_object=JobSearchInput)
-                
-            # Create a prompt template
-            prompt_template = PromptTemplate(
-                template=prompt,
-                input_variables=["resume_information", "Country"],
-                partial_variables={"format_instructions": parser.get_format_instructions()}
-            )
-            
-            # Create the chain
-            chain = prompt_template | gpt_model | parser
-            
-            # Convert country enum to list
-            country_list = [name for name, member in Country.__members__.items()]
-            
+            # Get the precompiled chain
+            chain = prompt_registry.chain(JOB_SEARCH_INPUT_CHAIN)
+
             # Get response
-            response = chain.invoke({'resume_information': resume_information, 'Country': country_list})
+            response = chain.invoke({'resume_information': resume_information})
             
-            return response
+            return JobService.resolve_search_location(resume_information, response)
                 
+        except LLMCapacityError as e:
+            raise capacity_http_exception(e)
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to read job search input template: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to get job search input: {str(e)}")
         
     @staticmethod
-    def get_jobs(input: JobSearchInput):
+    async def aget_job_search_input(resume_information):
+        """
+        Async version of `get_job_search_input` that does not block the event loop.
+        """
+        try:
+            chain = prompt_registry.chain(JOB_SEARCH_INPUT_CHAIN)
+            response = await chain.ainvoke({'resume_information': resume_information})
+            return JobService.resolve_search_location(resume_information, response)
+
+        except LLMCapacityError as e:
+            raise capacity_http_exception(e)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to get job search input: {str(e)}")
+
+    @staticmethod
+    def get_saved_job_search_input(resume: Resume, db: Session) -> JobSearchInput:
+        """
+        Returns the job search input stored with a resume, deriving and storing it on first use.
+
+        Args:
+            resume (Resume): The resume row
+            db (Session): Database session
+
+        Returns:
+            JobSearchInput: The job search input
+
+        Raises:
+            HTTPException: If the input has to be derived and that fails
+        """
+        saved = JobService.load_job_search_input(resume)
+        if saved is not None:
+            return saved
+        job_search_input = JobService.get_job_search_input(resume.resume_data)
+        JobService.save_job_search_input(resume, db, job_search_input)
+        return job_search_input
+
+    @staticmethod
+    async def aget_saved_job_search_input(resume: Resume, db: Session) -> JobSearchInput:
+        """
+        Async version of `get_saved_job_search_input` that does not block the event loop.
+        """
+        saved = JobService.load_job_search_input(resume)
+        if saved is not None:
+            return saved
+        job_search_input = await JobService.aget_job_search_input(resume.resume_data)
+        JobService.save_job_search_input(resume, db, job_search_input)
+        return job_search_input
+
+    @staticmethod
+    async def aprecompute_job_search_input(resume_id):
+        """
+        Derives and stores the job search input of a newly uploaded resume.
+
+        Runs after the upload response has been sent, with its own database
+        session. Failures are only logged; the input is then derived by the
+        first job search instead.
+
+        Args:
+            resume_id (UUID): The resume's id
+        """
+        db = SessionLocal()
+        try:
+            resume = db.query(Resume).filter(Resume.id == resume_id).first()
+            if resume is not None:
+                await JobService.aget_saved_job_search_input(resume, db)
+        except HTTPException as e:
+            print(f"Warning: failed to precompute the job search input of resume {resume_id}: {e.detail}")
+        except Exception as e:
+            print(f"Warning: failed to precompute the job search input of resume {resume_id}: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def load_job_search_input(resume: Resume) -> JobSearchInput | None:
+        """Returns the job search input stored with a resume, or None if there is none or it no longer validates."""
+        if not resume.job_search_input:
+            return None
+        try:
+            job_search_input = JobSearchInput(**resume.job_search_input)
+        except ValidationError:
+            return None
+        # Inputs stored before countries were checked may name one jobspy does not support
+        job_search_input.country = supported_country(job_search_input.country)
+        return job_search_input
+
+    @staticmethod
+    def save_job_search_input(resume: Resume, db: Session, job_search_input: JobSearchInput):
+        """Stores a resume's job search input; failures are logged, as the input can be derived again."""
+        try:
+            resume.job_search_input = job_search_input.dict()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to store the job search input of resume {resume.id}: {str(e)}")
+
+    @staticmethod
+    def get_jobs(input: JobSearchInput, db: Session | None = None, resume_information=None, include_descriptions: bool = True) -> dict:
+        """
+        Returns jobs for a search, from the job store or the shared job search cache when possible.
+
+        Searches with enough matching jobs in the local job store are answered
+        from it. Otherwise fresh cache entries are returned as is, and stale
+        entries are returned immediately while one background refresh
+        re-scrapes them. Misses are scraped live, stored, and cached unless
+        some sites failed or timed out. Without a database session the store
+        and cache are skipped. Near-duplicate postings are collapsed into one
+        job listing every source, and given the resume, the jobs are ranked by
+        their relevance to it.
+
+        Args:
+            input (JobSearchInput): The job search input
+            db (Session | None): Database session used for the store and cache
+            resume_information (dict | ResumeParseResponse | None): The stored resume data to rank jobs against
+            include_descriptions (bool): Whether to return descriptions, or only listing summaries
+
+        Returns:
+            dict: The jobs found (best matches first, each with a score and its matched
+                keywords, when ranked), the status of each site and whether the results are partial
+
+        Raises:
+            HTTPException: If every site failed or timed out
+        """
+        sites = settings.JOB_SEARCH_SITES
+        hours_old = settings.JOB_SEARCH_HOURS_OLD
+        result = JobService.find_saved_jobs(input, db, sites, hours_old)
+        if result is None:
+            result = JobService.scrape_live_jobs(input, sites, hours_old)
+            JobService.save_scraped_jobs(input, db, sites, hours_old, result)
+
+        jobs = result["jobs"]
+        if settings.JOB_DEDUP_ENABLED:
+            jobs = deduplicate_jobs(jobs)
+        if resume_information is not None:
+            jobs = rank_jobs(jobs, resume_information)
+        if not include_descriptions:
+            jobs = JobService.summarize(jobs)
+        return {**result, "jobs": jobs}
+
+    @staticmethod
+    async def astream_jobs(input: JobSearchInput, db: Session | None = None, resume_information=None, include_descriptions: bool = True):
+        """
+        Streams the jobs of a search as each site returns them.
+
+        Stored and cached searches are streamed at once. Live scrapes yield a
+        "site" event when a site finishes, fails or times out, followed by a
+        "job" event per job it found, so the first jobs can be shown while
+        slower sites are still being scraped. Results are then saved as in
+        `get_jobs`. Given the resume, each site's jobs are ranked against it as
+        they arrive, so scores are comparable within a site's batch. A job that
+        duplicates one already sent yields a "duplicate" event with the sent
+        job's URL and the new source instead.
+
+        Args:
+            input (JobSearchInput): The job search input
+            db (Session | None): Database session used for the store and cache
+            resume_information (dict | ResumeParseResponse | None): The stored resume data to rank jobs against
+            include_descriptions (bool): Whether to send descriptions, or only listing summaries
+
+        Yields:
+            tuple[str, dict]: ("site", status), ("job", job), ("duplicate", {"url", "source"}), then ("done", summary)
+                or ("error", {"status_code", "detail"}) if every site failed
+        """
+        sites = settings.JOB_SEARCH_SITES
+        hours_old = settings.JOB_SEARCH_HOURS_OLD
+        deduplicator = JobDeduplicator() if settings.JOB_DEDUP_ENABLED else None
+        emitted = 0
+
+        def job_events(jobs: list[dict]):
+            nonlocal emitted
+            if resume_information is not None:
+                jobs = rank_jobs(jobs, resume_information)
+            for job in jobs:
+                kept = deduplicator.add(job) if deduplicator is not None else None
+                if kept is not None:
+                    yield "duplicate", {"url": kept["url"], "source": kept["sources"][-1]}
+                    continue
+                emitted += 1
+                job = deduplicator.jobs[-1] if deduplicator is not None else job
+                yield "job", job if include_descriptions else JobService.summarize([job])[0]
+
+        found = JobService.find_saved_jobs(input, db, sites, hours_old)
+        if found is not None:
+            for site, status in found["sites"].items():
+                yield "site", {"site": site, **status}
+            for event in job_events(found["jobs"]):
+                yield event
+            yield "done", {"jobs": emitted, "sites": found["sites"], "partial": False}
+            return
+
+        started = time.monotonic()
+        futures = {
+            asyncio.wrap_future(future): site
+            for site, future in JobService.submit_site_scrapes(input, sites, hours_old).items()
+        }
+        site_jobs: dict[str, list[dict]] = {}
+        statuses: dict[str, dict] = {}
+        pending = set(futures)
+        while pending:
+            next_deadline = min(started + JobService.site_timeout(futures[future]) for future in pending)
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, next_deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                site = futures[future]
+                try:
+                    site_jobs[site] = future.result()
+                    statuses[site] = {"status": "ok", "jobs": len(site_jobs[site])}
+                except Exception as e:
+                    statuses[site] = {"status": "failed", "jobs": 0, "error": str(e)}
+                statuses[site]["seconds"] = round(time.monotonic() - started, 3)
+                yield "site", {"site": site, **statuses[site]}
+                for event in job_events(site_jobs.get(site, [])):
+                    yield event
+
+            for future in [future for future in pending if time.monotonic() >= started + JobService.site_timeout(futures[future])]:
+                site = futures[future]
+                pending.discard(future)
+                statuses[site] = JobService.timed_out(site, future)
+                statuses[site]["seconds"] = round(time.monotonic() - started, 3)
+                yield "site", {"site": site, **statuses[site]}
+
+        try:
+            result = JobService.collect_site_results(sites, site_jobs, statuses)
+        except HTTPException as e:
+            yield "error", {"status_code": e.status_code, "detail": e.detail}
+            return
+        JobService.save_scraped_jobs(input, db, sites, hours_old, result)
+        yield "done", {"jobs": emitted, "sites": result["sites"], "partial": result["partial"]}
+
+    @staticmethod
+    def start_paged_search(input: JobSearchInput, db: Session | None, user_id: int, page_size: int, resume_information=None) -> dict:
+        """
+        Returns the first page of a cursor-paginated search and starts filling its result set.
+
+        The first page comes from the job store, the cache or a live scrape as
+        in `get_jobs`. Its jobs seed a result set that a background fill then
+        extends (see `fill_result_set`); later pages are read from it with
+        `JobResultSets.get_page`. Given the resume, each batch of jobs added to
+        the result set is ranked against it, so pages are best first within
+        a batch.
+
+        Args:
+            input (JobSearchInput): The job search input
+            db (Session | None): Database session used for the store and cache
+            user_id (int): The user the result set belongs to
+            page_size (int): Maximum number of jobs per page
+            resume_information (dict | ResumeParseResponse | None): The stored resume data to rank jobs against
+
+        Returns:
+            dict: The first page, with the cursor of the next one
+
+        Raises:
+            HTTPException: If every site failed or timed out
+        """
+        sites = settings.JOB_SEARCH_SITES
+        hours_old = settings.JOB_SEARCH_HOURS_OLD
+        result = JobService.find_saved_jobs(input, db, sites, hours_old)
+        if result is None:
+            result = JobService.scrape_live_jobs(input, sites, hours_old)
+            JobService.save_scraped_jobs(input, db, sites, hours_old, result)
+
+        result_set = JobResultSet(user_id, result["sites"])
+        result_set.add(JobService.rank(result["jobs"], resume_information))
+        JobResultSets.add(result_set)
+        _fill_pool.submit(JobService.fill_result_set, result_set, input, resume_information)
+        return result_set.page(0, page_size)
+
+    @staticmethod
+    def fill_result_set(result_set: JobResultSet, input: JobSearchInput, resume_information=None):
+        """
+        Extends a paginated result set with a larger window of jobs.
+
+        Runs in the fill pool with its own database session. Stored jobs
+        matching the search are added first, then each site is re-scraped for
+        JOB_RESULT_SET_RESULTS_WANTED jobs and its jobs are stored and added as
+        it returns. The fill stops once the result set is full, expired or
+        evicted, or after JOB_RESULT_SET_FILL_TIMEOUT_SECONDS.
+
+        Args:
+            result_set (JobResultSet): The result set to extend
+            input (JobSearchInput): The job search input
+            resume_information (dict | ResumeParseResponse | None): The stored resume data to rank jobs against
+        """
+        sites = settings.JOB_SEARCH_SITES
+        hours_old = settings.JOB_SEARCH_HOURS_OLD
+        db = SessionLocal()
+        futures = {}
+        try:
+            if settings.JOB_STORE_ENABLED:
+                stored = JobStore.search(db, input, hours_old, limit=settings.JOB_RESULT_SET_MAX_JOBS)
+                if stored:
+                    result_set.add(JobService.rank(stored, resume_information))
+            if result_set.full or result_set.closed:
+                return
+
+            futures = JobService.submit_site_scrapes(input, sites, hours_old, settings.JOB_RESULT_SET_RESULTS_WANTED)
+            for future in as_completed(futures.values(), timeout=settings.JOB_RESULT_SET_FILL_TIMEOUT_SECONDS):
+                try:
+                    jobs = future.result()
+                except Exception:
+                    # scrape_site has logged and recorded the failure
+                    continue
+                if settings.JOB_STORE_ENABLED:
+                    JobStore.upsert(db, jobs, input.country)
+                result_set.add(JobService.rank(jobs, resume_information))
+                if result_set.full or result_set.closed:
+                    return
+        except FuturesTimeoutError:
+            print(f"Warning: filling job result set {result_set.id[:8]} timed out")
+        except Exception as e:
+            print(f"Warning: filling job result set {result_set.id[:8]} failed: {str(e)}")
+        finally:
+            for future in futures.values():
+                future.cancel()
+            result_set.finish()
+            db.close()
+
+    @staticmethod
+    def rank(jobs: list[dict], resume_information=None) -> list[dict]:
+        """Ranks jobs against the resume, if there is one."""
+        return rank_jobs(jobs, resume_information) if resume_information is not None else jobs
+
+    @staticmethod
+    def summarize(jobs: list[dict]) -> list[dict]:
+        """Drops the descriptions of jobs; they can be fetched on demand from /jobs/description."""
+        return [{key: value for key, value in job.items() if key != "description"} for job in jobs]
+
+    @staticmethod
+    def find_saved_jobs(input: JobSearchInput, db: Session | None, sites: list[str], hours_old: int) -> dict | None:
+        """
+        Answers a search from the job store or the job search cache.
+
+        Stale cache entries are returned while one background refresh
+        re-scrapes them.
+
+        Args:
+            input (JobSearchInput): The job search input
+            db (Session | None): Database session; None skips the store and cache
+            sites (list[str]): The job boards to search
+            hours_old (int): Maximum job posting age
+
+        Returns:
+            dict | None: A result shaped like `scrape_live_jobs`'s, or None if the search must be scraped
+        """
+        if db is None:
+            return None
+
+        if settings.JOB_STORE_ENABLED:
+            stored = JobStore.search(db, input, hours_old, limit=settings.JOB_SEARCH_RESULTS_WANTED * len(sites))
+            if stored is not None:
+                return {"jobs": stored, "sites": {site: {"status": "stored"} for site in sites}, "partial": False}
+
+        if settings.JOB_CACHE_ENABLED:
+            cache_key = JobSearchCache.key(input, sites, hours_old)
+            cached = JobSearchCache.get(db, cache_key)
+            if cached is not None:
+                jobs, fresh = cached
+                if not fresh and JobSearchCache.claim_refresh(db, cache_key):
+                    _refresh_pool.submit(JobService.refresh_cached_search, cache_key, input, sites, hours_old)
+                return {"jobs": jobs, "sites": {site: {"status": "cached"} for site in sites}, "partial": False}
+
+        return None
+
+    @staticmethod
+    def save_scraped_jobs(input: JobSearchInput, db: Session | None, sites: list[str], hours_old: int, result: dict):
+        """
+        Adds live scrape results to the job store and the job search cache.
+
+        Incomplete results are not cached, so the next search retries the missing sites.
+
+        Args:
+            input (JobSearchInput): The job search input
+            db (Session | None): Database session; None skips the store and cache
+            sites (list[str]): The job boards searched
+            hours_old (int): Maximum job posting age
+            result (dict): The result of `scrape_live_jobs`
+        """
+        if db is None:
+            return
+        if settings.JOB_STORE_ENABLED:
+            JobStore.upsert(db, result["jobs"], input.country)
+        if settings.JOB_CACHE_ENABLED and not result["partial"]:
+            cache_key = JobSearchCache.key(input, sites, hours_old)
+            JobSearchCache.put(db, cache_key, input, sites, hours_old, result["jobs"])
+
+    @staticmethod
+    def refresh_cached_search(cache_key: str, input: JobSearchInput, sites: list[str], hours_old: int):
+        """
+        Re-scrapes a stale cached search in the background.
+
+        Runs in the refresh thread pool with its own database session. If the
+        scrape fails or is partial the stale entry is kept and its lease
+        expires, so a later request retries the refresh.
+
+        Args:
+            cache_key (str): The search's cache key
+            input (JobSearchInput): The job search input
+            sites (list[str]): The job boards to search
+            hours_old (int): Maximum job posting age
+        """
+        db = SessionLocal()
+        try:
+            result = JobService.scrape_live_jobs(input, sites, hours_old)
+            JobStore.upsert(db, result["jobs"], input.country)
+            if result["partial"]:
+                JobSearchCache.record_refresh(succeeded=False)
+                print(f"Warning: background refresh of job search {cache_key[:12]} was partial: {result['sites']}")
+                return
+            JobSearchCache.put(db, cache_key, input, sites, hours_old, result["jobs"])
+            JobSearchCache.record_refresh(succeeded=True)
+        except Exception as e:
+            JobSearchCache.record_refresh(succeeded=False)
+            print(f"Warning: background refresh of job search {cache_key[:12]} failed: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def scrape_live_jobs(input: JobSearchInput, sites: list[str], hours_old: int) -> dict:
+        """
+        Scrapes the job boards for a search concurrently, bypassing the cache.
+
+        Each site is scraped in its own thread and waited for up to its timeout
+        (JOB_SCRAPE_SITE_TIMEOUTS, else JOB_SCRAPE_TIMEOUT_SECONDS), counted from
+        the start of the search. Sites that fail or time out are reported in
+        the result instead of failing the search.
+
+        Args:
+            input (JobSearchInput): The job search input
+            sites (list[str]): The job boards to search
+            hours_old (int): Maximum job posting age
+
+        Returns:
+            dict: The jobs found (in site order), the status of each site and
+                whether any site is missing from the results
+
+        Raises:
+            HTTPException: If every site failed or timed out
+        """
+        started = time.monotonic()
+        futures = JobService.submit_site_scrapes(input, sites, hours_old)
+
+        site_jobs: dict[str, list[dict]] = {}
+        statuses: dict[str, dict] = {}
+        # Wait for the sites with the shortest timeouts first; the others keep running meanwhile
+        for site in sorted(sites, key=JobService.site_timeout):
+            timeout = JobService.site_timeout(site)
+            try:
+                site_jobs[site] = futures[site].result(timeout=max(0.0, started + timeout - time.monotonic()))
+                statuses[site] = {"status": "ok", "jobs": len(site_jobs[site])}
+            except FuturesTimeoutError:
+                statuses[site] = JobService.timed_out(site, futures[site])
+            except Exception as e:
+                statuses[site] = {"status": "failed", "jobs": 0, "error": str(e)}
+            statuses[site]["seconds"] = round(time.monotonic() - started, 3)
+
+        return JobService.collect_site_results(sites, site_jobs, statuses)
+
+    @staticmethod
+    def submit_site_scrapes(input: JobSearchInput, sites: list[str], hours_old: int, results_wanted: int | None = None) -> dict[str, Future]:
+        """Starts scraping every site in the scrape pool."""
+        return {
+            site: _scrape_pool.submit(JobService.scrape_site, input, site, hours_old, results_wanted)
+            for site in sites
+        }
+
+    @staticmethod
+    def timed_out(site: str, future) -> dict:
+        """Gives up on a site's scrape and returns its status."""
+        # A running scrape cannot be interrupted; its thread finishes in the background
+        future.cancel()
+        site_scrape_metrics.record_timeout(site)
+        return {"status": "timeout", "jobs": 0, "error": f"No results within {JobService.site_timeout(site):g}s"}
+
+    @staticmethod
+    def collect_site_results(sites: list[str], site_jobs: dict[str, list[dict]], statuses: dict[str, dict]) -> dict:
+        """
+        Combines the per-site results of a scrape.
+
+        Args:
+            sites (list[str]): The job boards searched, in result order
+            site_jobs (dict[str, list[dict]]): The jobs of each site that finished
+            statuses (dict[str, dict]): The status of every site
+
+        Returns:
+            dict: The jobs found, the status of each site and whether the results are partial
+
+        Raises:
+            HTTPException: If every site failed or timed out
+        """
+        if not site_jobs:
+            status_code = 504 if all(status["status"] == "timeout" for status in statuses.values()) else 500
+            errors = "; ".join(f"{site}: {status['error']}" for site, status in statuses.items())
+            raise HTTPException(status_code=status_code, detail=f"Failed to get jobs: {errors}")
+
+        return {
+            "jobs": [job for site in sites for job in site_jobs.get(site, [])],
+            "sites": {site: statuses[site] for site in sites},
+            "partial": len(site_jobs) < len(sites),
+        }
+
+    @staticmethod
+    def site_timeout(site: str) -> float:
+        """Returns the seconds a search waits for a site."""
+        return settings.JOB_SCRAPE_SITE_TIMEOUTS.get(site, settings.JOB_SCRAPE_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def scrape_site(input: JobSearchInput, site: str, hours_old: int, results_wanted: int | None = None) -> list[dict]:
+        """
+        Scrapes one job board and records its latency and errors.
+
+        Args:
+            input (JobSearchInput): The job search input
+            site (str): The job board to search
+            hours_old (int): Maximum job posting age
+            results_wanted (int | None): Number of jobs to scrape; defaults to JOB_SEARCH_RESULTS_WANTED
+
+        Returns:
+            list[dict]: The jobs found
+
+        Raises:
+            Exception: If scraping fails
+        """
+        started = time.perf_counter()
         try:
             jobs = scrape_jobs(
-                    site_name=["indeed", "linkedin"],
+                    site_name=[site],
                     search_term=input.job_title,
                     location=input.location,
-                    results_wanted=7,
-                    hours_old=72,
+                    results_wanted=results_wanted or settings.JOB_SEARCH_RESULTS_WANTED,
+                    hours_old=hours_old,
                     country_indeed=input.country,
                     
-                    linkedin_fetch_description=True # gets more info such as description, direct job url (slower)
+                    linkedin_fetch_description=settings.JOB_SEARCH_FETCH_DESCRIPTIONS # gets more info such as description, direct job url (slower)
                     # proxies=["208.195.175.46:65095", "208.195.175.45:65095", "localhost"],
                 )
             
-            # Initialize an empty list to store job data
-            job_list = []
-            # Iterate through each job in the scraped jobs dataframe
-            for index, job in jobs.iterrows():
-                # Clean and prepare job data for JSON serialization
-                job_data = {
-                    "title": str(job["title"]) if not pd.isna(job["title"]) else "",
-                    "site": str(job["site"]) if not pd.isna(job["site"]) else "",
-                    "company": str(job["company"]) if not pd.isna(job["company"]) else "",
-                    "location": str(job["location"]) if not pd.isna(job["location"]) else "",
-                    "description": str(job["description"]) if not pd.isna(job["description"]) else "",
-                    "url": str(job["job_url"]) if not pd.isna(job["job_url"]) else "",
-                }
-                
-                # Append the sanitized job data
-                job_list.append(job_data)
-                
-            # Return the list of formatted job data
+            job_list = jobs_from_frame(jobs)
+            site_scrape_metrics.record_scrape(site, time.perf_counter() - started, jobs=len(job_list))
             return job_list
         
         except Exception as e:
-            import traceback
-            print(f"Error in get_jobs: {str(e)}")
-            print(traceback.format_exc())
-            raise HTTPException(status_code=500, detail=f"Failed to get jobs: {str(e)}")
\ No newline at end of file
+            site_scrape_metrics.record_scrape(site, time.perf_counter() - started, error=True)
+            print(f"Error scraping {site} jobs: {str(e)}")
+            raise
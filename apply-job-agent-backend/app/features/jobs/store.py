@@ -0,0 +1,175 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.features.jobs.cache import JobSearchCache
+from app.features.jobs.models import Job
+from app.features.jobs.schemas import JobSearchInput
+
+
+class JobStore:
+    """
+    Local, full-text searchable store of scraped jobs.
+
+    A search is answered from the store when at least JOB_STORE_MIN_RESULTS
+    jobs in the search's country and city, seen by a scrape within the
+    search's posting age, match the job title. Otherwise it is a miss and the
+    caller scrapes live.
+    """
+
+    _lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0, "upserted": 0}
+
+    @staticmethod
+    def job_key(job: dict) -> str:
+        """Returns the identity of a scraped job: its site and URL, or its listing text without a URL."""
+        identity = job.get("url") or "|".join(
+            JobSearchCache.normalize(job.get(field)) for field in ("title", "company", "location")
+        )
+        return hashlib.sha256(f"{job.get('site', '')}|{identity}".encode("utf-8")).hexdigest()
+
+    @classmethod
+    def upsert(cls, db: Session, jobs: list[dict], country: str | None) -> int:
+        """
+        Inserts scraped jobs, or refreshes the listing and last-seen time of known ones.
+
+        Args:
+            db (Session): Database session
+            jobs (list[dict]): Jobs as returned by a scrape
+            country (str | None): Country of the search that found the jobs
+
+        Returns:
+            int: Number of jobs upserted
+        """
+        if not jobs:
+            return 0
+        now = datetime.now(timezone.utc)
+        # One row per key; Postgres rejects an upsert that touches a row twice
+        rows = {
+            cls.job_key(job): {
+                "job_key": cls.job_key(job),
+                "site": job.get("site", ""),
+                "title": job.get("title", ""),
+                "company": job.get("company"),
+                "location": job.get("location"),
+                "country": JobSearchCache.normalize(country) or None,
+                "description": job.get("description"),
+                "url": job.get("url"),
+                "first_seen_at": now,
+                "last_seen_at": now,
+            }
+            for job in jobs
+        }
+        statement = insert(Job).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[Job.job_key],
+            set_={
+                **{
+                    column: statement.excluded[column]
+                    for column in ("title", "company", "location", "country", "url", "last_seen_at")
+                },
+                # Keep descriptions fetched on demand when a later scrape has none
+                "description": func.coalesce(func.nullif(statement.excluded.description, ""), Job.description),
+            },
+        )
+        try:
+            db.execute(statement)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to store scraped jobs: {str(e)}")
+            return 0
+        cls._record("upserted", len(rows))
+        return len(rows)
+
+    @classmethod
+    def search(cls, db: Session, search: JobSearchInput, hours_old: int, limit: int) -> list[dict] | None:
+        """
+        Finds stored jobs matching a search, best title matches first.
+
+        Args:
+            db (Session): Database session
+            search (JobSearchInput): The job search input
+            hours_old (int): Maximum time since a scrape last returned the job
+            limit (int): Maximum number of jobs to return
+
+        Returns:
+            list[dict] | None: The jobs, shaped like scraped jobs, or None on a miss
+        """
+        query = func.websearch_to_tsquery("english", search.job_title)
+        rank = func.ts_rank(Job.search_vector, query)
+        city = (search.city or search.location or "").split(",")[0].strip()
+        try:
+            filters = [
+                Job.search_vector.op("@@")(query),
+                Job.last_seen_at > datetime.now(timezone.utc) - timedelta(hours=hours_old),
+            ]
+            if search.country:
+                filters.append(Job.country == JobSearchCache.normalize(search.country))
+            if city:
+                filters.append(Job.location.ilike(f"%{city}%"))
+            rows = (
+                db.query(Job)
+                .filter(*filters)
+                .order_by(rank.desc(), Job.last_seen_at.desc())
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            # A broken store must never fail a search
+            db.rollback()
+            print(f"Warning: job store search failed: {str(e)}")
+            return None
+
+        if len(rows) < min(settings.JOB_STORE_MIN_RESULTS, limit):
+            cls._record("misses")
+            return None
+        cls._record("hits")
+        return [
+            {
+                "title": row.title,
+                "site": row.site,
+                "company": row.company or "",
+                "location": row.location or "",
+                "description": row.description or "",
+                "url": row.url or "",
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def prune(cls, db: Session) -> int:
+        """
+        Deletes jobs no scrape has returned for JOB_STORE_RETENTION_DAYS.
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_STORE_RETENTION_DAYS)
+        deleted = db.query(Job).filter(Job.last_seen_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns the in-process hit/miss counters.
+
+        Returns:
+            dict: Counters and hit rate
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    @classmethod
+    def _record(cls, counter: str, amount: int = 1):
+        with cls._lock:
+            cls._stats[counter] += amount
@@ -0,0 +1,179 @@
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.features.resume.models import ResumeParseCacheEntry
+from app.features.resume.schemas import ResumeParseResponse
+from app.shared.llm.prompt_registry import prompt_registry
+
+RESUME_PARSER_PROMPT = "resumes/resume_parser"
+RESUME_SECTION_PARSER_PROMPT = "resumes/resume_section_parser"
+
+
+class ResumeParseCache:
+    """
+    Content-addressed cache of parsed resumes stored in Postgres.
+
+    Entries are keyed by the sha256 of the uploaded file bytes ("file") or
+    of the extracted markdown ("markdown") and are only valid for the
+    prompt version they were produced with, so editing the parser prompt
+    or changing RESUME_PARSE_MODE invalidates every entry.
+    """
+
+    FILE = "file"
+    MARKDOWN = "markdown"
+
+    _lock = threading.Lock()
+    _stats = {"file_hits": 0, "markdown_hits": 0, "misses": 0}
+    _purged_version = None
+
+    @staticmethod
+    def hash_content(content: bytes | str) -> str:
+        """
+        Returns the sha256 hex digest of the given content.
+
+        Args:
+            content (bytes | str): File bytes or extracted markdown
+
+        Returns:
+            str: The hex digest
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def prompt_version() -> str:
+        """
+        Returns the content hash of the prompt used by the configured RESUME_PARSE_MODE.
+
+        Returns:
+            str: The prompt version
+        """
+        if settings.RESUME_PARSE_MODE == "sections":
+            version = prompt_registry.version(RESUME_SECTION_PARSER_PROMPT)
+            return hashlib.sha256(f"sections:{version}".encode("utf-8")).hexdigest()
+        return prompt_registry.version(RESUME_PARSER_PROMPT)
+
+    @classmethod
+    def get(cls, db: Session, key_type: str, content_hash: str) -> tuple[ResumeParseResponse, str | None] | None:
+        """
+        Looks up a cached parse result.
+
+        Args:
+            db (Session): Database session
+            key_type (str): Either ResumeParseCache.FILE or ResumeParseCache.MARKDOWN
+            content_hash (str): The content hash to look up
+
+        Returns:
+            tuple[ResumeParseResponse, str | None] | None: The cached result and the
+                markdown it was parsed from, or None on a miss
+        """
+        version = cls.prompt_version()
+        cls._purge_stale_entries(db, version)
+
+        try:
+            entry = db.query(ResumeParseCacheEntry).filter(
+                ResumeParseCacheEntry.key_type == key_type,
+                ResumeParseCacheEntry.content_hash == content_hash,
+                ResumeParseCacheEntry.prompt_version == version,
+            ).first()
+
+            if entry is None:
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_hit_at = datetime.now(timezone.utc)
+            db.commit()
+
+            cls._record(f"{key_type}_hits")
+            # Entries written before None fields were dropped still hold them, and
+            # work_experience and education do not accept None
+            resume_data = {field: value for field, value in entry.resume_data.items() if value is not None}
+            return ResumeParseResponse(**resume_data), entry.resume_markdown
+
+        except Exception as e:
+            # A broken cache must never fail an upload
+            db.rollback()
+            print(f"Warning: resume parse cache lookup failed: {str(e)}")
+            return None
+
+    @classmethod
+    def put(
+        cls,
+        db: Session,
+        key_type: str,
+        content_hash: str,
+        resume_data: ResumeParseResponse,
+        resume_markdown: str | None = None,
+    ):
+        """
+        Stores a parse result, replacing any existing entry for the key.
+
+        Args:
+            db (Session): Database session
+            key_type (str): Either ResumeParseCache.FILE or ResumeParseCache.MARKDOWN
+            content_hash (str): The content hash to store under
+            resume_data (ResumeParseResponse): The parsed resume
+            resume_markdown (str | None): The markdown the resume was parsed from
+        """
+        try:
+            db.merge(
+                ResumeParseCacheEntry(
+                    key_type=key_type,
+                    content_hash=content_hash,
+                    prompt_version=cls.prompt_version(),
+                    resume_data=resume_data.model_dump(exclude_none=True),
+                    resume_markdown=resume_markdown,
+                    hit_count=0,
+                )
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to store resume parse cache entry: {str(e)}")
+
+    @classmethod
+    def record_miss(cls):
+        """Counts a lookup that missed both the file and markdown keys."""
+        cls._record("misses")
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns the in-process hit/miss counters.
+
+        Returns:
+            dict: Counters, hit rate and the active prompt version
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+        lookups = stats["file_hits"] + stats["markdown_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        stats["prompt_version"] = cls.prompt_version()
+        return stats
+
+    @classmethod
+    def _record(cls, counter: str):
+        with cls._lock:
+            cls._stats[counter] += 1
+
+    @classmethod
+    def _purge_stale_entries(cls, db: Session, version: str):
+        """Deletes entries produced by an older prompt, once per prompt version."""
+        if cls._purged_version == version:
+            return
+        try:
+            deleted = db.query(ResumeParseCacheEntry).filter(
+                ResumeParseCacheEntry.prompt_version != version
+            ).delete(synchronize_session=False)
+            db.commit()
+            cls._purged_version = version
+            if deleted:
+                print(f"Invalidated {deleted} resume parse cache entries for prompt version {version[:12]}")
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: failed to purge stale resume parse cache entries: {str(e)}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, JSON, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, JSON, DateTime, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
@@ -13,8 +13,31 @@ class Resume(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     resume_data = Column(JSON, nullable=False)  # JSON column to store ResumeParseResponse
+    resume_markdown = Column(Text, nullable=True)  # Extracted markdown, used to diff re-uploads
+    job_search_input = Column(JSON, nullable=True)  # JobSearchInput derived after upload, reused by job searches
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationship with User model (assuming you have one)
-    user = relationship("User", back_populates="resumes")
\ No newline at end of file
+    user = relationship("User", back_populates="resumes")
+
+class ResumeParseCacheEntry(Base):
+    """
+    Model for caching parsed resumes by content hash.
+
+    Each parse is stored twice: once keyed by the hash of the uploaded file
+    bytes and once keyed by the hash of the extracted markdown, so re-uploads
+    of the same file skip extraction and the LLM, and re-exports of the same
+    content skip the LLM.
+    """
+
+    __tablename__ = "resume_parse_cache"
+
+    key_type = Column(String, primary_key=True)  # "file" or "markdown"
+    content_hash = Column(String(64), primary_key=True)  # sha256 hex digest
+    prompt_version = Column(String(64), nullable=False, index=True)
+    resume_data = Column(JSON, nullable=False)  # JSON column to store ResumeParseResponse
+    resume_markdown = Column(Text, nullable=True)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,14 +1,17 @@
-import os
-from fastapi import APIRouter, UploadFile, Depends, BackgroundTasks
+import json
+from fastapi import APIRouter, UploadFile, Depends, BackgroundTasks, Response, Query
+from app.core.config import settings
 from app.core.dependencies import AuthenticatedUser, get_db
 from sqlalchemy.orm import Session
-from app.features.resume.schemas import CustomResumeRequest, ResumeParseResponse
+from app.features.resume.schemas import BulkUploadResponse, CustomResumeRequest, ResumeParseResponse
+from app.features.resume.cache import ResumeParseCache
 from app.features.resume.services import CustomResumeBuilder, ResumeService
-from fastapi.responses import JSONResponse
+from app.features.jobs.services import JobService
+from app.shared.latex.compiler import latex_compile_metrics
+from app.shared.utils.timing import StageTimer
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi import HTTPException
-import pymupdf4llm
 from fastapi.responses import FileResponse
-import shutil
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
@@ -19,51 +22,122 @@ router = APIRouter(prefix="/resume", tags=["Resume"])
 async def upload_resume(
     file: UploadFile,
     current_user: AuthenticatedUser,
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ) -> ResumeParseResponse:
     """
     Upload a resume file and parse its content.
+
+    The file is read in bounded chunks and parsed from memory; the PDF
+    extraction runs in a worker thread so it does not block the event loop.
+    Previously parsed content is served from the parse cache.
+    Per-stage timings are returned in the `Server-Timing` header.
+    The job search input is derived after the response is sent.
     Args:
         file (UploadFile): The uploaded resume file.
         current_user (AuthenticatedUser): The authenticated user.
+        response (Response): The outgoing response, used for timing headers.
+        background_tasks (BackgroundTasks): Runs the post-upload stages.
         db (Session): Database session.
     Returns:
         ResumeParseResponse: The parsed resume data.
     """
-    # Save the file to a temporary location
-    temp_path = f"/tmp/{file.filename}"
-    os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-    try:
-        # Write the file to disk
-        with open(temp_path, "wb") as f:
-            f.write(await file.read())
-        
-        # Parse the resume using pymupdf4llm
-        resume_md_text = pymupdf4llm.to_markdown(temp_path)
-        
-        # Remove the file after parsing
-        os.remove(temp_path)
-        
-        # Organize the parsed data using the llm
-        result = ResumeService.organize_resume_data(resume_md_text)
-        
-        # Store the parsed data in the database
-        ResumeService.store_resume_data_in_db(
+    timer = StageTimer()
+
+    # Read the upload into memory, enforcing the size limit
+    with timer.stage("receive"):
+        pdf_bytes = await ResumeService.read_upload(file)
+
+    # Parse the resume, reusing cached results for previously seen content
+    # and only re-parsing the edited sections of a re-upload
+    with timer.stage("db"):
+        previous_resume = ResumeService.get_latest_resume(current_user, db)
+    result, resume_md_text = await ResumeService.parse_resume_pdf(
+        pdf_bytes, db, timer, previous_resume=previous_resume
+    )
+
+    # Store the parsed data in the database
+    with timer.stage("db"):
+        resume = ResumeService.store_resume_data_in_db(
             resume_data=result,
             current_user=current_user,
-            db=db
+            db=db,
+            resume_markdown=resume_md_text,
         )
-        
-        # Return a successful response with the parsed data
-        return result
-    
-    # Ensure the file is deleted even if an error occurs
-    finally:
-        # Delete the file after we're done with it
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-            print(f"Deleted temporary file: {temp_path}")
+
+    # Derive the job search input once, so job searches skip the LLM
+    background_tasks.add_task(JobService.aprecompute_job_search_input, resume.id)
+
+    response.headers["Server-Timing"] = timer.server_timing_header()
+    print(f"Resume upload timings for user {current_user.id}: {timer.summary()}")
+
+    # Return a successful response with the parsed data
+    return result
             
+@router.post(
+    "/bulk-upload",
+    response_model=BulkUploadResponse,
+    summary="Bulk import resumes",
+    description="Upload PDFs and/or zip archives of PDFs; every resume is parsed and stored."
+)
+async def bulk_upload_resumes(
+    files: list[UploadFile],
+    current_user: AuthenticatedUser,
+    concurrency: int = Query(settings.BULK_UPLOAD_CONCURRENCY, ge=1, le=32),
+    db: Session = Depends(get_db)
+) -> BulkUploadResponse:
+    """
+    Import a batch of resumes in one request.
+
+    Files are parsed with bounded concurrency and stored with batched inserts.
+    The response reports the outcome of every file and the throughput.
+    Args:
+        files (list[UploadFile]): PDFs and/or zip archives of PDFs.
+        current_user (AuthenticatedUser): The authenticated user the resumes are stored for.
+        concurrency (int): Number of files to parse at once.
+        db (Session): Database session.
+    Returns:
+        BulkUploadResponse: Per-file status report and resumes/minute.
+    """
+    return await ResumeService.bulk_parse_and_store(
+        files, current_user, db, concurrency=concurrency
+    )
+
+@router.get(
+    "/parse-cache/stats",
+    summary="Get resume parse cache statistics",
+    description="Hit/miss counters for the content-addressed resume parse cache in this process."
+)
+async def get_parse_cache_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the resume parse cache counters.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: File hits, markdown hits, misses, hit rate and prompt version.
+    """
+    return ResumeParseCache.get_stats()
+
+@router.get(
+    "/latex-compile/stats",
+    summary="Get LaTeX compile metrics",
+    description="Compiles, failures, timeouts, cancellations, running compiles, and compile and queue time in this process."
+)
+async def get_latex_compile_stats(
+    current_user: AuthenticatedUser,
+):
+    """
+    Get the LaTeX compile metrics.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+    Returns:
+        dict: Compile counters and compile and queue time histograms.
+    """
+    return latex_compile_metrics.get_stats()
+
 @router.get(
     "/get-resume-data",
     response_model=ResumeParseResponse,
@@ -102,37 +176,28 @@ async def get_resume_data(
 async def build_custom_resume(
     # customResumeRequest: CustomResumeRequest,
     job_description: str,
-    background_tasks: BackgroundTasks,
     resume_data: ResumeParseResponse = Depends(get_resume_data)
 ):
     """
     Generate LaTeX code from the parsed resume data and job description.
     Args:
         customResumeRequest (CustomResumeRequest): The request containing job description.
-        background_tasks (BackgroundTasks): Background tasks for file cleanup.
         resume_data (ResumeParseResponse): The parsed resume data.
     Returns:
         str: The generated LaTeX code.
     """
     try:
-        # Generate LaTeX code using the ResumeParser
-        response = CustomResumeBuilder.get_latex_code_from_pydantic_output(
+        # Generate, compile and clean up the tailored resume
+        pdf_content = await CustomResumeBuilder.abuild_custom_resume_pdf(
             job_description, resume_data
         )
-        latex_filepath = response["filepath"]
-        pdf_filepath = CustomResumeBuilder.compile_latex_to_pdf(latex_filepath)
-        
-        # Schedule cleanup for after the response is sent
-        background_tasks.add_task(CustomResumeBuilder.cleanup_latex_files, latex_filepath)
-        
-        # Return the PDF file as a blob
-        with open(pdf_filepath, "rb") as pdf_file:
-            pdf_content = pdf_file.read()
-            
+
         return JSONResponse(
             content={"pdf": pdf_content.hex()},
             media_type="application/json"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         # Log the error
         print(f"Error generating LaTeX code: {str(e)}")
@@ -141,3 +206,39 @@ async def build_custom_resume(
             status_code=500, detail=f"Failed to generate LaTeX code: {str(e)}"
         )
 
+
+@router.get(
+    "/build-custom-resume/stream",
+    summary="Build a custom resume with streamed progress",
+    description="Server-sent events: resume_loaded, generating, token (LaTeX as it is written), compiling, "
+                "then done with the hex-encoded PDF, or error."
+)
+async def build_custom_resume_stream(
+    job_description: str,
+    resume_data: ResumeParseResponse = Depends(get_resume_data)
+):
+    """
+    Stream the custom resume pipeline as server-sent events.
+    Args:
+        job_description (str): The job description text.
+        resume_data (ResumeParseResponse): The parsed resume data.
+    Returns:
+        StreamingResponse: A text/event-stream of pipeline events.
+    """
+    async def events():
+        yield _sse("resume_loaded", {})
+        async for event, data in CustomResumeBuilder.astream_custom_resume_pdf(
+            job_description, resume_data
+        ):
+            yield _sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _sse(event: str, data: dict) -> str:
+    """Formats one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, create_model
+from typing import Optional, List, Dict, Any, Literal
 
 class EmploymentDates(BaseModel):
     start: Optional[str] = None
@@ -73,9 +73,43 @@ class ResumeParseResponse(BaseModel):
     skills: Optional[Skills] = None
     projects: Optional[List[Project]] = None
     
+def section_schema(section: str, fields: List[str]) -> type[BaseModel]:
+    """
+    Builds the schema for one resume section from the ResumeParseResponse fields it owns.
+
+    Args:
+        section (str): The canonical section name, e.g. "work_experience"
+        fields (List[str]): The ResumeParseResponse fields extracted from the section
+
+    Returns:
+        type[BaseModel]: A model with just those fields, all optional
+    """
+    name = "".join(part.capitalize() for part in section.split("_")) + "Section"
+    return create_model(
+        name,
+        **{field: (Optional[ResumeParseResponse.model_fields[field].annotation], None) for field in fields},
+    )
+
 class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
     details: Optional[str] = Field(None, description="Additional error details")
     
 class CustomResumeRequest(BaseModel):
-    job_description: str = Field(..., description="Job description for the resume")
\ No newline at end of file
+    job_description: str = Field(..., description="Job description for the resume")
+
+class BulkUploadFileResult(BaseModel):
+    filename: str = Field(..., description="The uploaded file or zip entry name")
+    status: Literal["parsed", "failed", "skipped"] = Field(..., description="Processing outcome for the file")
+    cached: bool = Field(False, description="Whether the parse was served from the parse cache")
+    elapsed_ms: Optional[float] = Field(None, description="Time spent parsing the file")
+    error: Optional[str] = Field(None, description="Why the file failed or was skipped")
+
+class BulkUploadResponse(BaseModel):
+    total: int = Field(..., description="Number of files found in the upload")
+    parsed: int = Field(..., description="Number of resumes parsed and stored")
+    failed: int = Field(..., description="Number of files that failed")
+    skipped: int = Field(..., description="Number of files that were not PDFs or were too large")
+    concurrency: int = Field(..., description="Number of files processed concurrently")
+    elapsed_seconds: float = Field(..., description="Wall-clock time for the whole import")
+    resumes_per_minute: float = Field(..., description="Import throughput")
+    results: List[BulkUploadFileResult] = Field(..., description="Per-file status report")
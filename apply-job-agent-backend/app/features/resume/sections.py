@@ -0,0 +1,198 @@
+"""
+Splits extracted resume markdown into canonical sections.
+
+The sections map onto fields of `ResumeParseResponse`, which lets the
+parser re-run the LLM only on the parts of a resume that changed.
+"""
+import re
+
+# Text before the first recognised heading (name, contact details)
+HEADER_SECTION = "header"
+
+# Canonical section -> heading keywords, checked in order
+SECTION_ALIASES = {
+    "summary": ["summary", "profile", "objective", "about me"],
+    "work_experience": ["experience", "employment", "work history", "career history"],
+    "education": ["education", "academic background", "qualifications"],
+    "projects": ["projects", "personal projects"],
+    "certifications": ["certifications?", "licen[cs]es"],
+    "publications": ["publications?", "research papers", "papers"],
+    "skills": [
+        "skills?", "technologies", "technical", "competencies", "tools", "languages",
+        "interests", "hobbies", "awards", "honou?rs", "achievements", "volunteer(?:ing)?",
+    ],
+}
+
+# Canonical section -> ResumeParseResponse fields extracted from it
+SECTION_FIELDS = {
+    HEADER_SECTION: ["personal_information"],
+    "summary": ["professional_summary"],
+    "work_experience": ["work_experience", "work_experience_summary"],
+    "education": ["education", "education_summary"],
+    "projects": ["projects"],
+    "certifications": ["certifications"],
+    "publications": ["publications"],
+    "skills": ["skills"],
+}
+
+# Words that may qualify a bold or all-caps heading ("Work Experience", "Technical Skills")
+HEADING_QUALIFIERS = {
+    "work", "professional", "relevant", "technical", "key", "core", "other", "additional",
+    "academic", "programming", "personal", "selected", "research", "industry", "my",
+}
+
+_MARKDOWN_HEADING = re.compile(r"^\s*#{1,6}\s+(?P<title>.+?)\s*#*\s*$")
+_BOLD_HEADING = re.compile(r"^\s*\*\*(?P<title>[^*]{2,60})\*\*\s*:?\s*$")
+_CAPS_HEADING = re.compile(r"^\s*(?P<title>[A-Z][A-Z &/,\-]{2,40})\s*:?\s*$")
+
+
+def _heading(line: str) -> tuple[str, str | None] | None:
+    """
+    Returns (title, canonical section) if the line is a section heading.
+
+    Markdown headings always start a section. Bold or all-caps lines only
+    do when the whole line names a known section, since resumes use them
+    for job titles and company names too ("Technical Lead", "TOOLS ENGINEER").
+    """
+    match = _MARKDOWN_HEADING.match(line)
+    if match:
+        title = match.group("title").strip("*_ :").strip()
+        return title, canonical_section(title)
+    for pattern in (_BOLD_HEADING, _CAPS_HEADING):
+        match = pattern.match(line)
+        if match:
+            title = match.group("title").strip("*_ :").strip()
+            section = canonical_section(title, exact=True)
+            return (title, section) if section else None
+    return None
+
+
+def canonical_section(title: str, exact: bool = False) -> str | None:
+    """
+    Maps a heading to its canonical section name.
+
+    Args:
+        title (str): The heading text
+        exact (bool): Whether the whole heading must name sections, e.g. "Skills & Interests",
+            instead of only containing a section keyword
+
+    Returns:
+        str | None: The canonical section, or None if the heading is not recognised
+    """
+    lowered = title.lower()
+    # Long lines are content (e.g. a job title in bold), not section headings
+    if len(lowered.split()) > 5:
+        return None
+    if exact:
+        sections = [_exact_section(part) for part in re.split(r"\s*(?:&|/|,|\band\b)\s*", lowered) if part]
+        return sections[0] if sections and all(sections) else None
+    for section, keywords in SECTION_ALIASES.items():
+        if any(re.search(rf"\b{keyword}\b", lowered) for keyword in keywords):
+            return section
+    return None
+
+
+def _exact_section(part: str) -> str | None:
+    """Returns the section a heading part names, allowing qualifiers such as "Work" in "Work Experience"."""
+    section = _keyword_section(part)
+    if section:
+        return section
+    for word in part.split():
+        word_section = _keyword_section(word)
+        if word_section:
+            section = section or word_section
+        elif word not in HEADING_QUALIFIERS:
+            return None
+    return section
+
+
+def _keyword_section(text: str) -> str | None:
+    """Returns the section one of whose keywords is the whole text."""
+    for section, keywords in SECTION_ALIASES.items():
+        if any(re.fullmatch(keyword, text) for keyword in keywords):
+            return section
+    return None
+
+
+def split_sections(markdown: str) -> dict[str, str]:
+    """
+    Splits resume markdown into sections keyed by canonical name.
+
+    Sections with the same canonical name (e.g. "Work Experience" and
+    "Research Experience") are concatenated. The first unrecognised heading
+    before any section is kept in the header as the candidate's name; other
+    unrecognised headings are kept as their own "other:<title>" sections so
+    changes in them can still be detected.
+
+    Args:
+        markdown (str): The extracted resume markdown
+
+    Returns:
+        dict[str, str]: Section name -> section text including its heading, in document order
+    """
+    sections: dict[str, list[str]] = {HEADER_SECTION: []}
+    current = HEADER_SECTION
+    name_seen = False
+
+    for line in markdown.splitlines():
+        heading = _heading(line)
+        if heading:
+            title, section = heading
+            # The first unknown heading of the header block is usually the candidate's name
+            if section is None and current == HEADER_SECTION and not name_seen:
+                name_seen = True
+                sections[current].append(line)
+                continue
+            current = section or f"other:{title.lower()}"
+            sections.setdefault(current, [])
+        sections[current].append(line)
+
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "".join(lines).strip()}
+
+
+def looks_misclassified(section: str, text: str) -> bool:
+    """
+    Returns whether a section's text has bold or all-caps lines that loosely name another section.
+
+    Such lines (e.g. "**Technical Lead**" in work experience) were not taken
+    as headings, so the split may not match how the resume is organised.
+
+    Args:
+        section (str): The canonical section name
+        text (str): The section text, from `split_sections`
+
+    Returns:
+        bool: Whether the section should not be parsed on its own
+    """
+    for line in text.splitlines():
+        for pattern in (_BOLD_HEADING, _CAPS_HEADING):
+            match = pattern.match(line)
+            if match:
+                named = canonical_section(match.group("title").strip("*_ :").strip())
+                if named and named != section:
+                    return True
+    return False
+
+
+def normalize_section(text: str) -> str:
+    """Normalises whitespace and markdown emphasis so formatting-only changes compare equal."""
+    text = re.sub(r"[*_`]+", "", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def changed_sections(previous: dict[str, str], current: dict[str, str]) -> set[str]:
+    """
+    Returns the sections that were added, removed or edited.
+
+    Args:
+        previous (dict[str, str]): Sections of the previous upload
+        current (dict[str, str]): Sections of the new upload
+
+    Returns:
+        set[str]: Names of the sections that differ
+    """
+    names = set(previous) | set(current)
+    return {
+        name for name in names
+        if normalize_section(previous.get(name, "")) != normalize_section(current.get(name, ""))
+    }
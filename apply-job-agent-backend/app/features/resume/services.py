@@ -1,18 +1,418 @@
-from fastapi import HTTPException
+import asyncio
+import time
+import zipfile
+import zlib
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
+from app.core.config import settings
 from app.core.dependencies import AuthenticatedUser, get_db
+from app.features.resume.cache import ResumeParseCache
 from app.features.resume.models import Resume
-from app.features.resume.schemas import ResumeParseResponse
-from app.shared.llm.llm_model import gpt_model
+from app.features.resume.sections import (
+    HEADER_SECTION,
+    SECTION_FIELDS,
+    changed_sections,
+    looks_misclassified,
+    split_sections,
+)
+from app.features.resume.schemas import BulkUploadFileResult, BulkUploadResponse, ResumeParseResponse, section_schema
+from app.shared.llm.client_manager import LLMCapacityError, capacity_http_exception
+from app.shared.llm.llm_model import get_chain_model
+from app.shared.llm.prompt_registry import prompt_registry
+from app.shared.latex.compiler import LatexCompileError, LatexCompileTimeout, acompile_latex, compile_latex
+from app.shared.pdf.extraction import pdf_to_markdown
+from app.shared.utils.timing import StageTimer
 from langchain.output_parsers import PydanticOutputParser
+from sqlalchemy import insert
 import re
-import os
-from datetime import datetime
-import subprocess
+import pymupdf
+from pydantic import ValidationError
+
+# Errors raised by damaged zip archives and entries: bad headers or CRCs, truncated
+# or corrupt deflate streams, and encrypted or unsupported-compression entries
+CORRUPT_ZIP_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError, RuntimeError, ValueError)
+
+RESUME_PARSER_CHAIN = "resume_parser"
+RESUME_GENERATE_CHAIN = "resume_generate"
+RESUME_SECTION_PARSER_CHAIN = "resume_section_parser"
+
+# What each section chain is told it is looking at
+SECTION_DESCRIPTIONS = {
+    HEADER_SECTION: "the header, with the candidate's name, contact details, location and profile links",
+    "summary": "the professional summary",
+    "work_experience": "the work experience, plus a brief summary of it (total years of experience and key industries)",
+    "education": "the education, plus a brief summary of it (key institutions attended)",
+    "projects": "the projects",
+    "certifications": "the certifications",
+    "publications": "the publications and research",
+    "skills": "the skills, languages, interests, awards, volunteering and any other details",
+}
+
+
+def build_resume_parser_chain(prompts, model=None):
+    """Builds the chain that turns resume markdown into a ResumeParseResponse, routed by default."""
+    # Output parse for the LLM
+    parser = PydanticOutputParser(pydantic_object=ResumeParseResponse)
+
+    # Create a prompt template
+    prompt = PromptTemplate(
+        template=prompts.text("resumes/resume_parser"),
+        input_variables=["resume_text"],
+        partial_variables={
+            "format_instructions": parser.get_format_instructions()
+        },
+    )
+
+    return prompt | (model or get_chain_model(RESUME_PARSER_CHAIN)) | parser
+
+
+def section_chain_name(section: str) -> str:
+    """Returns the name of the chain that parses one resume section."""
+    return f"{RESUME_SECTION_PARSER_CHAIN}:{section}"
+
+
+def build_resume_section_chain(section: str):
+    """Returns a builder for the chain that parses one resume section into its fields."""
+    def build(prompts, model=None):
+        parser = PydanticOutputParser(pydantic_object=section_schema(section, SECTION_FIELDS[section]))
+        prompt = PromptTemplate(
+            template=prompts.text("resumes/resume_section_parser"),
+            input_variables=["section_text"],
+            partial_variables={
+                "section_description": SECTION_DESCRIPTIONS[section],
+                "format_instructions": parser.get_format_instructions(),
+            },
+        )
+        # All section chains share one model, so one cache namespace and routing policy
+        return prompt | (model or get_chain_model(RESUME_SECTION_PARSER_CHAIN)) | parser
+
+    return build
+
+
+def build_resume_generate_chain(prompts, model=None):
+    """Builds the chain that writes a tailored LaTeX resume, routed by default."""
+    # Create a prompt template with the LaTeX template and one-shot example bound
+    prompt = PromptTemplate(
+        template=prompts.text("resumes/resume_generate"),
+        input_variables=["resume_data", "job_description"],
+        partial_variables={
+            "latex_resume_template": prompts.text("resumes/latex_resume_template"),
+            "example_generated_output": prompts.text(
+                "resumes/example_output", default="Example output not available"
+            ),
+        },
+    )
+
+    return prompt | (model or get_chain_model(RESUME_GENERATE_CHAIN))
+
+
+prompt_registry.register_chain(
+    RESUME_PARSER_CHAIN, build_resume_parser_chain, prompts=["resumes/resume_parser"]
+)
+for _section in SECTION_FIELDS:
+    prompt_registry.register_chain(
+        section_chain_name(_section),
+        build_resume_section_chain(_section),
+        prompts=["resumes/resume_section_parser"],
+    )
+prompt_registry.register_chain(
+    RESUME_GENERATE_CHAIN,
+    build_resume_generate_chain,
+    prompts=["resumes/resume_generate", "resumes/latex_resume_template", "resumes/example_output"],
+)
 
 
 class ResumeService:
+    @staticmethod
+    async def read_upload(
+        file: UploadFile,
+        max_bytes: int = settings.RESUME_UPLOAD_MAX_BYTES,
+        chunk_size: int = settings.RESUME_UPLOAD_CHUNK_SIZE,
+    ) -> bytes:
+        """
+        Reads an uploaded file into memory in bounded chunks.
+
+        The declared size is checked first so oversized uploads are rejected
+        without reading them, and the running total is checked per chunk in
+        case the declared size is missing or wrong.
+
+        Args:
+            file (UploadFile): The uploaded file
+            max_bytes (int): Maximum accepted upload size in bytes
+            chunk_size (int): Number of bytes to read per chunk
+
+        Returns:
+            bytes: The file content
+
+        Raises:
+            HTTPException: If the upload is empty or exceeds the size limit
+        """
+        if file.size is not None and file.size > max_bytes:
+            raise HTTPException(
+                status_code=413, detail=f"File too large, maximum size is {max_bytes} bytes"
+            )
+
+        buffer = bytearray()
+        while chunk := await file.read(chunk_size):
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                raise HTTPException(
+                    status_code=413, detail=f"File too large, maximum size is {max_bytes} bytes"
+                )
+
+        if not buffer:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+        return bytes(buffer)
+
+    @staticmethod
+    def extract_resume_markdown(pdf_bytes: bytes) -> str:
+        """
+        Converts an in-memory PDF to markdown without touching the disk.
+
+        Long documents are converted page-parallel in the extraction process
+        pool. This blocks, so async callers should run it in a thread pool.
+
+        Args:
+            pdf_bytes (bytes): The PDF file content
+
+        Returns:
+            str: The resume content as markdown
+
+        Raises:
+            HTTPException: If the file is not a readable PDF
+        """
+        try:
+            return pdf_to_markdown(pdf_bytes)
+        except (pymupdf.FileDataError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid PDF file: {str(e)}")
+
+    @staticmethod
+    async def parse_resume_pdf(
+        pdf_bytes: bytes,
+        db,
+        timer: StageTimer | None = None,
+        previous_resume: Resume | None = None,
+    ) -> tuple[ResumeParseResponse, str | None]:
+        """
+        Turns uploaded PDF bytes into structured resume data, using the parse cache.
+
+        The file hash is checked first (skips extraction and the LLM), then the
+        hash of the extracted markdown (skips the LLM). On a miss, an edited
+        re-upload of `previous_resume` is re-parsed incrementally; anything
+        else goes through a full parse. Extraction runs in a worker thread and
+        the LLM is called asynchronously.
+
+        Args:
+            pdf_bytes (bytes): The uploaded PDF content
+            db (Session): Database session used for the parse cache
+            timer (StageTimer | None): Optional timer for per-stage timings
+            previous_resume (Resume | None): The user's previous resume, if any
+
+        Returns:
+            tuple[ResumeParseResponse, str | None]: The parsed resume data and the
+                markdown it was parsed from (None for legacy cache entries)
+        """
+        timer = timer or StageTimer()
+
+        with timer.stage("cache"):
+            file_hash = ResumeParseCache.hash_content(pdf_bytes)
+            cached = ResumeParseCache.get(db, ResumeParseCache.FILE, file_hash)
+        if cached is not None:
+            return cached
+
+        # Parse the resume using pymupdf4llm off the event loop
+        with timer.stage("extract"):
+            resume_md_text = await run_in_threadpool(
+                ResumeService.extract_resume_markdown, pdf_bytes
+            )
+
+        with timer.stage("cache"):
+            markdown_hash = ResumeParseCache.hash_content(resume_md_text)
+            cached = ResumeParseCache.get(db, ResumeParseCache.MARKDOWN, markdown_hash)
+
+        if cached is not None:
+            result = cached[0]
+        else:
+            ResumeParseCache.record_miss()
+
+            # Organize the parsed data using the llm, only re-parsing edited sections if possible
+            with timer.stage("llm"):
+                result = None
+                if previous_resume is not None and settings.RESUME_INCREMENTAL_PARSE:
+                    result = await ResumeService.reparse_changed_sections(
+                        previous_resume.resume_markdown,
+                        previous_resume.resume_data,
+                        resume_md_text,
+                    )
+                if result is None:
+                    result = await ResumeService.aparse_resume_markdown(resume_md_text)
+
+            with timer.stage("cache"):
+                ResumeParseCache.put(
+                    db, ResumeParseCache.MARKDOWN, markdown_hash, result, resume_md_text
+                )
+
+        with timer.stage("cache"):
+            ResumeParseCache.put(db, ResumeParseCache.FILE, file_hash, result, resume_md_text)
+
+        return result, resume_md_text
+
+    @staticmethod
+    async def reparse_changed_sections(previous_markdown, previous_data, resume_text) -> ResumeParseResponse | None:
+        """
+        Re-parses only the sections of a resume that changed since the previous upload.
+
+        Both versions are split into canonical sections and compared. The
+        changed sections are sent to the LLM on their own and the fields they
+        own replace those of the previous result; removed sections clear their
+        fields. Returns None when an incremental parse is not safe, in which
+        case the caller should do a full parse.
+
+        Args:
+            previous_markdown (str | None): Markdown of the previous upload
+            previous_data (dict | None): The previous ResumeParseResponse as stored
+            resume_text (str): Markdown of the new upload
+
+        Returns:
+            ResumeParseResponse | None: The merged result, or None to fall back to a full parse
+        """
+        if not previous_markdown or not previous_data:
+            return None
+
+        previous_sections = split_sections(previous_markdown)
+        current_sections = split_sections(resume_text)
+        changed = changed_sections(previous_sections, current_sections)
+
+        # work_experience and education do not accept None, so None fields are left out
+        try:
+            merged = ResumeParseResponse(
+                **{field: value for field, value in previous_data.items() if value is not None}
+            ).model_dump(exclude_none=True)
+        except ValidationError:
+            return None
+        if not changed:
+            return ResumeParseResponse(**merged)
+
+        # Sections we cannot map onto fields (other:*) make a partial parse unsafe
+        if any(section not in SECTION_FIELDS for section in changed):
+            return None
+        # So do changed sections the split may have drawn wrongly
+        if any(
+            looks_misclassified(section, sections.get(section, ""))
+            for section in changed
+            for sections in (previous_sections, current_sections)
+        ):
+            return None
+
+        changed_text = "\n\n".join(
+            current_sections[section] for section in current_sections if section in changed
+        )
+        if len(changed_text) > settings.RESUME_INCREMENTAL_MAX_CHANGED_RATIO * len(resume_text):
+            return None
+
+        print(f"Incremental resume parse of sections: {', '.join(sorted(changed))}")
+        if not changed_text:
+            partial = {}
+        elif settings.RESUME_PARSE_MODE == "sections":
+            partial = await ResumeService.aparse_sections(
+                {section: current_sections[section] for section in changed if section in current_sections}
+            )
+            if partial is None:
+                return None
+        else:
+            partial = (await ResumeService.aorganize_resume_data(changed_text)).dict()
+
+        for section in changed:
+            for field in SECTION_FIELDS[section]:
+                # Removed sections clear their fields
+                value = partial.get(field) if section in current_sections else None
+                if value is None:
+                    merged.pop(field, None)
+                else:
+                    merged[field] = value
+
+        try:
+            return ResumeParseResponse(**merged)
+        except ValidationError as e:
+            print(f"Warning: incremental resume parse produced an invalid result, falling back to a full parse: {str(e)}")
+            return None
+
+    @staticmethod
+    async def aparse_resume_markdown(resume_text) -> ResumeParseResponse:
+        """
+        Parses resume markdown with the configured RESUME_PARSE_MODE.
+
+        In "sections" mode the resume is split into sections that are parsed
+        concurrently, so the parse takes about as long as the slowest section.
+        Resumes whose sections cannot all be recognised (any "other:*"
+        section), or whose section results fail to parse or validate, get a
+        single full parse instead, since the section schemas have nowhere to
+        put content under unknown headings.
+
+        Args:
+            resume_text (str): The markdown extracted from the resume
+
+        Returns:
+            ResumeParseResponse: Structured resume information
+
+        Raises:
+            HTTPException: If there's an error organizing the resume data
+        """
+        if settings.RESUME_PARSE_MODE == "sections":
+            sections = split_sections(resume_text)
+            if len(sections) > 1 and all(name in SECTION_FIELDS for name in sections):
+                merged = await ResumeService.aparse_sections(sections)
+                if merged is not None:
+                    try:
+                        return ResumeParseResponse(**merged)
+                    except ValidationError as e:
+                        print(f"Warning: merged section parse failed validation, doing a full parse: {str(e)}")
+        return await ResumeService.aorganize_resume_data(resume_text)
+
+    @staticmethod
+    async def aparse_sections(sections: dict[str, str]) -> dict | None:
+        """
+        Parses resume sections concurrently, one LLM call per section.
+
+        Callers only pass recognised sections; anything else is parsed
+        together with the skills section as a last resort.
+
+        Args:
+            sections (dict[str, str]): Section name -> section text, from `split_sections`
+
+        Returns:
+            dict | None: The ResumeParseResponse fields of the given sections, or None if
+                a section could not be parsed
+
+        Raises:
+            HTTPException: 503 if the LLM is out of capacity
+        """
+        inputs: dict[str, str] = {}
+        for name, text in sections.items():
+            section = name if name in SECTION_FIELDS else "skills"
+            inputs[section] = f"{inputs[section]}\n\n{text}" if section in inputs else text
+
+        results = await asyncio.gather(
+            *(
+                prompt_registry.chain(section_chain_name(section)).ainvoke({"section_text": text})
+                for section, text in inputs.items()
+            ),
+            return_exceptions=True,
+        )
+
+        merged = {}
+        for section, result in zip(inputs, results):
+            if isinstance(result, LLMCapacityError):
+                raise capacity_http_exception(result)
+            if isinstance(result, Exception):
+                print(f"Warning: failed to parse resume section {section}: {str(result)}")
+                return None
+            merged.update(result.dict())
+        return merged
+
     @staticmethod
     def organize_resume_data(resume_text):
         """
@@ -28,29 +428,15 @@ class ResumeService:
             HTTPException: If there's an error organizing the resume data
         """
         try:
-            with open("app/shared/prompts/resumes/resume_parser.md", "r") as file:
-                prompt = file.read()
-
-            # Output parse for the LLM
-            parser = PydanticOutputParser(pydantic_object=ResumeParseResponse)
-
-            # Create a prompt template
-            prompt = PromptTemplate(
-                template=prompt,
-                input_variables=["resume_text"],
-                partial_variables={
-                    "format_instructions": parser.get_format_instructions()
-                },
-            )
-
-            # Create the chain
-            chain = prompt | gpt_model | parser
+            # Get the precompiled chain
+            chain = prompt_registry.chain(RESUME_PARSER_CHAIN)
 
             # Get response
             response = chain.invoke({"resume_text": resume_text})
-            
 
             return response
+        except LLMCapacityError as e:
+            raise capacity_http_exception(e)
         except Exception as e:
             # Log the error
             print(f"Error organizing resume data: {str(e)}")
@@ -58,18 +444,44 @@ class ResumeService:
             raise HTTPException(
                 status_code=500, detail=f"Failed to organize resume data: {str(e)}"
             )
+
+    @staticmethod
+    async def aorganize_resume_data(resume_text):
+        """
+        Async version of `organize_resume_data` that does not block the event loop.
+
+        Args:
+            resume_text (str): The raw text extracted from the resume
+
+        Returns:
+            ResumeParseResponse: Structured resume information
+
+        Raises:
+            HTTPException: If there's an error organizing the resume data
+        """
+        try:
+            chain = prompt_registry.chain(RESUME_PARSER_CHAIN)
+            return await chain.ainvoke({"resume_text": resume_text})
+        except LLMCapacityError as e:
+            raise capacity_http_exception(e)
+        except Exception as e:
+            print(f"Error organizing resume data: {str(e)}")
+            raise HTTPException(
+                status_code=500, detail=f"Failed to organize resume data: {str(e)}"
+            )
            
     @staticmethod
-    def store_resume_data_in_db(resume_data, current_user: AuthenticatedUser, db):
+    def store_resume_data_in_db(resume_data, current_user: AuthenticatedUser, db, resume_markdown=None):
         try:
             new_resume = Resume(
                 user_id=current_user.id,
                 resume_data=resume_data.dict(),  # Convert Pydantic model to dict
+                resume_markdown=resume_markdown,  # Kept to diff the next re-upload
             )
             db.add(new_resume)
             db.commit()
             db.refresh(new_resume)
-            return True
+            return new_resume
         
         except Exception as e:
             # Log the error
@@ -79,6 +491,221 @@ class ResumeService:
                 status_code=500, detail=f"Failed to store resume data in DB: {str(e)}"
             )
             
+    @staticmethod
+    def store_resume_data_in_db_bulk(resume_data_list, current_user: AuthenticatedUser, db):
+        """
+        Stores many parsed resumes with a single batched INSERT.
+
+        Args:
+            resume_data_list (list[tuple[ResumeParseResponse, str | None]]): Parsed
+                resumes and the markdown they were parsed from
+            current_user (AuthenticatedUser): The user the resumes are stored for
+            db (Session): Database session
+
+        Raises:
+            HTTPException: If the insert fails
+        """
+        if not resume_data_list:
+            return
+        try:
+            db.execute(
+                insert(Resume),
+                [
+                    {
+                        "user_id": current_user.id,
+                        "resume_data": resume_data.dict(),
+                        "resume_markdown": resume_markdown,
+                    }
+                    for resume_data, resume_markdown in resume_data_list
+                ],
+            )
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"Error bulk storing resume data in DB: {str(e)}")
+            raise HTTPException(
+                status_code=500, detail=f"Failed to store resume data in DB: {str(e)}"
+            )
+
+    @staticmethod
+    def iter_bulk_upload_entries(files: list[UploadFile]):
+        """
+        Lazily yields the PDFs contained in a bulk upload.
+
+        Each upload may be a PDF or a zip archive of PDFs. Entries are read one
+        at a time, so only the entries currently being processed are held in
+        memory.
+
+        Args:
+            files (list[UploadFile]): The uploaded files
+
+        Yields:
+            tuple[str, bytes | None, str | None]: The file name, its content, and
+                a reason when the entry is skipped (content is then None)
+        """
+        max_bytes = settings.RESUME_UPLOAD_MAX_BYTES
+        seen = 0
+
+        for file in files:
+            file.file.seek(0)
+            if zipfile.is_zipfile(file.file):
+                file.file.seek(0)
+                try:
+                    archive = zipfile.ZipFile(file.file)
+                except CORRUPT_ZIP_ERRORS as e:
+                    yield file.filename, None, f"Corrupt zip archive: {str(e)}"
+                    continue
+                with archive:
+                    for info in archive.infolist():
+                        name = f"{file.filename}/{info.filename}"
+                        if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                            continue
+                        seen += 1
+                        if seen > settings.BULK_UPLOAD_MAX_FILES:
+                            yield name, None, f"Upload exceeds {settings.BULK_UPLOAD_MAX_FILES} files"
+                        elif not info.filename.lower().endswith(".pdf"):
+                            yield name, None, "Not a PDF file"
+                        elif info.file_size > max_bytes:
+                            yield name, None, f"File too large, maximum size is {max_bytes} bytes"
+                        else:
+                            try:
+                                with archive.open(info) as entry:
+                                    # Bounded read in case the declared size is wrong
+                                    content = entry.read(max_bytes + 1)
+                            except CORRUPT_ZIP_ERRORS as e:
+                                # One bad entry must not abort the rest of the import
+                                yield name, None, f"Corrupt zip entry: {str(e)}"
+                                continue
+                            if len(content) > max_bytes:
+                                yield name, None, f"File too large, maximum size is {max_bytes} bytes"
+                            else:
+                                yield name, content, None
+            else:
+                seen += 1
+                file.file.seek(0)
+                content = file.file.read(max_bytes + 1)
+                if seen > settings.BULK_UPLOAD_MAX_FILES:
+                    yield file.filename, None, f"Upload exceeds {settings.BULK_UPLOAD_MAX_FILES} files"
+                elif len(content) > max_bytes:
+                    yield file.filename, None, f"File too large, maximum size is {max_bytes} bytes"
+                else:
+                    yield file.filename, content, None
+
+    @staticmethod
+    async def bulk_parse_and_store(
+        files: list[UploadFile],
+        current_user: AuthenticatedUser,
+        db,
+        concurrency: int = settings.BULK_UPLOAD_CONCURRENCY,
+        batch_size: int = settings.BULK_UPLOAD_BATCH_SIZE,
+    ) -> BulkUploadResponse:
+        """
+        Parses every PDF in a bulk upload with bounded concurrency and stores them in batches.
+
+        At most `concurrency` files are read and parsed at once. Parsed resumes
+        are inserted `batch_size` rows at a time as they complete; if a batch
+        insert fails, the files in that batch are reported as failed.
+
+        Args:
+            files (list[UploadFile]): PDFs and/or zip archives of PDFs
+            current_user (AuthenticatedUser): The user the resumes are stored for
+            db (Session): Database session
+            concurrency (int): Maximum number of files processed at once
+            batch_size (int): Number of rows per INSERT
+
+        Returns:
+            BulkUploadResponse: Per-file status report and throughput
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency)
+        results: list[BulkUploadFileResult] = []
+        pending: list[tuple[BulkUploadFileResult, tuple[ResumeParseResponse, str | None]]] = []
+        tasks = []
+
+        def flush():
+            batch = pending[:]
+            pending.clear()
+            try:
+                ResumeService.store_resume_data_in_db_bulk(
+                    [parsed for _, parsed in batch], current_user, db
+                )
+            except HTTPException as e:
+                for result, _ in batch:
+                    result.status = "failed"
+                    result.error = e.detail
+
+        async def process(filename: str, pdf_bytes: bytes):
+            file_started = time.perf_counter()
+            result = BulkUploadFileResult(filename=filename, status="parsed")
+            results.append(result)
+            try:
+                timer = StageTimer()
+                parsed = await ResumeService.parse_resume_pdf(pdf_bytes, db, timer)
+                result.cached = "llm" not in timer.timings
+                pending.append((result, parsed))
+                if len(pending) >= batch_size:
+                    flush()
+            except HTTPException as e:
+                result.status = "failed"
+                result.error = str(e.detail)
+            except Exception as e:
+                result.status = "failed"
+                result.error = str(e)
+            finally:
+                result.elapsed_ms = round((time.perf_counter() - file_started) * 1000, 2)
+                semaphore.release()
+
+        entries = ResumeService.iter_bulk_upload_entries(files)
+        while True:
+            # Opening archives and decompressing entries blocks, so each entry is read in a worker thread
+            entry = await run_in_threadpool(next, entries, None)
+            if entry is None:
+                break
+            filename, pdf_bytes, skip_reason = entry
+            if skip_reason:
+                results.append(BulkUploadFileResult(filename=filename, status="skipped", error=skip_reason))
+                continue
+            # Wait for a free slot before reading the next entry to bound memory
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(process(filename, pdf_bytes)))
+
+        await asyncio.gather(*tasks)
+        flush()
+
+        elapsed = time.perf_counter() - started
+        parsed = sum(1 for result in results if result.status == "parsed")
+        report = BulkUploadResponse(
+            total=len(results),
+            parsed=parsed,
+            failed=sum(1 for result in results if result.status == "failed"),
+            skipped=sum(1 for result in results if result.status == "skipped"),
+            concurrency=concurrency,
+            elapsed_seconds=round(elapsed, 3),
+            resumes_per_minute=round(parsed / elapsed * 60, 2) if elapsed else 0.0,
+            results=results,
+        )
+        print(
+            f"Bulk import for user {current_user.id}: {report.parsed}/{report.total} parsed "
+            f"in {report.elapsed_seconds}s ({report.resumes_per_minute} resumes/min, concurrency={concurrency})"
+        )
+        return report
+
+    @staticmethod
+    def get_latest_resume(current_user: AuthenticatedUser, db) -> Resume | None:
+        """
+        Returns the user's most recent resume row, or None if they have none.
+
+        Args:
+            current_user (AuthenticatedUser): The user
+            db (Session): Database session
+
+        Returns:
+            Resume | None: The latest resume
+        """
+        return db.query(Resume).filter(Resume.user_id == current_user.id
+        ).order_by(Resume.created_at.desc()).first()
+
     @staticmethod
     def get_resume_data_from_db(current_user: AuthenticatedUser, db):
         try:
@@ -107,81 +734,26 @@ class CustomResumeBuilder:
             job_description (str): The job description text
             resume_data (ResumeParseResponse): The structured resume data
         Returns:
-            dict: Contains LaTeX code for the resume and the file path where it was saved
+            dict: Contains LaTeX code for the resume
         Raises:
             HTTPException: If there's an error generating the LaTeX code
         """
         try:
-            # Load the LaTeX template
-            with open("app/shared/prompts/resumes/latex_resume_template.md", "r") as file:
-                latex_template = file.read()
-
-            # Load example files for one-shot prompting
-            example_files = {
-                "output": "app/shared/prompts/resumes/example_output.md"
-            }
-            
-            examples = {}
-            for key, path in example_files.items():
-                try:
-                    with open(path, "r") as file:
-                        examples[key] = file.read()
-                except FileNotFoundError as e:
-                    print(f"Warning: Example file not found: {path}")
-                    examples[key] = f"Example {key} not available"
-
-            # Load the prompt template
-            with open("app/shared/prompts/resumes/resume_generate.md", "r") as file:
-                prompt_text = file.read()
-
-            # Create a prompt template
-            prompt = PromptTemplate(
-                template=prompt_text,
-                input_variables=[
-                    "latex_resume_template",
-                    "example_generated_output",
-                    "resume_data",
-                    "job_description",
-                ],
-            )
-
-            # Create the chain
-            chain = prompt | gpt_model
+            # Get the precompiled chain (template and example are already bound)
+            chain = prompt_registry.chain(RESUME_GENERATE_CHAIN)
 
             # Get response
             response = chain.invoke(
                 {
-                    "latex_resume_template": latex_template,
-                    "example_generated_output": examples["output"],
                     "resume_data": resume_data,
                     "job_description": job_description,
                 }
             )
 
-            # Parse the response to get the LaTeX code
-            latex_code = response.content
-
-            # Clean up any markdown code block formatting from the response
-            latex_code = re.sub(r'^```(?:latex)?\s*', '', latex_code, flags=re.MULTILINE)
-            latex_code = re.sub(r'\s*```$', '', latex_code, flags=re.MULTILINE)
-            latex_code = latex_code.strip()
-            
-            # Save the LaTeX code to a file
-            output_dir = "app/output/latex"
-            os.makedirs(output_dir, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"resume_{timestamp}.tex"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, "w") as file:
-                file.write(latex_code)
-                
-            return {
-                "latex_code": latex_code,
-                "filepath": filepath
-            }
+            return {"latex_code": CustomResumeBuilder.clean_latex_code(response.content)}
 
+        except LLMCapacityError as e:
+            raise capacity_http_exception(e)
         except Exception as e:
             # Log the error
             print(f"Error generating LaTeX code: {str(e)}")
@@ -191,73 +763,165 @@ class CustomResumeBuilder:
             )
 
     @staticmethod
-    def compile_latex_to_pdf(latex_filepath):
+    async def aget_latex_code_from_pydantic_output(job_description, resume_data):
         """
-        Compiles the LaTeX file to a PDF.
+        Async version of `get_latex_code_from_pydantic_output` that does not block the event loop.
         Args:
-            latex_filepath (str): Path to the LaTeX file
+            job_description (str): The job description text
+            resume_data (ResumeParseResponse): The structured resume data
         Returns:
-            str: Path to the generated PDF file
+            dict: Contains LaTeX code for the resume
         Raises:
-            HTTPException: If there's an error compiling the LaTeX file
+            HTTPException: If there's an error generating the LaTeX code
         """
         try:
-            # Extract the filename without path
-            latex_filename = os.path.basename(latex_filepath)
-            
-            # Change to the directory containing the LaTeX file for compilation
-            latex_dir = os.path.dirname(latex_filepath)
-            # Save the current working directory
-            original_dir = os.getcwd()
-            
-            try:
-                # Change to the directory containing the LaTeX file
-                os.chdir(latex_dir)
-                
-                # Run pdflatex
-                os.system(f"pdflatex {latex_filename}")
-                
-                # Generate PDF filepath
-                pdf_filename = latex_filename.replace('.tex', '.pdf')
-                pdf_filepath = os.path.join(latex_dir, pdf_filename)
-                
-                return pdf_filepath
-                
-            finally:
-                # Return to original directory regardless of success or failure
-                os.chdir(original_dir)
-                
+            chain = prompt_registry.chain(RESUME_GENERATE_CHAIN)
+            response = await chain.ainvoke(
+                {
+                    "resume_data": resume_data,
+                    "job_description": job_description,
+                }
+            )
+            return {"latex_code": CustomResumeBuilder.clean_latex_code(response.content)}
+
+        except LLMCapacityError as e:
+            raise capacity_http_exception(e)
         except Exception as e:
-            print(f"Error compiling LaTeX to PDF: {str(e)}")
+            print(f"Error generating LaTeX code: {str(e)}")
             raise HTTPException(
-                status_code=500, detail=f"Failed to compile LaTeX to PDF: {str(e)}"
+                status_code=500, detail=f"Failed to generate LaTeX code: {str(e)}"
             )
 
     @staticmethod
-    def cleanup_latex_files(latex_filepath):
+    def clean_latex_code(latex_code):
         """
-        Cleans up LaTeX files and compilation artifacts after PDF has been generated.
+        Strips markdown fences from generated LaTeX.
         Args:
-            latex_filepath (str): Path to the LaTeX file
+            latex_code (str): The raw LLM output
+        Returns:
+            str: The LaTeX code
+        """
+        # Clean up any markdown code block formatting from the response
+        latex_code = re.sub(r'^```(?:latex)?\s*', '', latex_code, flags=re.MULTILINE)
+        latex_code = re.sub(r'\s*```$', '', latex_code, flags=re.MULTILINE)
+        return latex_code.strip()
+
+    @staticmethod
+    def compile_latex_to_pdf(latex_code):
+        """
+        Compiles LaTeX code to a PDF in an isolated temporary directory.
+        Args:
+            latex_code (str): The LaTeX code
+        Returns:
+            bytes: The compiled PDF
+        Raises:
+            HTTPException: If compilation times out (504) or fails (500)
         """
         try:
-            # Extract directory and base filename (without extension)
-            latex_dir = os.path.dirname(latex_filepath)
-            base_filename = os.path.splitext(os.path.basename(latex_filepath))[0]
-            
-            # List of file extensions to delete
-            extensions = ['.tex', '.aux', '.log', '.out', '.pdf']
-            
-            # Delete each file with these extensions
-            for ext in extensions:
-                file_path = os.path.join(latex_dir, f"{base_filename}{ext}")
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    print(f"Deleted: {file_path}")
-            
-            print(f"Successfully cleaned up LaTeX files for: {base_filename}")
-        
+            return compile_latex(latex_code)
+        except Exception as e:
+            raise CustomResumeBuilder.compile_http_exception(e)
+
+    @staticmethod
+    async def acompile_latex_to_pdf(latex_code):
+        """
+        Async version of `compile_latex_to_pdf`; pdflatex runs as an async subprocess.
+        Args:
+            latex_code (str): The LaTeX code
+        Returns:
+            bytes: The compiled PDF
+        Raises:
+            HTTPException: If compilation times out (504) or fails (500)
+        """
+        try:
+            return await acompile_latex(latex_code)
+        except Exception as e:
+            raise CustomResumeBuilder.compile_http_exception(e)
+
+    @staticmethod
+    def compile_http_exception(error: Exception) -> HTTPException:
+        """Logs a failed compile and converts it to an HTTP error."""
+        log = f"\n{error.log}" if isinstance(error, LatexCompileError) and error.log else ""
+        print(f"Error compiling LaTeX to PDF: {str(error)}{log}")
+        return HTTPException(
+            status_code=504 if isinstance(error, LatexCompileTimeout) else 500,
+            detail=f"Failed to compile LaTeX to PDF: {str(error)}"
+        )
+
+    @staticmethod
+    def build_custom_resume_pdf(job_description, resume_data) -> bytes:
+        """
+        Runs the full custom resume pipeline: LaTeX generation and compilation.
+        Args:
+            job_description (str): The job description text
+            resume_data (ResumeParseResponse): The structured resume data
+        Returns:
+            bytes: The compiled PDF
+        Raises:
+            HTTPException: If generation or compilation fails
+        """
+        response = CustomResumeBuilder.get_latex_code_from_pydantic_output(
+            job_description, resume_data
+        )
+        return CustomResumeBuilder.compile_latex_to_pdf(response["latex_code"])
+
+    @staticmethod
+    async def abuild_custom_resume_pdf(job_description, resume_data) -> bytes:
+        """
+        Async version of `build_custom_resume_pdf`; the LLM call and compilation are awaited.
+        Args:
+            job_description (str): The job description text
+            resume_data (ResumeParseResponse): The structured resume data
+        Returns:
+            bytes: The compiled PDF
+        Raises:
+            HTTPException: If generation or compilation fails
+        """
+        response = await CustomResumeBuilder.aget_latex_code_from_pydantic_output(
+            job_description, resume_data
+        )
+        return await CustomResumeBuilder.acompile_latex_to_pdf(response["latex_code"])
+
+    @staticmethod
+    async def astream_custom_resume_pdf(job_description, resume_data):
+        """
+        Streaming version of `abuild_custom_resume_pdf`.
+
+        Yields (event, data) pairs as the pipeline progresses: "generating",
+        one "token" per chunk of LaTeX as the LLM writes it, "compiling", and
+        finally "done" with the hex-encoded PDF. Failures are reported as an
+        "error" event, since the response has already started.
+        Args:
+            job_description (str): The job description text
+            resume_data (ResumeParseResponse): The structured resume data
+        Yields:
+            tuple[str, dict]: The event name and its payload
+        """
+        try:
+            yield "generating", {}
+            chain = prompt_registry.chain(RESUME_GENERATE_CHAIN)
+            chunks = []
+            async for chunk in chain.astream(
+                {
+                    "resume_data": resume_data,
+                    "job_description": job_description,
+                }
+            ):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield "token", {"text": chunk.content}
+
+            latex_code = CustomResumeBuilder.clean_latex_code("".join(chunks))
+
+            yield "compiling", {}
+            pdf_content = await CustomResumeBuilder.acompile_latex_to_pdf(latex_code)
+
+            yield "done", {"pdf": pdf_content.hex()}
+
+        except LLMCapacityError as e:
+            yield "error", {"status_code": 503, "detail": str(e)}
+        except HTTPException as e:
+            yield "error", {"status_code": e.status_code, "detail": e.detail}
         except Exception as e:
-            # Just log the error but don't raise an exception
-            # We don't want cleanup errors to affect the user experience
-            print(f"Warning: Failed to clean up LaTeX files: {str(e)}")
+            print(f"Error streaming custom resume: {str(e)}")
+            yield "error", {"status_code": 500, "detail": f"Failed to generate LaTeX code: {str(e)}"}
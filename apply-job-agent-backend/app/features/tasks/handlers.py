@@ -0,0 +1,100 @@
+"""
+Pipeline handlers executed by the task worker.
+
+Each handler receives the claimed task, its owner and a database session
+and returns a JSON-serialisable result that is stored on the task row.
+"""
+import asyncio
+from sqlalchemy.orm import Session
+from app.features.auth.models import User
+from app.features.jobs.services import JobService
+from app.features.resume.services import CustomResumeBuilder, ResumeService
+from app.features.tasks.models import Task
+from app.shared.utils.timing import StageTimer
+
+# The worker process's event loop; memoized LLM clients keep connection pools bound to it
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_async(coro):
+    """
+    Runs a coroutine on the worker process's event loop.
+
+    The loop is created on first use and kept for the life of the process:
+    `asyncio.run` would close it after every task, breaking the pooled
+    async clients of the memoized chat models ("Event loop is closed").
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+def close_event_loop():
+    """Closes the worker process's event loop when the worker stops."""
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+        _loop.close()
+    _loop = None
+
+
+def handle_resume_upload(task: Task, user: User, db: Session):
+    """Parses an uploaded PDF and stores it as the user's latest resume."""
+    timer = StageTimer()
+    previous_resume = ResumeService.get_latest_resume(user, db)
+    result, resume_md_text = run_async(
+        ResumeService.parse_resume_pdf(task.input_blob, db, timer, previous_resume=previous_resume)
+    )
+
+    with timer.stage("db"):
+        resume = ResumeService.store_resume_data_in_db(
+            resume_data=result,
+            current_user=user,
+            db=db,
+            resume_markdown=resume_md_text,
+        )
+
+    # Derive the job search input now so job searches skip the LLM
+    with timer.stage("job_search_input"):
+        try:
+            JobService.get_saved_job_search_input(resume, db)
+        except Exception as e:
+            print(f"Warning: failed to precompute the job search input of resume {resume.id}: {getattr(e, 'detail', str(e))}")
+
+    print(f"Resume upload task {task.id} timings: {timer.summary()}")
+    return {"resume": result.dict(), "timings_ms": timer.as_milliseconds()}
+
+
+def handle_get_jobs(task: Task, user: User, db: Session):
+    """Derives the job search input from the user's resume, then finds and ranks jobs."""
+    resume = ResumeService.get_latest_resume(user, db)
+    if resume is None:
+        raise ValueError("Resume not found")
+    job_search_input = JobService.get_saved_job_search_input(resume, db)
+    return JobService.get_jobs(
+        job_search_input, db, resume.resume_data, task.payload.get("include_descriptions", True)
+    )
+
+
+def handle_build_custom_resume(task: Task, user: User, db: Session):
+    """Builds a resume PDF tailored to the job description in the payload."""
+    resume_data = ResumeService.get_resume_data_from_db(user, db)
+    pdf_content = CustomResumeBuilder.build_custom_resume_pdf(
+        task.payload["job_description"], resume_data
+    )
+    return {"pdf": pdf_content.hex()}
+
+
+HANDLERS = {
+    "resume_upload": handle_resume_upload,
+    "get_jobs": handle_get_jobs,
+    "build_custom_resume": handle_build_custom_resume,
+}
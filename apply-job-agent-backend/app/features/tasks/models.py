@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, ForeignKey, JSON, DateTime, String, Text, LargeBinary
+from sqlalchemy.sql import func
+from app.core.base import Base
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class Task(Base):
+    """
+    Model for queued pipeline tasks.
+
+    The table doubles as the work queue: API workers insert rows and the
+    task worker processes (`python -m app.worker`) claim and execute them.
+    """
+
+    __tablename__ = "tasks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    payload = Column(JSON, nullable=True)  # JSON arguments for the handler
+    input_blob = Column(LargeBinary, nullable=True)  # Binary input such as an uploaded PDF
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease; expired running tasks are re-queued
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,117 @@
+import asyncio
+from uuid import UUID
+from fastapi import APIRouter, UploadFile, Depends, status
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.dependencies import AuthenticatedUser, get_db
+from app.features.resume.services import ResumeService
+from app.features.tasks.schemas import TaskResponse
+from app.features.tasks.services import TaskService
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+@router.post(
+    "/resume/upload",
+    response_model=TaskResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a resume upload",
+    description="Queue parsing of an uploaded resume and return the task to poll."
+)
+async def enqueue_resume_upload(
+    file: UploadFile,
+    current_user: AuthenticatedUser,
+    db: Session = Depends(get_db)
+) -> TaskResponse:
+    """
+    Queue a resume upload for the task workers.
+    Args:
+        file (UploadFile): The uploaded resume file.
+        current_user (AuthenticatedUser): The authenticated user.
+        db (Session): Database session.
+    Returns:
+        TaskResponse: The queued task.
+    """
+    pdf_bytes = await ResumeService.read_upload(file)
+    task = TaskService.enqueue(db, current_user, "resume_upload", input_blob=pdf_bytes)
+    return TaskService.to_response(task)
+
+@router.post(
+    "/jobs/get-jobs",
+    response_model=TaskResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a job search",
+    description="Queue a job search based on the latest resume and return the task to poll."
+)
+async def enqueue_get_jobs(
+    current_user: AuthenticatedUser,
+    db: Session = Depends(get_db)
+) -> TaskResponse:
+    """
+    Queue a job search for the task workers.
+    Args:
+        current_user (AuthenticatedUser): The authenticated user.
+        db (Session): Database session.
+    Returns:
+        TaskResponse: The queued task.
+    """
+    task = TaskService.enqueue(db, current_user, "get_jobs")
+    return TaskService.to_response(task)
+
+@router.post(
+    "/resume/build-custom-resume",
+    response_model=TaskResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a custom resume build",
+    description="Queue generation of a tailored resume PDF and return the task to poll."
+)
+async def enqueue_build_custom_resume(
+    job_description: str,
+    current_user: AuthenticatedUser,
+    db: Session = Depends(get_db)
+) -> TaskResponse:
+    """
+    Queue a custom resume build for the task workers.
+    Args:
+        job_description (str): The job description to tailor the resume to.
+        current_user (AuthenticatedUser): The authenticated user.
+        db (Session): Database session.
+    Returns:
+        TaskResponse: The queued task.
+    """
+    task = TaskService.enqueue(
+        db, current_user, "build_custom_resume", payload={"job_description": job_description}
+    )
+    return TaskService.to_response(task)
+
+@router.get(
+    "/{task_id}",
+    response_model=TaskResponse,
+    summary="Get task status",
+    description="Poll a task. Pass `wait` to long-poll until the task finishes or the wait expires."
+)
+async def get_task(
+    task_id: UUID,
+    current_user: AuthenticatedUser,
+    wait: float = 0,
+    db: Session = Depends(get_db)
+) -> TaskResponse:
+    """
+    Get the status and result of a task.
+    Args:
+        task_id (UUID): The task to look up.
+        current_user (AuthenticatedUser): The authenticated user.
+        wait (float): Seconds to wait for the task to finish (capped by TASK_MAX_WAIT_SECONDS).
+        db (Session): Database session.
+    Returns:
+        TaskResponse: The task status, with the result once it has succeeded.
+    """
+    deadline = asyncio.get_running_loop().time() + min(max(wait, 0), settings.TASK_MAX_WAIT_SECONDS)
+
+    while True:
+        task = TaskService.get_task_for_user(db, current_user, task_id)
+        if task.status in ("succeeded", "failed") or asyncio.get_running_loop().time() >= deadline:
+            return TaskService.to_response(task)
+
+        # End the transaction so the next poll sees the worker's update
+        db.rollback()
+        await asyncio.sleep(settings.TASK_POLL_INTERVAL_SECONDS)
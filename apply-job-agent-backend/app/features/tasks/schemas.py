@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional
+from uuid import UUID
+
+TaskStatus = Literal["queued", "running", "succeeded", "failed"]
+
+class TaskResponse(BaseModel):
+    id: UUID = Field(description="The unique identifier of the task.")
+    kind: str = Field(description="The pipeline the task runs.")
+    status: TaskStatus = Field(description="The current task status.")
+    attempts: int = Field(description="How many times a worker has started the task.")
+    result: Optional[Any] = Field(None, description="The pipeline result once the task has succeeded.")
+    error: Optional[str] = Field(None, description="The error message if the task failed.")
+    created_at: Optional[str] = Field(None, description="When the task was enqueued.")
+    started_at: Optional[str] = Field(None, description="When a worker started the task.")
+    finished_at: Optional[str] = Field(None, description="When the task finished.")
@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlalchemy import or_, and_, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.features.auth.models import User
+from app.features.tasks.models import Task
+from app.features.tasks.schemas import TaskResponse
+
+
+class TaskService:
+    @staticmethod
+    def enqueue(db: Session, user: User, kind: str, payload: dict | None = None, input_blob: bytes | None = None) -> Task:
+        """
+        Adds a task to the queue.
+
+        Args:
+            db (Session): Database session
+            user (User): The user the task runs on behalf of
+            kind (str): The handler name (see app.features.tasks.handlers)
+            payload (dict | None): JSON arguments for the handler
+            input_blob (bytes | None): Binary input for the handler
+
+        Returns:
+            Task: The queued task
+
+        Raises:
+            HTTPException: If the task cannot be stored
+        """
+        try:
+            task = Task(
+                user_id=user.id,
+                kind=kind,
+                status="queued",
+                payload=payload or {},
+                input_blob=input_blob,
+                attempts=0,
+            )
+            db.add(task)
+            db.commit()
+            db.refresh(task)
+            return task
+
+        except Exception as e:
+            db.rollback()
+            print(f"Error enqueuing {kind} task: {str(e)}")
+            raise HTTPException(
+                status_code=500, detail=f"Failed to enqueue task: {str(e)}"
+            )
+
+    @staticmethod
+    def get_task_for_user(db: Session, user: User, task_id) -> Task:
+        """
+        Loads a task owned by the given user.
+
+        Raises:
+            HTTPException: If the task does not exist or belongs to another user
+        """
+        task = db.query(Task).filter(Task.id == task_id, Task.user_id == user.id).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return task
+
+    @staticmethod
+    def claim_next(db: Session, worker_id: str) -> Task | None:
+        """
+        Claims the oldest runnable task for a worker.
+
+        Runnable tasks are queued tasks and running tasks whose lease has
+        expired (their worker died) that still have attempts left. The
+        candidate row is locked with SKIP LOCKED where supported, and the
+        claim itself is a conditional update, so two workers can never run
+        the same task even on databases without row locks (SQLite).
+
+        Args:
+            db (Session): Database session
+            worker_id (str): Identifier of the claiming worker
+
+        Returns:
+            Task | None: The claimed task, or None if the queue is empty
+        """
+        now = datetime.now(timezone.utc)
+        runnable = and_(
+            Task.attempts < settings.TASK_MAX_ATTEMPTS,
+            or_(
+                Task.status == "queued",
+                and_(Task.status == "running", Task.locked_until < now),
+            ),
+        )
+
+        candidate = (
+            db.query(Task.id, Task.attempts)
+            .filter(runnable)
+            .order_by(Task.created_at)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if candidate is None:
+            db.rollback()
+            return None
+
+        claimed = db.execute(
+            update(Task)
+            .where(Task.id == candidate.id, Task.attempts == candidate.attempts, runnable)
+            .values(
+                status="running",
+                attempts=candidate.attempts + 1,
+                worker_id=worker_id,
+                started_at=now,
+                locked_until=now + timedelta(seconds=settings.TASK_LEASE_SECONDS),
+            )
+        )
+        db.commit()
+
+        if claimed.rowcount != 1:
+            # Another worker won the race
+            return None
+
+        return db.query(Task).filter(Task.id == candidate.id).first()
+
+    @staticmethod
+    def renew_lease(db: Session, task_id, worker_id: str) -> bool:
+        """
+        Extends the lease of a running task by TASK_LEASE_SECONDS.
+
+        Args:
+            db (Session): Database session
+            task_id: ID of the running task
+            worker_id (str): Identifier of the worker running it
+
+        Returns:
+            bool: False if the worker no longer owns the task
+        """
+        return TaskService._update_owned(
+            db, task_id, worker_id,
+            locked_until=datetime.now(timezone.utc) + timedelta(seconds=settings.TASK_LEASE_SECONDS),
+        )
+
+    @staticmethod
+    def complete(db: Session, task: Task, worker_id: str, result) -> bool:
+        """
+        Marks a task as succeeded and stores its JSON result.
+
+        Returns:
+            bool: False if the worker lost the task (its lease expired and it was
+                re-claimed), in which case the result is discarded
+        """
+        return TaskService._update_owned(
+            db, task.id, worker_id,
+            status="succeeded",
+            result=result,
+            error=None,
+            input_blob=None,  # Inputs are no longer needed once processed
+            finished_at=datetime.now(timezone.utc),
+            locked_until=None,
+        )
+
+    @staticmethod
+    def fail(db: Session, task: Task, worker_id: str, error: str) -> bool:
+        """
+        Marks a task as failed with the given error message.
+
+        Returns:
+            bool: False if the worker lost the task, in which case the error is discarded
+        """
+        return TaskService._update_owned(
+            db, task.id, worker_id,
+            status="failed",
+            error=error,
+            input_blob=None,
+            finished_at=datetime.now(timezone.utc),
+            locked_until=None,
+        )
+
+    @staticmethod
+    def _update_owned(db: Session, task_id, worker_id: str, **values) -> bool:
+        """Updates a task only while the given worker still runs it."""
+        updated = db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.worker_id == worker_id, Task.status == "running")
+            .values(**values)
+        )
+        db.commit()
+        return updated.rowcount == 1
+
+    @staticmethod
+    def fail_exhausted(db: Session) -> int:
+        """
+        Fails running tasks whose lease expired after their last attempt.
+
+        Returns:
+            int: Number of tasks marked as failed
+        """
+        now = datetime.now(timezone.utc)
+        failed = db.execute(
+            update(Task)
+            .where(
+                Task.status == "running",
+                Task.locked_until < now,
+                Task.attempts >= settings.TASK_MAX_ATTEMPTS,
+            )
+            .values(
+                status="failed",
+                error="Task abandoned by its worker too many times",
+                input_blob=None,
+                finished_at=now,
+                locked_until=None,
+            )
+        )
+        db.commit()
+        return failed.rowcount
+
+    @staticmethod
+    def to_response(task: Task) -> TaskResponse:
+        """Converts a task row to its API representation."""
+        return TaskResponse(
+            id=task.id,
+            kind=task.kind,
+            status=task.status,
+            attempts=task.attempts or 0,
+            result=task.result,
+            error=task.error,
+            created_at=str(task.created_at) if task.created_at else None,
+            started_at=str(task.started_at) if task.started_at else None,
+            finished_at=str(task.finished_at) if task.finished_at else None,
+        )
@@ -6,6 +6,7 @@ configures OpenAPI documentation, and includes all API routers.
 """
 # Standard library imports
 import os
+from contextlib import asynccontextmanager
 
 # Third-party imports
 from fastapi import FastAPI
@@ -18,6 +19,10 @@ from app.core.config import settings
 from app.features.resume.routers import router as resume_router
 from app.features.jobs.routers import router as jobs_router
 from app.features.auth.routers import router as auth_router
+from app.features.tasks.routers import router as tasks_router
+from app.features.admin.routers import router as admin_router
+from app.shared.llm.prompt_registry import prompt_registry
+from app.shared.pdf.extraction import shutdown_extraction_pool
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -57,6 +62,16 @@ def custom_openapi(app: FastAPI):
     app.openapi_schema = openapi_schema
     return app.openapi_schema
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Start and stop process-wide resources with the application."""
+    # Prompts and chains are compiled at import; watch for edits in development
+    if settings.ENVIRONMENT == "local":
+        prompt_registry.start_watcher(settings.PROMPT_RELOAD_INTERVAL_SECONDS)
+    yield
+    prompt_registry.stop_watcher()
+    shutdown_extraction_pool()
+
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application."""
     application = FastAPI(
@@ -64,6 +79,7 @@ def create_application() -> FastAPI:
         description="API for Apply Job Agent - Automated job application assistant.",
         version="0.1",
         swagger_ui_parameters={"persistAuthorization": True},
+        lifespan=lifespan,
     )
     
     # Configure CORS
@@ -73,6 +89,7 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"],
     )
     
     # Configure custom OpenAPI documentation with security
@@ -88,6 +105,8 @@ def create_application() -> FastAPI:
     application.include_router(resume_router)
     application.include_router(jobs_router)
     application.include_router(auth_router)
+    application.include_router(tasks_router)
+    application.include_router(admin_router)
     
     return application
 
@@ -0,0 +1,225 @@
+"""
+Isolated, bounded LaTeX to PDF compilation.
+
+Every compile gets its own temporary directory, which pdflatex runs in and
+writes to (-output-directory), so concurrent compiles never share a working
+directory or file names, and the directory is removed afterwards whether
+the compile succeeded, failed or timed out. pdflatex runs non-interactively
+with shell escape disabled, since the LaTeX is model-generated, and is
+killed after LATEX_COMPILE_TIMEOUT_SECONDS. At most
+LATEX_COMPILE_CONCURRENCY compiles run at once per process (per event loop
+for `acompile_latex`); the rest queue.
+"""
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+
+from app.core.config import settings
+from app.shared.llm.instrumentation import LATENCY_BUCKETS, Histogram
+
+# Lines of the LaTeX log kept in compile errors
+LOG_TAIL_LINES = 20
+
+_compile_slots = threading.BoundedSemaphore(settings.LATEX_COMPILE_CONCURRENCY)
+_async_compile_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+
+class LatexCompileError(Exception):
+    """Raised when LaTeX does not compile to a PDF."""
+
+    def __init__(self, message: str, log: str = ""):
+        super().__init__(message)
+        self.log = log
+
+
+class LatexCompileTimeout(LatexCompileError):
+    """Raised when a compile runs longer than LATEX_COMPILE_TIMEOUT_SECONDS."""
+
+
+class LatexCompileMetrics:
+    """
+    In-process compile counters, compile time and time spent queued for a slot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.compiles = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.cancellations = 0
+        self.running = 0
+        self.compile_seconds = Histogram(LATENCY_BUCKETS)
+        self.queue_seconds = Histogram(LATENCY_BUCKETS)
+
+    def record_start(self, queued_seconds: float):
+        with self._lock:
+            self.running += 1
+            self.queue_seconds.observe(queued_seconds)
+
+    def record_compile(self, seconds: float, failed: bool = False, timed_out: bool = False, cancelled: bool = False):
+        with self._lock:
+            self.running -= 1
+            if cancelled:
+                # Abandoned by the caller (e.g. the client disconnected); neither a success nor a failure
+                self.cancellations += 1
+                return
+            self.compiles += 1
+            self.failures += failed
+            self.timeouts += timed_out
+            self.compile_seconds.observe(seconds)
+
+    def get_stats(self) -> dict:
+        """
+        Returns the compile metrics.
+
+        Returns:
+            dict: Compiles, failures, timeouts, cancellations, running compiles, and compile and queue time
+        """
+        with self._lock:
+            return {
+                "compiles": self.compiles,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "cancellations": self.cancellations,
+                "running": self.running,
+                "compile_seconds": self.compile_seconds.summary(),
+                "queue_seconds": self.queue_seconds.summary(),
+            }
+
+
+latex_compile_metrics = LatexCompileMetrics()
+
+
+def _command(jobname: str, output_dir: str) -> list[str]:
+    return [
+        settings.LATEX_COMPILER,
+        "-interaction=nonstopmode",
+        "-halt-on-error",
+        "-no-shell-escape",
+        f"-output-directory={output_dir}",
+        f"{jobname}.tex",
+    ]
+
+
+def _prepare(latex_code: str) -> tuple[str, str]:
+    """Writes the LaTeX to a new temporary directory; returns the directory and job name."""
+    os.makedirs(settings.LATEX_WORK_DIR, exist_ok=True)
+    work_dir = os.path.abspath(tempfile.mkdtemp(prefix="latex-", dir=settings.LATEX_WORK_DIR))
+    jobname = f"resume_{uuid.uuid4().hex}"
+    with open(os.path.join(work_dir, f"{jobname}.tex"), "w", encoding="utf-8") as file:
+        file.write(latex_code)
+    return work_dir, jobname
+
+
+def _read_pdf(work_dir: str, jobname: str, returncode: int, output: bytes) -> bytes:
+    """Returns the compiled PDF, or raises with the end of the LaTeX log."""
+    pdf_path = os.path.join(work_dir, f"{jobname}.pdf")
+    if os.path.exists(pdf_path):
+        with open(pdf_path, "rb") as pdf_file:
+            return pdf_file.read()
+    log = "\n".join(output.decode("utf-8", errors="replace").splitlines()[-LOG_TAIL_LINES:])
+    raise LatexCompileError(f"{settings.LATEX_COMPILER} exited with code {returncode} without producing a PDF", log)
+
+
+def compile_latex(latex_code: str) -> bytes:
+    """
+    Compiles LaTeX to a PDF, blocking until a compile slot is free.
+
+    Args:
+        latex_code (str): The LaTeX document
+
+    Returns:
+        bytes: The PDF
+
+    Raises:
+        LatexCompileTimeout: If the compile runs longer than LATEX_COMPILE_TIMEOUT_SECONDS
+        LatexCompileError: If the LaTeX does not compile
+    """
+    queued = time.perf_counter()
+    with _compile_slots:
+        started = time.perf_counter()
+        latex_compile_metrics.record_start(started - queued)
+        work_dir = None
+        failed = timed_out = False
+        try:
+            work_dir, jobname = _prepare(latex_code)
+            try:
+                completed = subprocess.run(
+                    _command(jobname, work_dir),
+                    cwd=work_dir,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    timeout=settings.LATEX_COMPILE_TIMEOUT_SECONDS,
+                )
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                raise LatexCompileTimeout(f"LaTeX compile timed out after {settings.LATEX_COMPILE_TIMEOUT_SECONDS:g}s")
+            return _read_pdf(work_dir, jobname, completed.returncode, completed.stdout)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            latex_compile_metrics.record_compile(time.perf_counter() - started, failed, timed_out)
+
+
+async def acompile_latex(latex_code: str) -> bytes:
+    """
+    Async version of `compile_latex`; pdflatex runs as an async subprocess.
+
+    Args:
+        latex_code (str): The LaTeX document
+
+    Returns:
+        bytes: The PDF
+
+    Raises:
+        LatexCompileTimeout: If the compile runs longer than LATEX_COMPILE_TIMEOUT_SECONDS
+        LatexCompileError: If the LaTeX does not compile
+    """
+    loop = asyncio.get_running_loop()
+    slots = _async_compile_slots.setdefault(loop, asyncio.Semaphore(settings.LATEX_COMPILE_CONCURRENCY))
+    queued = time.perf_counter()
+    async with slots:
+        started = time.perf_counter()
+        latex_compile_metrics.record_start(started - queued)
+        work_dir = None
+        failed = timed_out = cancelled = False
+        try:
+            work_dir, jobname = _prepare(latex_code)
+            process = await asyncio.create_subprocess_exec(
+                *_command(jobname, work_dir),
+                cwd=work_dir,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+            try:
+                output, _ = await asyncio.wait_for(process.communicate(), timeout=settings.LATEX_COMPILE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                timed_out = True
+                raise LatexCompileTimeout(f"LaTeX compile timed out after {settings.LATEX_COMPILE_TIMEOUT_SECONDS:g}s")
+            finally:
+                # Also reached when the request is cancelled mid-compile
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            return _read_pdf(work_dir, jobname, process.returncode, output)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            latex_compile_metrics.record_compile(time.perf_counter() - started, failed, timed_out, cancelled)
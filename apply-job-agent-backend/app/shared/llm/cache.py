@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from app.core.config import settings
+
+
+class SQLiteResponseStore:
+    """
+    Durable LLM response store backed by a local SQLite file.
+
+    SQLite in WAL mode allows concurrent readers and serialises writers
+    across processes, so every uvicorn worker on the host can share one
+    file. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str, max_rows: int):
+        self.path = path
+        self.max_rows = max_rows
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    tokens INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used_at ON llm_cache (last_used_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> tuple[str, int, float | None] | None:
+        """Returns (value, tokens, expires_at) for a live entry, or None."""
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, tokens, expires_at FROM llm_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, now),
+        ).fetchone()
+        if row is not None:
+            connection.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+        return row
+
+    def put(self, key: str, namespace: str, value: str, tokens: int, expires_at: float | None):
+        """Inserts or replaces an entry, occasionally evicting expired and least recently used rows."""
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, namespace, value, tokens, created_at, expires_at, last_used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, namespace, value, tokens, now, expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.evict()
+
+    def evict(self):
+        """Deletes expired entries and trims the store to `max_rows` by least recent use."""
+        connection = self._connection()
+        connection.execute("DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        connection.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+    def clear(self, namespace: str | None = None):
+        """Deletes all entries, or all entries of one namespace."""
+        if namespace is None:
+            self._connection().execute("DELETE FROM llm_cache")
+        else:
+            self._connection().execute("DELETE FROM llm_cache WHERE namespace = ?", (namespace,))
+
+
+class MemoryLRU:
+    """Thread-safe in-process LRU of recently used responses."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Any, int, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] is not None and entry[2] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache with an in-memory LRU in front of a durable SQLite store.
+
+    Keys are the sha256 of the chain namespace, LangChain's `llm_string`
+    (which includes the model name and temperature) and the rendered
+    prompt. Each chain gets its own instance so it can have its own TTL,
+    while all instances share the same memory LRU and SQLite file.
+    """
+
+    _lock = threading.Lock()
+    _stats: dict[str, dict[str, int]] = {}
+
+    def __init__(self, namespace: str, ttl_seconds: float | None, memory: MemoryLRU, store: SQLiteResponseStore):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.memory = memory
+        self.store = store
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            self._record("memory_hits", saved_tokens=entry[1])
+            return entry[0]
+
+        try:
+            row = self.store.get(key)
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache lookup failed: {str(e)}")
+            row = None
+
+        if row is None:
+            self._record("misses")
+            return None
+
+        value, tokens, expires_at = row
+        generations = [loads(generation) for generation in json.loads(value)]
+        self.memory.put(key, (generations, tokens, expires_at))
+        self._record("store_hits", saved_tokens=tokens)
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        tokens = sum(_total_tokens(generation) for generation in return_val)
+
+        self.memory.put(key, (return_val, tokens, expires_at))
+        try:
+            value = json.dumps([dumps(generation) for generation in return_val])
+            self.store.put(key, self.namespace, value, tokens, expires_at)
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache write failed: {str(e)}")
+
+    def contains(self, prompt: str, llm_string: str) -> bool:
+        """Whether a live entry exists, without touching the hit/miss counters."""
+        key = self._key(prompt, llm_string)
+        if self.memory.get(key) is not None:
+            return True
+        try:
+            return self.store.get(key) is not None
+        except sqlite3.Error:
+            return False
+
+    def clear(self, **kwargs: Any) -> None:
+        self.memory.clear()
+        self.store.clear(self.namespace)
+
+    def _record(self, counter: str, saved_tokens: int = 0):
+        with self._lock:
+            stats = self._stats.setdefault(
+                self.namespace, {"memory_hits": 0, "store_hits": 0, "misses": 0, "saved_tokens": 0}
+            )
+            stats[counter] += 1
+            stats["saved_tokens"] += saved_tokens
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns in-process hit/miss counters per chain.
+
+        Returns:
+            dict: Per-namespace counters with hit rate and saved tokens
+        """
+        with cls._lock:
+            stats = {namespace: dict(counters) for namespace, counters in cls._stats.items()}
+        for counters in stats.values():
+            lookups = counters["memory_hits"] + counters["store_hits"] + counters["misses"]
+            counters["hit_rate"] = round((lookups - counters["misses"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def _total_tokens(generation) -> int:
+    """Returns the total token usage recorded on a generation, if any."""
+    message = getattr(generation, "message", None)
+    usage = getattr(message, "usage_metadata", None) or {}
+    if usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    return int(token_usage.get("total_tokens") or 0)
+
+
+_memory: MemoryLRU | None = None
+_store: SQLiteResponseStore | None = None
+_caches: dict[str, LLMResponseCache] = {}
+_init_lock = threading.Lock()
+
+
+def get_response_cache(namespace: str) -> LLMResponseCache:
+    """
+    Returns the response cache for a chain, creating the shared tiers on first use.
+
+    Args:
+        namespace (str): The chain name; selects the TTL from LLM_CACHE_TTL_SECONDS
+
+    Returns:
+        LLMResponseCache: The chain's cache
+    """
+    global _memory, _store
+    with _init_lock:
+        if _store is None:
+            _memory = MemoryLRU(settings.LLM_CACHE_MEMORY_ENTRIES)
+            _store = SQLiteResponseStore(settings.LLM_CACHE_PATH, settings.LLM_CACHE_MAX_ROWS)
+        if namespace not in _caches:
+            ttl = settings.LLM_CACHE_TTL_SECONDS.get(namespace, settings.LLM_CACHE_DEFAULT_TTL_SECONDS)
+            _caches[namespace] = LLMResponseCache(namespace, ttl, _memory, _store)
+        return _caches[namespace]
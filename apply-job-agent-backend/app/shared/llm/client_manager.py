@@ -0,0 +1,424 @@
+import asyncio
+import random
+import threading
+import time
+
+import openai
+from fastapi import HTTPException
+from langchain_core.load import dumps
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import BaseMessage, message_chunk_to_message
+from langchain_core.outputs import ChatGeneration
+from langchain_core.runnables import Runnable
+
+from app.core.config import settings
+
+
+class LLMCapacityError(Exception):
+    """Raised when an LLM call cannot be admitted or keeps being rate limited."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `capacity` per minute.
+
+    The level may go negative when a call uses more than was reserved for
+    it; callers then wait until the debt is refilled.
+    """
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is available now). Call refill() first."""
+        # A request larger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+class LLMClientManager:
+    """
+    Per-process admission control, retries and metrics for one OpenAI model.
+
+    A call is admitted when a request-per-minute token, its estimated
+    tokens-per-minute budget and an in-flight slot are all available;
+    otherwise the caller queues. Once the response arrives the token
+    reservation is corrected to the actual usage. 429s, 5xx, timeouts and
+    connection errors are retried with full-jitter exponential backoff,
+    honouring Retry-After.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_in_flight: int,
+        max_retries: int,
+        max_queue_wait: float,
+    ):
+        self.model_name = model_name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.max_queue_wait = max_queue_wait
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._stats = {
+            "admitted": 0,
+            "rejected": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "cache_bypassed": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    # Admission
+
+    def _try_admit(self, estimated_tokens: int) -> float:
+        """Admits the call and returns 0, or returns how long to wait before retrying."""
+        with self._lock:
+            self.requests.refill()
+            self.tokens.refill()
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+            if self._in_flight >= self.max_in_flight:
+                wait = max(wait, 0.05)
+            if wait > 0:
+                return wait
+            self.requests.level -= 1
+            self.tokens.level -= estimated_tokens
+            self._in_flight += 1
+            return 0.0
+
+    def estimated_wait(self, estimated_tokens: int) -> float:
+        """
+        Returns how long a call would currently wait for admission, without admitting it.
+
+        Args:
+            estimated_tokens (int): The call's estimated token usage
+
+        Returns:
+            float: The expected wait in seconds
+        """
+        with self._lock:
+            self.requests.refill()
+            self.tokens.refill()
+            return max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+
+    def _queued(self, delta: int):
+        with self._lock:
+            self._waiting += delta
+
+    def _record_wait(self, waited: float, admitted: bool):
+        with self._lock:
+            self._stats["admitted" if admitted else "rejected"] += 1
+            self._stats["total_wait_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+
+    def _release(self, estimated_tokens: int, actual_tokens: int | None):
+        with self._lock:
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                self.tokens.level += estimated_tokens - actual_tokens
+
+    def acquire(self, estimated_tokens: int):
+        """Blocks until the call is admitted. Raises LLMCapacityError after `max_queue_wait`."""
+        started = time.monotonic()
+        self._queued(1)
+        try:
+            while (wait := self._try_admit(estimated_tokens)) > 0:
+                if time.monotonic() - started + wait > self.max_queue_wait:
+                    self._record_wait(time.monotonic() - started, admitted=False)
+                    raise LLMCapacityError(
+                        f"LLM capacity for {self.model_name} exhausted, try again later", retry_after=wait
+                    )
+                time.sleep(min(wait, 1.0))
+        finally:
+            self._queued(-1)
+        self._record_wait(time.monotonic() - started, admitted=True)
+
+    async def aacquire(self, estimated_tokens: int):
+        """Async version of `acquire` that waits without blocking the event loop."""
+        started = time.monotonic()
+        self._queued(1)
+        try:
+            while (wait := self._try_admit(estimated_tokens)) > 0:
+                if time.monotonic() - started + wait > self.max_queue_wait:
+                    self._record_wait(time.monotonic() - started, admitted=False)
+                    raise LLMCapacityError(
+                        f"LLM capacity for {self.model_name} exhausted, try again later", retry_after=wait
+                    )
+                await asyncio.sleep(min(wait, 1.0))
+        finally:
+            self._queued(-1)
+        self._record_wait(time.monotonic() - started, admitted=True)
+
+    # Retries
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """Returns the backoff before the next attempt, or None if the error is not retryable."""
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, openai.RateLimitError):
+            with self._lock:
+                self._stats["rate_limited"] += 1
+        elif isinstance(error, openai.APIStatusError):
+            if error.status_code < 500:
+                return None
+        elif not isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+            return None
+
+        delay = random.uniform(0, min(
+            settings.LLM_RETRY_MAX_DELAY_SECONDS, settings.LLM_RETRY_BASE_DELAY_SECONDS * 2 ** attempt
+        ))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        with self._lock:
+            self._stats["retries"] += 1
+        return delay
+
+    def _give_up(self, error: Exception):
+        with self._lock:
+            self._stats["failures"] += 1
+        if isinstance(error, openai.RateLimitError):
+            raise LLMCapacityError(
+                f"LLM rate limit for {self.model_name} exceeded after {self.max_retries} retries"
+            ) from error
+        raise error
+
+    # Wrapping
+
+    def wrap(self, model) -> "ManagedChatModel":
+        """
+        Wraps a chat model so every call goes through admission control and retries.
+
+        Args:
+            model (BaseChatModel): The model to wrap
+
+        Returns:
+            ManagedChatModel: A drop-in replacement for the model in a chain
+        """
+        return ManagedChatModel(self, model)
+
+    def _is_cached(self, model, messages, count: bool = True) -> bool:
+        """Whether the model's response cache already holds an answer for these messages."""
+        cache = getattr(model, "cache", None)
+        if cache is None or not hasattr(cache, "contains"):
+            return False
+        try:
+            if cache.contains(dumps(messages), model._get_llm_string()):
+                if not count:
+                    return True
+                with self._lock:
+                    self._stats["cache_bypassed"] += 1
+                return True
+        except Exception:
+            pass
+        return False
+
+    @staticmethod
+    def _estimate_tokens(model, messages) -> int:
+        """Estimates prompt tokens plus the expected completion."""
+        try:
+            prompt_tokens = model.get_num_tokens_from_messages(messages)
+        except Exception:
+            prompt_tokens = sum(len(str(message.content)) for message in messages) // 4
+        return prompt_tokens + settings.LLM_ESTIMATED_COMPLETION_TOKENS
+
+    def get_stats(self) -> dict:
+        """
+        Returns queue, in-flight, budget and retry metrics.
+
+        Returns:
+            dict: The manager's current state and counters
+        """
+        with self._lock:
+            self.requests.refill()
+            self.tokens.refill()
+            stats = dict(self._stats)
+            stats.update(
+                queue_depth=self._waiting,
+                in_flight=self._in_flight,
+                max_in_flight=self.max_in_flight,
+                requests_available=round(self.requests.level, 2),
+                tokens_available=round(self.tokens.level, 2),
+            )
+        calls = stats["admitted"] + stats["rejected"]
+        stats["avg_wait_seconds"] = round(stats["total_wait_seconds"] / calls, 4) if calls else 0.0
+        return stats
+
+
+class ManagedChatModel(Runnable[LanguageModelInput, BaseMessage]):
+    """
+    A chat model behind an LLMClientManager.
+
+    Calls that will be answered by the model's response cache skip admission
+    entirely. Streamed calls are only retried if they fail before the first
+    chunk, and their result is written to the response cache like an
+    ordinary call.
+    """
+
+    def __init__(self, manager: LLMClientManager, model):
+        self.manager = manager
+        self.model = model
+        self.name = f"managed_{manager.model_name}"
+
+    def invoke(self, input, config=None, **kwargs):
+        messages = self.model._convert_input(input).to_messages()
+        if self.manager._is_cached(self.model, messages):
+            return self.model.invoke(input, config, **kwargs)
+        estimated = self.manager._estimate_tokens(self.model, messages)
+        attempt = 0
+        while True:
+            self.manager.acquire(estimated)
+            actual = None
+            try:
+                response = self.model.invoke(input, config, **kwargs)
+                actual = _total_tokens(response)
+                return response
+            except Exception as e:
+                delay = self.manager._retry_delay(e, attempt)
+                if delay is None:
+                    self.manager._give_up(e)
+            finally:
+                self.manager._release(estimated, actual)
+            attempt += 1
+            time.sleep(delay)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        messages = self.model._convert_input(input).to_messages()
+        if self.manager._is_cached(self.model, messages):
+            return await self.model.ainvoke(input, config, **kwargs)
+        estimated = self.manager._estimate_tokens(self.model, messages)
+        attempt = 0
+        while True:
+            await self.manager.aacquire(estimated)
+            actual = None
+            try:
+                response = await self.model.ainvoke(input, config, **kwargs)
+                actual = _total_tokens(response)
+                return response
+            except Exception as e:
+                delay = self.manager._retry_delay(e, attempt)
+                if delay is None:
+                    self.manager._give_up(e)
+            finally:
+                self.manager._release(estimated, actual)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def astream(self, input, config=None, **kwargs):
+        messages = self.model._convert_input(input).to_messages()
+        if self.manager._is_cached(self.model, messages):
+            yield await self.model.ainvoke(input, config, **kwargs)
+            return
+        estimated = self.manager._estimate_tokens(self.model, messages)
+        attempt = 0
+        while True:
+            await self.manager.aacquire(estimated)
+            aggregate = None
+            try:
+                async for chunk in self.model.astream(input, config, **kwargs):
+                    aggregate = chunk if aggregate is None else aggregate + chunk
+                    yield chunk
+                break
+            except Exception as e:
+                # Chunks already sent to the caller cannot be taken back
+                delay = self.manager._retry_delay(e, attempt) if aggregate is None else None
+                if delay is None:
+                    self.manager._give_up(e)
+            finally:
+                self.manager._release(estimated, _total_tokens(aggregate))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        self._update_cache(messages, aggregate)
+
+    def _update_cache(self, messages, aggregate):
+        """Stores a streamed response, which LangChain does not cache itself."""
+        cache = getattr(self.model, "cache", None)
+        if cache is None or aggregate is None:
+            return
+        try:
+            cache.update(
+                dumps(messages),
+                self.model._get_llm_string(),
+                [ChatGeneration(message=message_chunk_to_message(aggregate))],
+            )
+        except Exception as e:
+            print(f"Warning: failed to cache streamed LLM response: {str(e)}")
+
+
+def capacity_http_exception(error: LLMCapacityError) -> HTTPException:
+    """
+    Maps a capacity error to a 503 the client can retry.
+
+    Args:
+        error (LLMCapacityError): The capacity error
+
+    Returns:
+        HTTPException: A 503 with a Retry-After header
+    """
+    retry_after = max(1, round(error.retry_after or settings.LLM_RETRY_MAX_DELAY_SECONDS))
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": str(retry_after)})
+
+
+def _total_tokens(message) -> int | None:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("total_tokens")
+
+
+_managers: dict[str, LLMClientManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_client_manager(model_name: str) -> LLMClientManager:
+    """
+    Returns the process-wide client manager for a model, creating it on first use.
+
+    Args:
+        model_name (str): The OpenAI model name
+
+    Returns:
+        LLMClientManager: The model's manager
+    """
+    with _managers_lock:
+        if model_name not in _managers:
+            limits = settings.LLM_RATE_LIMITS.get(model_name, {})
+            _managers[model_name] = LLMClientManager(
+                model_name,
+                requests_per_minute=limits.get("rpm", settings.LLM_REQUESTS_PER_MINUTE),
+                tokens_per_minute=limits.get("tpm", settings.LLM_TOKENS_PER_MINUTE),
+                max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+                max_retries=settings.LLM_MAX_RETRIES,
+                max_queue_wait=settings.LLM_MAX_QUEUE_WAIT_SECONDS,
+            )
+        return _managers[model_name]
+
+
+def get_client_stats() -> dict:
+    """Returns the stats of every client manager, keyed by model name."""
+    with _managers_lock:
+        managers = dict(_managers)
+    return {name: manager.get_stats() for name, manager in managers.items()}
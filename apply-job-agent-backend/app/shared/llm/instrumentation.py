@@ -0,0 +1,256 @@
+import bisect
+import json
+import os
+import threading
+import time
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120]
+TOKEN_BUCKETS = [100, 250, 500, 1_000, 2_000, 4_000, 8_000, 16_000, 32_000]
+
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are estimated as the bucket's upper bound."""
+
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+        return None
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "buckets": {
+                f"le_{bound}": count for bound, count in zip(self.bounds + ["inf"], self.counts)
+            },
+        }
+
+
+class ChainMetrics:
+    """Aggregated metrics of one chain."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.parse_failures = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.time_to_first_token = Histogram(LATENCY_BUCKETS)
+        self.total_tokens = Histogram(TOKEN_BUCKETS)
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "parse_failures": self.parse_failures,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_seconds": self.latency.summary(),
+            "time_to_first_token_seconds": self.time_to_first_token.summary(),
+            "total_tokens": self.total_tokens.summary(),
+        }
+
+
+class ChainMetricsHandler(BaseCallbackHandler):
+    """
+    Callback handler that records tokens, latency, time to first token, retries
+    and parse failures per chain.
+
+    Chains are identified by the "chain" metadata key set by the prompt
+    registry. One record is kept per top-level chain run; every model call
+    inside it (including retries) adds to that record, and the record is
+    aggregated and optionally appended to a JSONL file when the run ends.
+    """
+
+    # Keep ordering and timings exact instead of dispatching to a thread pool
+    run_inline = True
+
+    def __init__(self, jsonl_path: str | None = None):
+        self.jsonl_path = jsonl_path
+        self._lock = threading.Lock()
+        self._metrics: dict[str, ChainMetrics] = {}
+        # run id -> root chain run id, for every run inside an instrumented chain
+        self._root_of: dict[UUID, UUID] = {}
+        self._runs: dict[UUID, dict] = {}
+
+    # Chain runs
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        with self._lock:
+            if parent_run_id in self._root_of:
+                self._root_of[run_id] = self._root_of[parent_run_id]
+                return
+            chain = (metadata or {}).get("chain")
+            if chain is None:
+                return
+            self._root_of[run_id] = run_id
+            self._runs[run_id] = {
+                "chain": chain,
+                "started_at": time.perf_counter(),
+                "first_token_at": None,
+                "llm_calls": 0,
+                "llm_errors": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "models": set(),
+            }
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id, error=None)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    # Model calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            root = self._root_of.get(parent_run_id)
+            if root is None:
+                return
+            self._root_of[run_id] = root
+            self._runs[root]["llm_calls"] += 1
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.get(self._root_of.get(run_id))
+            if run is not None and run["first_token_at"] is None:
+                run["first_token_at"] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.get(self._root_of.pop(run_id, None))
+            if run is None:
+                return
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) or {}
+                    model = (getattr(message, "response_metadata", None) or {}).get("model_name", "")
+                    prompt_tokens = usage.get("input_tokens", 0)
+                    completion_tokens = usage.get("output_tokens", 0)
+                    run["prompt_tokens"] += prompt_tokens
+                    run["completion_tokens"] += completion_tokens
+                    run["cost_usd"] += _cost(model, prompt_tokens, completion_tokens)
+                    if model:
+                        run["models"].add(model)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.get(self._root_of.pop(run_id, None))
+            if run is not None:
+                run["llm_errors"] += 1
+
+    # Aggregation
+
+    def _finish(self, run_id: UUID, error: BaseException | None):
+        with self._lock:
+            root = self._root_of.pop(run_id, None)
+            if root != run_id:
+                return
+            run = self._runs.pop(run_id)
+            # Drop any children whose end events we did not see
+            for child in [child for child, parent in self._root_of.items() if parent == run_id]:
+                del self._root_of[child]
+
+            finished_at = time.perf_counter()
+            latency = finished_at - run["started_at"]
+            ttft = run["first_token_at"] - run["started_at"] if run["first_token_at"] else None
+            parse_failure = isinstance(error, OutputParserException)
+            # Each failed model call that was followed by another one was retried
+            retries = min(run["llm_errors"], max(run["llm_calls"] - 1, 0))
+
+            metrics = self._metrics.setdefault(run["chain"], ChainMetrics())
+            metrics.calls += 1
+            metrics.failures += error is not None
+            metrics.parse_failures += parse_failure
+            metrics.retries += retries
+            metrics.prompt_tokens += run["prompt_tokens"]
+            metrics.completion_tokens += run["completion_tokens"]
+            metrics.cost_usd += run["cost_usd"]
+            metrics.latency.observe(latency)
+            metrics.total_tokens.observe(run["prompt_tokens"] + run["completion_tokens"])
+            if ttft is not None:
+                metrics.time_to_first_token.observe(ttft)
+
+        if error is not None:
+            print(f"Chain {run['chain']} failed after {latency:.2f}s: {type(error).__name__}: {str(error)[:200]}")
+
+        if self.jsonl_path:
+            self._write_record({
+                "timestamp": time.time(),
+                "chain": run["chain"],
+                "models": sorted(run["models"]),
+                "latency_seconds": round(latency, 4),
+                "time_to_first_token_seconds": round(ttft, 4) if ttft is not None else None,
+                "prompt_tokens": run["prompt_tokens"],
+                "completion_tokens": run["completion_tokens"],
+                "cost_usd": round(run["cost_usd"], 6),
+                "llm_calls": run["llm_calls"],
+                "retries": retries,
+                "error": type(error).__name__ if error is not None else None,
+                "parse_failure": parse_failure,
+            })
+
+    def _write_record(self, record: dict):
+        try:
+            os.makedirs(os.path.dirname(self.jsonl_path) or ".", exist_ok=True)
+            with self._lock, open(self.jsonl_path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Warning: failed to write LLM metrics record: {str(e)}")
+
+    def get_stats(self) -> dict:
+        """
+        Returns the aggregated metrics of every chain run in this process.
+
+        Returns:
+            dict: Per-chain counters, token totals, cost and histograms
+        """
+        with self._lock:
+            return {chain: metrics.summary() for chain, metrics in self._metrics.items()}
+
+
+def _cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Returns the USD cost of a call; dated model names match their base model's price."""
+    matches = [name for name in settings.LLM_PRICING_PER_MILLION_TOKENS if model.startswith(name)]
+    if not matches:
+        return 0.0
+    price = settings.LLM_PRICING_PER_MILLION_TOKENS[max(matches, key=len)]
+    return (prompt_tokens * price["input"] + completion_tokens * price["output"]) / 1_000_000
+
+
+# Shared handler attached to every registered chain
+chain_metrics = ChainMetricsHandler(settings.LLM_METRICS_JSONL_PATH)
@@ -1,25 +1,74 @@
 import os
 from langchain_openai import ChatOpenAI
+from app.core.config import settings
+from app.shared.llm.cache import get_response_cache
+from app.shared.llm.client_manager import get_client_manager
+from app.shared.llm.router import RoutedChatModel, chain_policy, register_router
 
-def get_llm_model(model_name="gpt-4o", temperature=0):
+def get_llm_model(model_name="gpt-4o", temperature=0, cache=None, max_retries=2):
     """
     Creates and returns a ChatOpenAI model instance.
-    
+
     Args:
         model_name (str): The OpenAI model to use
         temperature (float): Controls randomness (0 to 1)
-        
+        cache (BaseCache | None): Optional LangChain response cache
+        max_retries (int): Retries done by the OpenAI client itself
+
     Returns:
         ChatOpenAI: An instance of the language model
     """
     try:
         return ChatOpenAI(
-            model=model_name, 
+            model=model_name,
             temperature=temperature,
+            cache=cache,
+            max_retries=max_retries,
+            # Report token usage on streamed responses too
+            stream_usage=True,
         )
     except Exception as e:
         print(f"Error initializing LLM model: {e}")
         raise
 
 # Default model instance
-gpt_model = get_llm_model()
\ No newline at end of file
+gpt_model = get_llm_model()
+
+_chain_models = {}
+
+def get_chain_model(chain_name, model_name=None, temperature=0):
+    """
+    Returns the model used by a named chain.
+
+    Each chain gets its own instances so its responses are cached under the
+    chain's namespace and TTL (see LLM_CACHE_TTL_SECONDS). Instances are
+    wrapped by their model's client manager, which handles rate limiting and
+    retries, so the OpenAI client's own retries are disabled.
+
+    Without a model name, the chain gets a router that picks the model of the
+    chain's tier and latency budget (see LLM_CHAIN_POLICIES).
+
+    Args:
+        chain_name (str): The chain name, e.g. "resume_parser"
+        model_name (str | None): Pin the chain to this OpenAI model instead of routing
+        temperature (float): Controls randomness (0 to 1)
+
+    Returns:
+        Runnable: The chain's language model
+    """
+    key = (chain_name, model_name, temperature)
+    if key not in _chain_models:
+        if model_name is None:
+            tier, latency_budget = chain_policy(chain_name)
+            models = {
+                name: get_chain_model(chain_name, tier_model, temperature)
+                for name, tier_model in settings.LLM_MODEL_TIERS.items()
+            }
+            router = RoutedChatModel(chain_name, tier, latency_budget, models)
+            register_router(router)
+            _chain_models[key] = router
+        else:
+            cache = get_response_cache(chain_name) if settings.LLM_CACHE_ENABLED else None
+            model = get_llm_model(model_name, temperature, cache=cache, max_retries=0)
+            _chain_models[key] = get_client_manager(model_name).wrap(model)
+    return _chain_models[key]
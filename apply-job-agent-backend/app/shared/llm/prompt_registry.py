@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+from typing import Callable
+
+from langchain_core.runnables import Runnable
+
+from app.shared.llm.instrumentation import chain_metrics
+
+PROMPTS_DIR = "app/shared/prompts"
+
+
+class PromptRegistry:
+    """
+    Loads every prompt under `app/shared/prompts` once and compiles the chains built from them.
+
+    Prompts are addressed by their path relative to the prompts directory
+    without the `.md` suffix (e.g. "resumes/resume_parser") and versioned by
+    content hash. Features register a builder per chain; chains are built
+    when registered and rebuilt whenever the prompts are reloaded, so the
+    request path only does dictionary lookups. Every chain reports to the
+    shared `chain_metrics` callback handler.
+    """
+
+    def __init__(self, prompts_dir: str = PROMPTS_DIR):
+        self.prompts_dir = prompts_dir
+        self._lock = threading.RLock()
+        self._prompts: dict[str, str] = {}
+        self._versions: dict[str, str] = {}
+        self._mtimes: dict[str, float] = {}
+        self._builders: dict[str, tuple[Callable[["PromptRegistry"], Runnable], list[str]]] = {}
+        self._chains: dict[str, Runnable] = {}
+        self._watcher: threading.Thread | None = None
+        self._stop_watcher = threading.Event()
+        self.load()
+
+    def load(self):
+        """
+        Reads all prompt files and rebuilds every registered chain.
+
+        The new prompts and chains are swapped in together, so readers never
+        see a chain built from a different prompt version than reported.
+        """
+        prompts, versions, mtimes = {}, {}, {}
+        for path in self._prompt_files():
+            name = os.path.relpath(path, self.prompts_dir)[: -len(".md")].replace(os.sep, "/")
+            with open(path, "r") as file:
+                prompts[name] = file.read()
+            versions[name] = hashlib.sha256(prompts[name].encode("utf-8")).hexdigest()
+            mtimes[path] = os.path.getmtime(path)
+
+        with self._lock:
+            previous = (self._prompts, self._versions)
+            self._prompts, self._versions = prompts, versions
+            try:
+                chains = {name: self._build(name, builder) for name, (builder, _) in self._builders.items()}
+            except Exception:
+                # Keep serving the previous prompts if an edited prompt breaks a chain
+                self._prompts, self._versions = previous
+                raise
+            self._chains = chains
+            self._mtimes = mtimes
+
+    def text(self, name: str, default: str | None = None) -> str:
+        """
+        Returns the text of a prompt.
+
+        Args:
+            name (str): Prompt name, e.g. "resumes/resume_parser"
+            default (str | None): Returned if the prompt does not exist
+
+        Raises:
+            KeyError: If the prompt does not exist and no default is given
+        """
+        if name not in self._prompts and default is not None:
+            return default
+        return self._prompts[name]
+
+    def version(self, name: str) -> str:
+        """Returns the sha256 content hash of a prompt."""
+        return self._versions[name]
+
+    def register_chain(self, name: str, builder: Callable[["PromptRegistry"], Runnable], prompts: list[str]):
+        """
+        Registers and immediately builds a chain.
+
+        Args:
+            name (str): The chain name
+            builder (Callable[[PromptRegistry], Runnable]): Builds the chain from the registry's prompts
+            prompts (list[str]): Names of the prompts the chain depends on, used for versioning
+        """
+        with self._lock:
+            self._builders[name] = (builder, prompts)
+            self._chains[name] = self._build(name, builder)
+
+    def _build(self, name: str, builder: Callable[["PromptRegistry"], Runnable]) -> Runnable:
+        """Builds a chain and tags its runs with the chain name for instrumentation."""
+        return builder(self).with_config(
+            run_name=name, metadata={"chain": name}, callbacks=[chain_metrics]
+        )
+
+    def chain(self, name: str) -> Runnable:
+        """Returns the compiled chain registered under the given name."""
+        return self._chains[name]
+
+    def chain_version(self, name: str) -> str:
+        """
+        Returns a content hash covering every prompt a chain depends on.
+
+        Args:
+            name (str): The chain name
+
+        Returns:
+            str: The chain version
+        """
+        _, prompts = self._builders[name]
+        combined = "".join(f"{prompt}:{self._versions.get(prompt, '')};" for prompt in sorted(prompts))
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+    def versions(self) -> dict:
+        """Returns the content hash of every prompt and registered chain."""
+        return {
+            "prompts": dict(self._versions),
+            "chains": {name: self.chain_version(name) for name in self._builders},
+        }
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reloads prompts if any prompt file was added, removed or modified.
+
+        Returns:
+            bool: True if the prompts were reloaded
+        """
+        files = self._prompt_files()
+        current = {path: os.path.getmtime(path) for path in files}
+        if current == self._mtimes:
+            return False
+        try:
+            self.load()
+            print(f"Reloaded prompts from {self.prompts_dir}")
+            return True
+        except Exception as e:
+            # Don't retry the broken version until the file changes again
+            self._mtimes = current
+            print(f"Warning: failed to reload prompts, keeping previous version: {str(e)}")
+            return False
+
+    def start_watcher(self, interval: float):
+        """
+        Starts a daemon thread that hot-reloads prompts when their files change.
+
+        Intended for local development only.
+
+        Args:
+            interval (float): Seconds between checks
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watcher.clear()
+
+        def watch():
+            while not self._stop_watcher.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"Warning: prompt watcher error: {str(e)}")
+
+        self._watcher = threading.Thread(target=watch, name="prompt-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        """Stops the hot-reload thread if it is running."""
+        if self._watcher is None:
+            return
+        self._stop_watcher.set()
+        self._watcher.join(timeout=5)
+        self._watcher = None
+
+    def _prompt_files(self) -> list[str]:
+        files = []
+        for root, _, names in os.walk(self.prompts_dir):
+            files.extend(os.path.join(root, name) for name in names if name.endswith(".md"))
+        return sorted(files)
+
+
+# Shared registry instance
+prompt_registry = PromptRegistry()
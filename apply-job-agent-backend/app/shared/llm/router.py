@@ -0,0 +1,159 @@
+import threading
+import time
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+
+from app.core.config import settings
+
+FAST = "fast"
+QUALITY = "quality"
+
+# Weight of the latest call in the per-model latency estimate
+LATENCY_EWMA_ALPHA = 0.2
+
+
+def chain_policy(chain_name: str) -> tuple[str, float | None]:
+    """
+    Returns the tier and latency budget a chain declares in LLM_CHAIN_POLICIES.
+
+    Args:
+        chain_name (str): The chain name
+
+    Returns:
+        tuple[str, float | None]: The tier and the latency budget in seconds (None = no budget)
+    """
+    policy = settings.LLM_CHAIN_POLICIES.get(chain_name, {})
+    return policy.get("tier", settings.LLM_DEFAULT_TIER), policy.get("latency_budget_seconds")
+
+
+class RoutedChatModel(Runnable[LanguageModelInput, BaseMessage]):
+    """
+    Routes each call of a chain to the model of the chain's tier.
+
+    An uncached quality-tier call is sent to the fast tier instead when its
+    predicted latency (the admission wait at the model's client manager plus
+    the moving average of the chain's recent latencies on that model)
+    exceeds the chain's latency budget. The average only moves when the
+    quality tier is called, so while calls fall back, one call per
+    LLM_ROUTING_PROBE_SECONDS is still sent to the quality tier as a probe;
+    otherwise a single slow spell would route the chain to the fast tier
+    for good.
+    """
+
+    def __init__(self, chain_name: str, tier: str, latency_budget: float | None, models: dict):
+        """
+        Args:
+            chain_name (str): The chain name
+            tier (str): FAST or QUALITY
+            latency_budget (float | None): Seconds a call may take, or None for no budget
+            models (dict[str, ManagedChatModel]): The managed model of each tier
+        """
+        self.chain_name = chain_name
+        self.tier = tier
+        self.latency_budget = latency_budget
+        self.models = models
+        self.name = f"routed_{chain_name}"
+        self._lock = threading.Lock()
+        self._latency: dict[str, float] = {}
+        # time.monotonic() of each tier's last observed (or probing) call
+        self._observed_at: dict[str, float] = {}
+        self._calls = {name: 0 for name in models}
+        self._fallbacks = 0
+        self._probes = 0
+
+    def _select(self, input) -> str:
+        """Returns the tier to send a call to."""
+        if self.tier == FAST or self.latency_budget is None:
+            return self.tier
+        managed = self.models[self.tier]
+        messages = managed.model._convert_input(input).to_messages()
+        # Cached answers are instant, wherever the model is
+        if managed.manager._is_cached(managed.model, messages, count=False):
+            return self.tier
+        wait = managed.manager.estimated_wait(managed.manager._estimate_tokens(managed.model, messages))
+        with self._lock:
+            predicted = wait + self._latency.get(self.tier, 0.0)
+            if predicted <= self.latency_budget:
+                return self.tier
+            # The latency estimate is stale but the queue fits the budget: probe the tier
+            now = time.monotonic()
+            if wait <= self.latency_budget and (
+                now - self._observed_at.get(self.tier, 0.0) >= settings.LLM_ROUTING_PROBE_SECONDS
+            ):
+                # Concurrent calls keep falling back until the probe is observed
+                self._observed_at[self.tier] = now
+                self._probes += 1
+                return self.tier
+            self._fallbacks += 1
+        print(
+            f"Routing {self.chain_name} to the {FAST} tier: predicted {predicted:.1f}s "
+            f"exceeds the {self.latency_budget:.1f}s budget"
+        )
+        return FAST
+
+    def _observe(self, tier: str, seconds: float):
+        with self._lock:
+            self._calls[tier] += 1
+            self._observed_at[tier] = time.monotonic()
+            previous = self._latency.get(tier)
+            self._latency[tier] = seconds if previous is None else (
+                LATENCY_EWMA_ALPHA * seconds + (1 - LATENCY_EWMA_ALPHA) * previous
+            )
+
+    def invoke(self, input, config=None, **kwargs):
+        tier = self._select(input)
+        started = time.perf_counter()
+        response = self.models[tier].invoke(input, config, **kwargs)
+        self._observe(tier, time.perf_counter() - started)
+        return response
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        tier = self._select(input)
+        started = time.perf_counter()
+        response = await self.models[tier].ainvoke(input, config, **kwargs)
+        self._observe(tier, time.perf_counter() - started)
+        return response
+
+    async def astream(self, input, config=None, **kwargs):
+        tier = self._select(input)
+        started = time.perf_counter()
+        async for chunk in self.models[tier].astream(input, config, **kwargs):
+            yield chunk
+        self._observe(tier, time.perf_counter() - started)
+
+    def get_stats(self) -> dict:
+        """
+        Returns the chain's routing policy, calls per tier, fallbacks, probes and latency estimates.
+
+        Returns:
+            dict: The router's policy and counters
+        """
+        with self._lock:
+            return {
+                "tier": self.tier,
+                "models": {tier: managed.manager.model_name for tier, managed in self.models.items()},
+                "latency_budget_seconds": self.latency_budget,
+                "calls": dict(self._calls),
+                "fallbacks": self._fallbacks,
+                "probes": self._probes,
+                "latency_ewma_seconds": {tier: round(value, 3) for tier, value in self._latency.items()},
+            }
+
+
+_routers: dict[str, RoutedChatModel] = {}
+_routers_lock = threading.Lock()
+
+
+def register_router(router: RoutedChatModel):
+    """Makes a router's stats available to `get_routing_stats`."""
+    with _routers_lock:
+        _routers[router.chain_name] = router
+
+
+def get_routing_stats() -> dict:
+    """Returns the stats of every chain router, keyed by chain name."""
+    with _routers_lock:
+        routers = dict(_routers)
+    return {name: router.get_stats() for name, router in routers.items()}
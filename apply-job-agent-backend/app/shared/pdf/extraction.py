@@ -0,0 +1,106 @@
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf
+import pymupdf4llm
+
+from app.core.config import settings
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool used for PDF extraction, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor: A pool of PDF_EXTRACT_POOL_SIZE processes
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_EXTRACT_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_extraction_pool():
+    """Shuts down the extraction pool if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def split_page_ranges(page_count: int, chunk_count: int) -> list[list[int]]:
+    """
+    Splits page numbers into contiguous, evenly sized ranges.
+
+    Args:
+        page_count (int): Number of pages in the document
+        chunk_count (int): Number of ranges to produce
+
+    Returns:
+        list[list[int]]: Zero-based page numbers per range, in document order
+    """
+    chunk_count = max(1, min(chunk_count, page_count))
+    base, remainder = divmod(page_count, chunk_count)
+    ranges, start = [], 0
+    for index in range(chunk_count):
+        size = base + (1 if index < remainder else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def _convert_pages(pdf_bytes: bytes, pages: list[int] | None, hdr_info=None) -> str:
+    """Converts the given pages of an in-memory PDF to markdown."""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as document:
+        return pymupdf4llm.to_markdown(document, pages=pages, hdr_info=hdr_info)
+
+
+def pdf_to_markdown(pdf_bytes: bytes, pool_size: int | None = None) -> str:
+    """
+    Converts an in-memory PDF to markdown, in parallel for long documents.
+
+    Documents long enough to fill more than one chunk are split into page
+    ranges that are converted in the extraction process pool and stitched
+    back together in page order. Header levels are computed once over the
+    whole document so every range uses the same heading mapping as a
+    single-call conversion would. Short documents are converted in the
+    calling process to avoid the IPC overhead.
+
+    This blocks until the conversion finishes, so async callers should run
+    it in a thread pool.
+
+    Args:
+        pdf_bytes (bytes): The PDF file content
+        pool_size (int | None): Override for PDF_EXTRACT_POOL_SIZE
+
+    Returns:
+        str: The document as markdown
+    """
+    pool_size = settings.PDF_EXTRACT_POOL_SIZE if pool_size is None else pool_size
+
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as document:
+        page_count = document.page_count
+        chunk_count = min(
+            pool_size, math.ceil(page_count / max(1, settings.PDF_EXTRACT_MIN_PAGES_PER_CHUNK))
+        )
+        if chunk_count <= 1:
+            return pymupdf4llm.to_markdown(document)
+
+        hdr_info = pymupdf4llm.IdentifyHeaders(document)
+
+    pool = get_extraction_pool()
+    futures = [
+        pool.submit(_convert_pages, pdf_bytes, pages, hdr_info)
+        for pages in split_page_ranges(page_count, chunk_count)
+    ]
+    return "".join(future.result() for future in futures)
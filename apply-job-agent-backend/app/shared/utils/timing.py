@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    Records wall-clock durations for the named stages of a request pipeline.
+
+    Example:
+        timer = StageTimer()
+        with timer.stage("extract"):
+            ...
+        response.headers["Server-Timing"] = timer.server_timing_header()
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the enclosed block and record it under the given stage name.
+
+        Args:
+            name (str): The stage name (e.g. "receive", "extract", "llm", "db")
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start)
+
+    def total(self) -> float:
+        """Return the sum of all recorded stage durations in seconds."""
+        return sum(self.timings.values())
+
+    def as_milliseconds(self) -> dict[str, float]:
+        """Return the recorded stage durations in milliseconds."""
+        return {name: round(seconds * 1000, 2) for name, seconds in self.timings.items()}
+
+    def server_timing_header(self) -> str:
+        """
+        Format the recorded stages as a `Server-Timing` HTTP header value.
+
+        Returns:
+            str: e.g. "receive;dur=3.1, extract;dur=412.8"
+        """
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_milliseconds().items())
+
+    def summary(self) -> str:
+        """Return a human readable one-line summary for logging."""
+        parts = [f"{name}={ms}ms" for name, ms in self.as_milliseconds().items()]
+        parts.append(f"total={round(self.total() * 1000, 2)}ms")
+        return " ".join(parts)
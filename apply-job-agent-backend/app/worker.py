@@ -0,0 +1,215 @@
+"""
+Task worker for the Apply Job Agent pipelines.
+
+Runs a pool of worker processes that claim queued tasks from the `tasks`
+table and execute the matching pipeline handler, plus (unless --no-ingest)
+one process that periodically ingests popular job searches into the job
+store. Run alongside the API:
+
+    python -m app.worker --processes 4
+"""
+# Standard library imports
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+# Application imports
+from app.core.config import settings
+
+
+def run_worker(worker_id: str, poll_interval: float):
+    """
+    Claims and executes tasks until the process receives SIGTERM or SIGINT.
+
+    Args:
+        worker_id (str): Identifier recorded on claimed tasks
+        poll_interval (float): Seconds to sleep when the queue is empty
+    """
+    # Imported here so each spawned process builds its own engine and LLM clients
+    from app.core.session import SessionLocal
+    from app.features.auth.models import User
+    from app.features.tasks.handlers import HANDLERS, close_event_loop
+    from app.features.tasks.services import TaskService
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    print(f"Task worker {worker_id} started")
+    while not stopping:
+        db = SessionLocal()
+        try:
+            TaskService.fail_exhausted(db)
+            task = TaskService.claim_next(db, worker_id)
+            if task is None:
+                time.sleep(poll_interval)
+                continue
+
+            started = time.perf_counter()
+            handler = HANDLERS.get(task.kind)
+            heartbeat_stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=renew_lease_until, args=(task.id, worker_id, heartbeat_stop), daemon=True
+            )
+            heartbeat.start()
+            try:
+                if handler is None:
+                    raise ValueError(f"No handler registered for task kind '{task.kind}'")
+                user = db.query(User).filter(User.id == task.user_id).first()
+                result = handler(task, user, db)
+                heartbeat_stop.set()
+                heartbeat.join()
+                if TaskService.complete(db, task, worker_id, result):
+                    print(f"Task {task.id} ({task.kind}) succeeded in {time.perf_counter() - started:.2f}s")
+                else:
+                    print(f"Task {task.id} ({task.kind}) finished after its lease was lost; result discarded")
+
+            except Exception as e:
+                heartbeat_stop.set()
+                heartbeat.join()
+                db.rollback()
+                detail = getattr(e, "detail", None) or str(e)
+                print(f"Task {task.id} ({task.kind}) failed: {detail}")
+                print(traceback.format_exc())
+                if not TaskService.fail(db, task, worker_id, str(detail)):
+                    print(f"Task {task.id} ({task.kind}) failed after its lease was lost; error discarded")
+
+        except Exception as e:
+            # Database hiccups should not kill the worker
+            print(f"Task worker {worker_id} error: {str(e)}")
+            time.sleep(poll_interval)
+        finally:
+            db.close()
+
+    close_event_loop()
+    print(f"Task worker {worker_id} stopped")
+
+
+def renew_lease_until(task_id, worker_id: str, stop: threading.Event):
+    """
+    Renews a running task's lease every TASK_HEARTBEAT_SECONDS until stopped.
+
+    Runs in a thread next to the task's handler with its own database
+    session, so a task that outlives TASK_LEASE_SECONDS is not re-claimed
+    while its worker is alive. Stops early if the lease was lost.
+
+    Args:
+        task_id: ID of the running task
+        worker_id (str): Identifier of the worker running it
+        stop (threading.Event): Set when the handler returns
+    """
+    from app.core.session import SessionLocal
+    from app.features.tasks.services import TaskService
+
+    while not stop.wait(settings.TASK_HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            if not TaskService.renew_lease(db, task_id, worker_id):
+                print(f"Task {task_id} lease lost by worker {worker_id}")
+                return
+        except Exception as e:
+            # The next heartbeat retries; the lease outlasts several of them
+            db.rollback()
+            print(f"Task {task_id} lease renewal failed: {str(e)}")
+        finally:
+            db.close()
+
+
+def run_ingester(poll_interval: float):
+    """
+    Runs job ingestion cycles until the process receives SIGTERM or SIGINT.
+
+    Args:
+        poll_interval (float): Seconds to sleep between cycles
+    """
+    from app.core.session import SessionLocal
+    from app.features.jobs.ingestion import run_ingestion_cycle
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    print("Job ingester started")
+    while not stopping:
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            summary = run_ingestion_cycle(db, should_stop=lambda: stopping)
+            if summary["scraped"] or summary["failed"] or summary["pruned"]:
+                print(f"Job ingestion cycle finished in {time.perf_counter() - started:.2f}s: {summary}")
+        except Exception as e:
+            # Database hiccups should not kill the ingester
+            db.rollback()
+            print(f"Job ingester error: {str(e)}")
+        finally:
+            db.close()
+
+        deadline = time.monotonic() + poll_interval
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(1)
+
+    print("Job ingester stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Apply Job Agent task workers.")
+    parser.add_argument(
+        "--processes", type=int, default=settings.TASK_WORKER_PROCESSES,
+        help="Number of worker processes to run",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=settings.TASK_POLL_INTERVAL_SECONDS,
+        help="Seconds to wait between polls when the queue is empty",
+    )
+    parser.add_argument(
+        "--ingest", action=argparse.BooleanOptionalAction, default=settings.JOB_INGEST_ENABLED,
+        help="Also run a process that ingests popular job searches into the job store",
+    )
+    args = parser.parse_args()
+
+    host = socket.gethostname()
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(f"{host}-{os.getpid()}-{index}", args.poll_interval),
+            name=f"task-worker-{index}",
+        )
+        for index in range(args.processes)
+    ]
+    if args.ingest:
+        processes.append(
+            context.Process(target=run_ingester, args=(settings.JOB_INGEST_POLL_SECONDS,), name="job-ingester")
+        )
+    for process in processes:
+        process.start()
+
+    def forward_stop(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward_stop)
+    signal.signal(signal.SIGINT, forward_stop)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark PDF-to-markdown extraction: single call vs. page-parallel pool.
+
+Generates synthetic resumes of 1, 5 and 30 pages and times
+`pymupdf4llm.to_markdown` on the whole document against
+`app.shared.pdf.extraction.pdf_to_markdown`.
+
+    python -m scripts.bench_pdf_extraction --pool-size 4 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import time
+
+# The app settings require database variables even though the benchmark never connects
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+
+import pymupdf
+import pymupdf4llm
+
+from app.shared.pdf.extraction import get_extraction_pool, pdf_to_markdown, shutdown_extraction_pool
+
+SECTION = """Experience
+Senior Software Engineer, Example Corp (2019 - Present)
+- Designed and operated distributed data pipelines processing billions of events per day.
+- Led a team of five engineers delivering a customer-facing analytics platform.
+Publications
+- A. Author, B. Author. "On the Scalability of Things". Journal of Examples, 2021.
+- A. Author. "Another Study of Systems". Proceedings of the Conference on Examples, 2020.
+"""
+
+
+def make_pdf(pages: int) -> bytes:
+    """Builds a text-heavy PDF with the given number of pages."""
+    document = pymupdf.open()
+    for number in range(pages):
+        page = document.new_page()
+        page.insert_text((72, 60), f"Jane Doe - Curriculum Vitae (page {number + 1})", fontsize=16)
+        page.insert_textbox(pymupdf.Rect(72, 90, 540, 770), SECTION * 4, fontsize=10)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def single_call(pdf_bytes: bytes) -> str:
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as document:
+        return pymupdf4llm.to_markdown(document)
+
+
+def time_it(func, pdf_bytes: bytes, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(pdf_bytes)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool-size", type=int, default=None, help="Override PDF_EXTRACT_POOL_SIZE")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (median is reported)")
+    args = parser.parse_args()
+
+    # Start the pool up front so process spawn time is not attributed to the first document
+    pool = get_extraction_pool()
+    pool.submit(len, b"").result()
+
+    print(f"{'pages':>5}  {'single (s)':>10}  {'parallel (s)':>12}  {'speedup':>7}")
+    try:
+        for pages in (1, 5, 30):
+            pdf_bytes = make_pdf(pages)
+            single = time_it(single_call, pdf_bytes, args.repeat)
+            parallel = time_it(lambda data: pdf_to_markdown(data, args.pool_size), pdf_bytes, args.repeat)
+            print(f"{pages:>5}  {single:>10.3f}  {parallel:>12.3f}  {single / parallel:>6.2f}x")
+    finally:
+        shutdown_extraction_pool()
+
+
+if __name__ == "__main__":
+    main()
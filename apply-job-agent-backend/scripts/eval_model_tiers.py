@@ -0,0 +1,143 @@
+"""
+Offline evaluation of the fast and quality model tiers.
+
+Replays the most recent stored resumes through the resume parser and job
+search input chains on both tiers (bypassing the response cache), then
+reports each tier's latency and how often the fast tier's output agrees
+with the quality tier's, overall and per field. Use it before moving a
+chain to another tier in LLM_CHAIN_POLICIES.
+
+    python -m scripts.eval_model_tiers --limit 20
+    python -m scripts.eval_model_tiers --chains job_search_input --limit 50
+"""
+import argparse
+import asyncio
+import difflib
+import json
+import re
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.session import SessionLocal
+import app.core.base  # noqa: F401  (registers every model with SQLAlchemy)
+from app.features.jobs.services import JobService, build_job_search_input_chain
+from app.features.resume.models import Resume
+from app.features.resume.services import build_resume_parser_chain
+from app.shared.llm.client_manager import get_client_manager
+from app.shared.llm.llm_model import get_llm_model
+from app.shared.llm.prompt_registry import prompt_registry
+
+# Free-text fields compare equal above this similarity
+TEXT_AGREEMENT_RATIO = 0.8
+
+
+def tier_model(tier: str):
+    """Returns an uncached, rate-limited model for a tier."""
+    model_name = settings.LLM_MODEL_TIERS[tier]
+    return get_client_manager(model_name).wrap(get_llm_model(model_name, cache=None, max_retries=0))
+
+
+def normalize(value) -> str:
+    return re.sub(r"\s+", " ", json.dumps(value, sort_keys=True, default=str).lower()).strip()
+
+
+def agrees(left, right) -> bool:
+    if isinstance(left, str) and isinstance(right, str):
+        ratio = difflib.SequenceMatcher(None, normalize(left), normalize(right)).ratio()
+        return ratio >= TEXT_AGREEMENT_RATIO
+    return normalize(left) == normalize(right)
+
+
+def load_resumes(limit: int) -> list[Resume]:
+    db = SessionLocal()
+    try:
+        return db.query(Resume).order_by(Resume.created_at.desc()).limit(limit).all()
+    finally:
+        db.close()
+
+
+def chain_inputs(chain_name: str, resumes: list[Resume]) -> list[dict]:
+    if chain_name == "resume_parser":
+        return [{"resume_text": resume.resume_markdown} for resume in resumes if resume.resume_markdown]
+    return [{"resume_information": resume.resume_data} for resume in resumes if resume.resume_data]
+
+
+def build_chain(chain_name: str, tier: str):
+    if chain_name == "resume_parser":
+        return build_resume_parser_chain(prompt_registry, model=tier_model(tier))
+    return build_job_search_input_chain(prompt_registry, model=tier_model(tier))
+
+
+async def run_tier(chain_name: str, tier: str, inputs: list[dict]) -> list[tuple[float, dict | None]]:
+    """Runs every input through a tier sequentially, so latencies are not skewed by queueing."""
+    chain = build_chain(chain_name, tier)
+    results = []
+    for chain_input in inputs:
+        started = time.perf_counter()
+        try:
+            output = await chain.ainvoke(chain_input)
+            if chain_name == "job_search_input":
+                output = JobService.resolve_search_location(chain_input["resume_information"], output)
+            results.append((time.perf_counter() - started, output.dict()))
+        except Exception as e:
+            print(f"  {tier} failed: {type(e).__name__}: {str(e)[:120]}")
+            results.append((time.perf_counter() - started, None))
+    return results
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * fraction + 0.5) - 1)]
+
+
+async def evaluate(chain_name: str, resumes: list[Resume]):
+    inputs = chain_inputs(chain_name, resumes)
+    if not inputs:
+        print(f"\n{chain_name}: no stored resumes to replay")
+        return
+
+    print(f"\n{chain_name}: replaying {len(inputs)} resumes")
+    results = {tier: await run_tier(chain_name, tier, inputs) for tier in ("quality", "fast")}
+
+    print(f"{'tier':>8}  {'model':>12}  {'p50 (s)':>8}  {'p95 (s)':>8}  {'failed':>6}")
+    for tier, runs in results.items():
+        latencies = [latency for latency, _ in runs]
+        failed = sum(1 for _, output in runs if output is None)
+        print(
+            f"{tier:>8}  {settings.LLM_MODEL_TIERS[tier]:>12}  {statistics.median(latencies):>8.2f}  "
+            f"{percentile(latencies, 0.95):>8.2f}  {failed:>6}"
+        )
+
+    field_agreement: dict[str, list[bool]] = {}
+    for (_, quality), (_, fast) in zip(results["quality"], results["fast"]):
+        if quality is None or fast is None:
+            continue
+        for field in quality:
+            field_agreement.setdefault(field, []).append(agrees(quality[field], fast.get(field)))
+
+    if not field_agreement:
+        return
+    pairs = len(next(iter(field_agreement.values())))
+    overall = statistics.mean(statistics.mean(values) for values in field_agreement.values())
+    print(f"agreement over {pairs} pairs: {overall:.1%}")
+    for field, values in field_agreement.items():
+        print(f"  {field:<28} {statistics.mean(values):>6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=20, help="Number of most recent resumes to replay")
+    parser.add_argument(
+        "--chains", nargs="+", choices=["resume_parser", "job_search_input"],
+        default=["resume_parser", "job_search_input"],
+    )
+    args = parser.parse_args()
+
+    resumes = load_resumes(args.limit)
+    for chain_name in args.chains:
+        asyncio.run(evaluate(chain_name, resumes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Concurrent load test for the LLM-backed endpoints of a running API worker.
+
+Fires N requests at once and reports throughput and latency percentiles.
+Run it against a single uvicorn worker (`uvicorn app.main:app --workers 1`)
+on the commit before and after a change to compare how many concurrent LLM
+requests one worker can serve. With synchronous `chain.invoke` calls the
+requests are served one after another, so wall time grows linearly with
+concurrency; with `ainvoke` they overlap.
+
+    python -m scripts.load_test --token $TOKEN --endpoint get-jobs --concurrency 1 4 8
+    python -m scripts.load_test --token $TOKEN --endpoint upload --file resume.pdf --concurrency 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def send(client: httpx.AsyncClient, args) -> tuple[float, int]:
+    """Sends one request and returns (latency in seconds, status code)."""
+    started = time.perf_counter()
+    if args.endpoint == "upload":
+        with open(args.file, "rb") as file:
+            response = await client.post(
+                "/resume/upload", files={"file": ("resume.pdf", file.read(), "application/pdf")}
+            )
+    elif args.endpoint == "get-jobs":
+        response = await client.post("/jobs/get-jobs")
+    else:
+        response = await client.get(
+            "/resume/build-custom-resume", params={"job_description": args.job_description}
+        )
+    return time.perf_counter() - started, response.status_code
+
+
+async def run(args, concurrency: int):
+    headers = {"Authorization": f"Bearer {args.token}"}
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(send(client, args) for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    failures = sum(1 for _, status in results if status >= 400)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{concurrency:>11}  {wall:>8.2f}  {concurrency / wall:>9.2f}  "
+        f"{statistics.median(latencies):>8.2f}  {p95:>8.2f}  {failures:>8}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the LLM endpoints.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Bearer token of a user with an uploaded resume")
+    parser.add_argument("--endpoint", choices=["upload", "get-jobs", "build-custom-resume"], default="get-jobs")
+    parser.add_argument("--file", help="PDF to upload for the upload endpoint")
+    parser.add_argument("--job-description", default="Senior Python backend engineer")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    if args.endpoint == "upload" and not args.file:
+        parser.error("--file is required for the upload endpoint")
+
+    print(f"{'concurrency':>11}  {'wall (s)':>8}  {'req/s':>9}  {'p50 (s)':>8}  {'p95 (s)':>8}  {'failures':>8}")
+    for concurrency in args.concurrency:
+        asyncio.run(run(args, concurrency))
+
+
+if __name__ == "__main__":
+    main()
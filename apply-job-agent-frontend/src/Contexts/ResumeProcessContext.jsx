@@ -543,6 +543,8 @@ export const ResumeProcessProvider = ({ children }) => {
         resume_information: resumeAnalyzeData 
       },
       {
+        // Descriptions the search already has; the rest are fetched when a job is opened
+        params: { include_descriptions: true },
         //Adding token to the request
         headers: {
           'Authorization': `Bearer ${token}`
@@ -603,6 +605,18 @@ export const ResumeProcessProvider = ({ children }) => {
     }
   };
   
+  // Fetch the full description of a job whose listing came without one
+  const fetchJobDescription = async (url) => {
+    const token = currentUser.access_token;
+    const response = await axios.get(`${BACKEND_URL}/jobs/description`, {
+      params: { url },
+      headers: {
+        'Authorization': `Bearer ${token}`
+      }
+    });
+    return response.data.description || '';
+  };
+
   // Go back to previous phase
   const handleGoBack = () => {
     if (currentPhase === 'analyze') {
@@ -649,6 +663,7 @@ export const ResumeProcessProvider = ({ children }) => {
     handleFileChange,
     handleUploadSubmit,
     handleFindJobs,
+    fetchJobDescription,
     handleGoBack,
     resetProcess,
     fetchUserResumeData
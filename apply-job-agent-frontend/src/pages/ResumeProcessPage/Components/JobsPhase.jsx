@@ -2,6 +2,7 @@ import React, { useState } from 'react';
 import { FaLock, FaLockOpen, FaChevronDown, FaMapMarkerAlt, FaBriefcase, FaBuilding, FaCalendarAlt, FaStar, FaChevronUp } from 'react-icons/fa';
 import ReactMarkdown from 'react-markdown';
 import { useModal } from '../../../Contexts/ModalContext'; // Update with correct path
+import { useResumeProcessContext } from '../../../Contexts/ResumeProcessContext';
 import CVTemplateSelection from './CVTemplateSelection'; // Assuming you have a CVTemplateSelection component
 
 // Function to process job description text
@@ -112,6 +113,32 @@ const JobsPhase = ({
   const [expandedJobIndex, setExpandedJobIndex] = useState(null);
   
   const { openModal } = useModal(); // Assuming you have a modal context to handle modals
+  const { fetchJobDescription } = useResumeProcessContext();
+  
+  // Descriptions fetched on demand, by job URL, for jobs listed without one
+  const [fetchedDescriptions, setFetchedDescriptions] = useState({});
+  const [loadingDescriptionUrl, setLoadingDescriptionUrl] = useState(null);
+  
+  const descriptionOf = (job) => job?.description || fetchedDescriptions[job?.url] || '';
+  
+  // Fetch a job's description if its listing has none; resolves to the description
+  const loadDescription = async (job) => {
+    if (!job?.url || job.description || job.url in fetchedDescriptions) {
+      return descriptionOf(job);
+    }
+    setLoadingDescriptionUrl(job.url);
+    try {
+      const description = await fetchJobDescription(job.url);
+      setFetchedDescriptions(prev => ({ ...prev, [job.url]: description }));
+      return description;
+    } catch (error) {
+      console.error('Error fetching job description:', error);
+      setFetchedDescriptions(prev => ({ ...prev, [job.url]: '' }));
+      return '';
+    } finally {
+      setLoadingDescriptionUrl(null);
+    }
+  };
   
   // Function to toggle payment modal
   const togglePaymentModal = () => {
@@ -125,6 +152,7 @@ const JobsPhase = ({
   // Handle job selection
   const handleJobSelect = (job, index) => {
     setSelectedJob(job);
+    loadDescription(job);
     
     // For mobile view, toggle expanded state for this job
     if (window.innerWidth < 768) {
@@ -181,7 +209,7 @@ const JobsPhase = ({
               Apply Now
             </a>
             <button
-              onClick={() => openModal(<CVTemplateSelection job_description={job?.description} />)}
+              onClick={async () => openModal(<CVTemplateSelection job_description={await loadDescription(job)} />)}
               className="py-2 px-3 bg-gradient-to-r from-indigo-600 to-purple-600 text-white font-medium text-xs rounded-lg hover:from-indigo-700 hover:to-purple-700 transition shadow-sm flex items-center justify-center flex-1"
             >
               <svg
@@ -206,10 +234,14 @@ const JobsPhase = ({
         <div>
           <h3 className="text-sm font-semibold text-gray-800 mb-2">Job Description</h3>
           <div className="text-xs text-gray-700 space-y-2 job-description-content max-h-64 overflow-y-auto">
-            {job?.description ? (
+            {loadingDescriptionUrl && loadingDescriptionUrl === job?.url ? (
+              <div className="italic text-gray-500">
+                <p>Loading job description...</p>
+              </div>
+            ) : descriptionOf(job) ? (
               <div 
                 className="prose prose-sm max-w-none" 
-                dangerouslySetInnerHTML={{ __html: formatJobDescription(job.description) }} 
+                dangerouslySetInnerHTML={{ __html: formatJobDescription(descriptionOf(job)) }} 
               />
             ) : (
               <div className="italic text-gray-500">
@@ -435,7 +467,7 @@ const JobsPhase = ({
                         Apply Now
                       </a>
                       <button
-                        onClick={() => openModal(<CVTemplateSelection job_description={selectedJob?.description} />)}
+                        onClick={async () => openModal(<CVTemplateSelection job_description={await loadDescription(selectedJob)} />)}
                         className="w-2/5 py-2 px-3 bg-gradient-to-r from-indigo-600 to-purple-600 text-white font-medium text-xs rounded-lg hover:from-indigo-700 hover:to-purple-700 transition shadow-sm flex items-center justify-center"
                       >
                         <svg
@@ -460,11 +492,15 @@ const JobsPhase = ({
                   <div>
                     <h3 className="text-sm font-semibold text-gray-800 mb-2">Job Description</h3>
                     <div className="text-xs text-gray-700 space-y-2 job-description-content">
-                      {selectedJob?.description ? (
+                      {loadingDescriptionUrl && loadingDescriptionUrl === selectedJob?.url ? (
+                        <div className="italic text-gray-500">
+                          <p>Loading job description...</p>
+                        </div>
+                      ) : descriptionOf(selectedJob) ? (
                         // Use our custom formatter for job descriptions that contain markdown
                         <div 
                           className="prose prose-sm max-w-none" 
-                          dangerouslySetInnerHTML={{ __html: formatJobDescription(selectedJob.description) }} 
+                          dangerouslySetInnerHTML={{ __html: formatJobDescription(descriptionOf(selectedJob)) }} 
                         />
                       ) : (
                         <div className="italic text-gray-500">